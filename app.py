@@ -12,6 +12,7 @@ from controllers.vendor_controller import vendor_bp
 from controllers.mapping_controller import mapping_bp
 from controllers.financial_controller import financial_bp
 from controllers.analytics_controller import analytics_bp
+from services.financial_service import recover_submission_files
 
 
 def create_app():
@@ -24,6 +25,9 @@ def create_app():
     app.register_blueprint(financial_bp)
     app.register_blueprint(analytics_bp)
 
+    # Drop any submission row torn by an interrupted append before serving requests
+    recover_submission_files()
+
     # Dummy user database for three personas
     USERS = {
         'maya': {'password': 'demo', 'role': 'maya', 'name': 'Maya Patel', 'email': 'maya.patel@tmhna.com'},
@@ -0,0 +1,3 @@
+"""
+Benchmarks for the TMHNA Data Harmonization application.
+"""
@@ -0,0 +1,163 @@
+"""
+Vendor harmonization benchmark.
+
+For each size, generates a seeded synthetic dataset (see
+vendor_data_generator), runs the harmonization pipeline on it in a fresh
+process, and reports:
+- wall time per stage (load, match, auto-merge) and in total
+- peak resident memory of that process
+- candidate pairs scored by the matcher
+- precision/recall of the final vendor groups against the planted gold
+  standard, counted over pairs of rows placed in the same vendor
+
+The pipeline is the one harmonize_vendors() runs on a full rebuild, minus
+persistence: no state file, no score cache and no manual merges, so the
+app's data/ directory is never touched.
+
+    python -m benchmarks.vendor_benchmark                         # 1k and 10k rows
+    python -m benchmarks.vendor_benchmark --sizes 1000 10000 100000 1000000 --approximate
+    python -m benchmarks.vendor_benchmark --engine serial --json results.json
+
+Blocking puts every vendor of a city in one block, so exact mode grows
+roughly quadratically; use --approximate (MinHash LSH) for 100k+ rows.
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.vendor_data_generator import write_dataset, load_gold
+
+DEFAULT_SIZES = [1_000, 10_000]
+DEFAULT_SEED = 42
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _matched_pairs(groups: Counter) -> int:
+    return sum(size * (size - 1) // 2 for size in groups.values())
+
+
+def quality(predicted: List[int], gold: List[int]) -> Dict:
+    """Pairwise precision/recall/F1 of predicted row groups against gold entity ids."""
+    predicted_pairs = _matched_pairs(Counter(predicted))
+    gold_pairs = _matched_pairs(Counter(gold))
+    shared_pairs = _matched_pairs(Counter(zip(predicted, gold)))
+    precision = shared_pairs / predicted_pairs if predicted_pairs else 1.0
+    recall = shared_pairs / gold_pairs if gold_pairs else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "gold_pairs": gold_pairs,
+        "predicted_pairs": predicted_pairs,
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+    }
+
+
+def run_pipeline(data_dir: str, rules: Dict) -> Dict:
+    """Harmonize one generated dataset and measure it (meant to run in a fresh process)."""
+    from services.vendor_matching import VendorMatcher
+    from services.vendor_service import load_raw_vendor_data, auto_merge_groups
+
+    timings = {}
+    started = time.perf_counter()
+    raw = load_raw_vendor_data(Path(data_dir))
+    timings["load_s"] = time.perf_counter() - started
+
+    stage = time.perf_counter()
+    matcher = VendorMatcher(rules, {})
+    assigned = matcher.add_brand(raw["tmh"], "TMH") + matcher.add_brand(raw["raymond"], "Raymond")
+    timings["match_s"] = time.perf_counter() - stage
+
+    stage = time.perf_counter()
+    groups = auto_merge_groups(matcher.unified)
+    position_of = {id(record): position for position, record in enumerate(matcher.unified)}
+    predicted = [groups.find(position_of[id(record)]) for record in assigned]
+    timings["auto_merge_s"] = time.perf_counter() - stage
+    timings["total_s"] = time.perf_counter() - started
+
+    gold = load_gold(Path(data_dir))
+    stats = matcher.stats()
+    return {
+        "rows": len(assigned),
+        "vendors": len(set(predicted)),
+        **{key: round(value, 3) for key, value in timings.items()},
+        "peak_rss_mb": _peak_rss_mb(),
+        "pairs_scored": stats["pairs_compared"],
+        "pairs_skipped": stats["pairs_skipped"],
+        "candidate_index": stats["strategies"],
+        **quality(predicted, gold["TMH"] + gold["Raymond"]),
+    }
+
+
+def benchmark(sizes: List[int], rules: Dict, seed: int = DEFAULT_SEED, data_root: Path = None) -> List[Dict]:
+    # A spawned (not forked) process per size, so peak memory is that run's alone
+    context = multiprocessing.get_context("spawn")
+    results = []
+    with tempfile.TemporaryDirectory(prefix="vendor-bench-") as tmp:
+        for size in sizes:
+            data_dir = Path(data_root or tmp) / f"rows_{size}_seed_{seed}"
+            if not (data_dir / "gold.csv").exists():
+                write_dataset(data_dir, size, seed)
+            with context.Pool(1) as pool:
+                result = pool.apply(run_pipeline, (str(data_dir), rules))
+            result["size"] = size
+            results.append(result)
+            print(_format_row(result), flush=True)
+    return results
+
+
+COLUMNS = [
+    ("size", "size", 9), ("rows", "rows", 9), ("vendors", "vendors", 9), ("total_s", "total s", 9),
+    ("load_s", "load s", 8), ("match_s", "match s", 9), ("auto_merge_s", "merge s", 8),
+    ("peak_rss_mb", "peak MB", 9), ("pairs_scored", "pairs", 12), ("precision", "precision", 10),
+    ("recall", "recall", 8), ("f1", "f1", 7),
+]
+
+
+def _format_header() -> str:
+    return " ".join(label.rjust(width) for _, label, width in COLUMNS)
+
+
+def _format_row(result: Dict) -> str:
+    return " ".join(str(result[key]).rjust(width) for key, _, width in COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vendor harmonization on seeded synthetic vendor masters.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="total rows per run (both brands)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--engine", choices=["batch", "serial"], default="batch")
+    parser.add_argument("--approximate", action="store_true", help="use MinHash LSH candidates instead of blocking")
+    parser.add_argument("--no-blocking", action="store_true", help="score every pair (small sizes only)")
+    parser.add_argument("--rules", type=Path, help="vendor_rules.json to start from (default: built-in defaults)")
+    parser.add_argument("--data-dir", type=Path, help="keep generated datasets here and reuse them")
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args()
+
+    rules = json.loads(args.rules.read_text()) if args.rules else {}
+    rules["scoring_engine"] = args.engine
+    if args.approximate:
+        rules["approximate_matching"] = dict(rules.get("approximate_matching", {}), enabled=True)
+    if args.no_blocking:
+        rules["blocking"] = {"enabled": False}
+
+    print(_format_header(), flush=True)
+    results = benchmark(args.sizes, rules, args.seed, args.data_dir)
+    if args.json:
+        args.json.write_text(json.dumps({"rules": rules, "seed": args.seed, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Seeded synthetic vendor masters for the harmonization benchmark.
+
+Writes tmh_vendors.csv / raymond_vendors.csv in the same shape as the files
+in data/, plus gold.csv mapping every generated row to the real-world vendor
+(entity) it was planted from. Rows of one entity differ the way brand
+masters drift apart in practice:
+- typos in the vendor name (substitution, deletion, transposition)
+- abbreviation drift ("Rd"/"Road", "Inc"/"Incorporated", ...)
+- phone format drift ("214-555-0101", "(214) 555-0101", "+1 214.555.0101", ...)
+
+The same seed always produces the same files.
+"""
+import argparse
+import csv
+import random
+import string
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+VENDOR_COLUMNS = ["brand", "vendor_id", "vendor_name", "address", "city", "state", "country", "phone"]
+GOLD_COLUMNS = ["brand", "vendor_id", "entity_id"]
+
+# Share of entities present in both brands, and share duplicated inside one brand
+DEFAULT_OVERLAP = 0.35
+DEFAULT_DUPLICATE_RATE = 0.03
+# Chance that a planted copy gets a name typo
+DEFAULT_TYPO_RATE = 0.15
+
+INDUSTRY_WORDS = [
+    "Logistics", "Supply", "Industrial", "Bearings", "Hydraulics", "Equipment", "Parts",
+    "Distribution", "Manufacturing", "Freight", "Steel", "Electric", "Fasteners", "Tooling",
+    "Components", "Materials", "Packaging", "Services", "Systems", "Machining",
+]
+LEGAL_FORMS = {"Inc": "Incorporated", "Co": "Company", "Corp": "Corporation", "Ltd": "Limited", "LLC": "LLC"}
+STREET_SUFFIXES = {"Rd": "Road", "St": "Street", "Ave": "Avenue", "Blvd": "Boulevard", "Dr": "Drive", "Ln": "Lane", "Way": "Way"}
+STATES = ["TX", "OH", "IL", "MI", "WA", "TN", "GA", "MA", "IN", "CA", "NY", "PA", "NC", "IA", "MO", "WI"]
+SYLLABLES = [
+    "ab", "ar", "bel", "bro", "cal", "cor", "del", "dun", "el", "fair", "gal", "gran", "har",
+    "hol", "kel", "lan", "mar", "mer", "nor", "oak", "pen", "quin", "ral", "ros", "sal",
+    "sil", "tam", "ter", "val", "ver", "wes", "win", "york", "zel",
+]
+
+
+def _word(rng: random.Random, parts: int) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(parts)).title()
+
+
+def _typo(rng: random.Random, text: str) -> str:
+    letters = [i for i, ch in enumerate(text) if ch.isalpha()]
+    if len(letters) < 4:
+        return text
+    i = rng.choice(letters[1:-1])
+    kind = rng.random()
+    if kind < 0.4:
+        return text[:i] + rng.choice(string.ascii_lowercase) + text[i + 1:]
+    if kind < 0.7:
+        return text[:i] + text[i + 1:]
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def _phone(rng: random.Random, digits: str) -> str:
+    area, exchange, line = digits[:3], digits[3:6], digits[6:]
+    return rng.choice([
+        f"{area}-{exchange}-{line}",
+        f"({area}) {exchange}-{line}",
+        f"{area}.{exchange}.{line}",
+        f"{area}{exchange}{line}",
+        f"+1 {area}-{exchange}-{line}",
+        f"1 ({area}) {exchange}-{line}",
+    ])
+
+
+class VendorGenerator:
+    """Plants entities, then renders each brand's copies of them with drift."""
+
+    def __init__(self, seed: int = 42, overlap: float = DEFAULT_OVERLAP, duplicate_rate: float = DEFAULT_DUPLICATE_RATE, typo_rate: float = DEFAULT_TYPO_RATE):
+        self.rng = random.Random(seed)
+        self.overlap = overlap
+        self.duplicate_rate = duplicate_rate
+        self.typo_rate = typo_rate
+        self.cities = [(_word(self.rng, 2), self.rng.choice(STATES)) for _ in range(400)]
+
+    def _entity(self) -> Dict:
+        rng = self.rng
+        city, state = rng.choice(self.cities)
+        return {
+            "stem": f"{_word(rng, rng.randint(1, 2))} {_word(rng, rng.randint(1, 2))}" if rng.random() < 0.4 else _word(rng, rng.randint(2, 3)),
+            "industry": rng.choice(INDUSTRY_WORDS),
+            "legal_form": rng.choice(list(LEGAL_FORMS)),
+            "street_number": rng.randint(1, 9999),
+            "street_name": _word(rng, rng.randint(1, 2)),
+            "street_suffix": rng.choice(list(STREET_SUFFIXES)),
+            "city": city,
+            "state": state,
+            "phone": f"{rng.randint(201, 989)}{rng.randint(200, 999)}{rng.randint(0, 9999):04d}",
+        }
+
+    def _render(self, entity: Dict) -> Dict:
+        rng = self.rng
+        legal_form = entity["legal_form"]
+        if rng.random() < 0.4:
+            legal_form = LEGAL_FORMS[legal_form]
+        name = f"{entity['stem']} {entity['industry']}"
+        if rng.random() < 0.85:
+            name = f"{name} {legal_form}"
+        if rng.random() < self.typo_rate:
+            name = _typo(rng, name)
+        suffix = entity["street_suffix"]
+        if rng.random() < 0.4:
+            suffix = STREET_SUFFIXES[suffix]
+        return {
+            "vendor_name": name,
+            "address": f"{entity['street_number']} {entity['street_name']} {suffix}",
+            "city": entity["city"],
+            "state": entity["state"],
+            "country": "USA",
+            "phone": _phone(rng, entity["phone"]),
+        }
+
+    def generate(self, rows: int) -> Dict[str, List[Tuple[int, Dict]]]:
+        """
+        About `rows` rows split across both brands, as (entity_id, row) pairs.
+        Each entity lands in TMH, Raymond or (with probability overlap) both;
+        a few rows are extra copies of an entity within the same brand.
+        """
+        rng = self.rng
+        brands: Dict[str, List[Tuple[int, Dict]]] = {"TMH": [], "Raymond": []}
+        entities: List[Dict] = []
+        while len(brands["TMH"]) + len(brands["Raymond"]) < rows:
+            entity_id = len(entities)
+            entity = self._entity()
+            entities.append(entity)
+            if rng.random() < self.overlap:
+                targets = ["TMH", "Raymond"]
+            else:
+                targets = [rng.choice(["TMH", "Raymond"])]
+            if rng.random() < self.duplicate_rate:
+                targets.append(rng.choice(targets))
+            for brand in targets:
+                brands[brand].append((entity_id, self._render(entity)))
+        # Brand masters are not sorted by entity
+        for planted in brands.values():
+            rng.shuffle(planted)
+        return brands
+
+
+def write_dataset(out_dir: Path, rows: int, seed: int = 42, **options) -> Dict[str, int]:
+    """Write tmh_vendors.csv, raymond_vendors.csv and gold.csv to out_dir. Returns row counts."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    planted = VendorGenerator(seed, **options).generate(rows)
+    counts = {}
+    with open(out_dir / "gold.csv", "w", newline="", encoding="utf-8") as gold_file:
+        gold = csv.writer(gold_file)
+        gold.writerow(GOLD_COLUMNS)
+        for brand, prefix, file_name in (("TMH", "V", "tmh_vendors.csv"), ("Raymond", "R", "raymond_vendors.csv")):
+            with open(out_dir / file_name, "w", newline="", encoding="utf-8") as vendor_file:
+                writer = csv.DictWriter(vendor_file, fieldnames=VENDOR_COLUMNS)
+                writer.writeheader()
+                for number, (entity_id, row) in enumerate(planted[brand], start=1):
+                    vendor_id = f"{prefix}{number:07d}"
+                    writer.writerow(dict(row, brand=brand, vendor_id=vendor_id))
+                    gold.writerow([brand, vendor_id, entity_id])
+            counts[brand] = len(planted[brand])
+    return counts
+
+
+def load_gold(out_dir: Path) -> Dict[str, List[int]]:
+    """Entity id per row, per brand, in file order."""
+    gold: Dict[str, List[int]] = {"TMH": [], "Raymond": []}
+    with open(Path(out_dir) / "gold.csv", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            gold[row["brand"]].append(int(row["entity_id"]))
+    return gold
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic TMH/Raymond vendor masters with a planted gold standard.")
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--rows", type=int, default=10_000, help="total rows across both brands")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    counts = write_dataset(args.out_dir, args.rows, args.seed)
+    print(f"Wrote {counts['TMH']} TMH and {counts['Raymond']} Raymond rows to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
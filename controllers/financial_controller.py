@@ -9,6 +9,7 @@ from services.financial_service import (
     submit_to_corporate,
     load_submissions,
     load_submission_rows,
+    load_submission_rows_batch,
     get_brand_approved_view,
     get_corporate_unified_view,
     calculate_variances,
@@ -207,6 +208,22 @@ def get_submission_rows(submission_id):
         return jsonify({"data": [], "error": str(e)})
 
 
+@financial_bp.route("/api/financial/submissions/rows", methods=["POST"])
+def get_submission_rows_batch():
+    """Get rows for many submissions in one request: {"submission_ids": [...]}."""
+    data = request.get_json() or {}
+    submission_ids = data.get("submission_ids")
+    if not isinstance(submission_ids, list) or not all(isinstance(s, str) for s in submission_ids):
+        return jsonify({"error": "submission_ids must be a list of strings"}), 400
+    
+    try:
+        rows = load_submission_rows_batch(submission_ids)
+        return jsonify({"data": rows})
+    except Exception as e:
+        print(f"[API] ERROR in get_submission_rows_batch: {e}")
+        return jsonify({"data": {}, "error": str(e)})
+
+
 @financial_bp.route("/api/financial/brand-approved/<brand>")
 def get_brand_approved(brand):
     """Get brand-level approved view (Corporate only)."""
@@ -12,6 +12,8 @@ from services.mapping_governance_service import (
     get_vendor_overrides,
     add_vendor_override
 )
+from services.vendor_service import simulate_vendor_thresholds, measure_approximate_recall
+from services.vendor_simulation import DEFAULT_RECALL_SAMPLE, MAX_RECALL_SAMPLE
 
 mapping_bp = Blueprint("mapping", __name__)
 
@@ -111,6 +113,15 @@ def update_vendor_rules():
         if not isinstance(threshold, int) or threshold < 0 or threshold > 100:
             return jsonify({"error": "confidence_threshold must be between 0 and 100"}), 400
     
+    approximate = data.get("approximate_matching")
+    if approximate is not None:
+        if not isinstance(approximate, dict):
+            return jsonify({"error": "approximate_matching must be an object"}), 400
+        for key in ("bands", "rows", "shingle_size"):
+            value = approximate.get(key)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                return jsonify({"error": f"approximate_matching.{key} must be a positive integer"}), 400
+    
     try:
         save_vendor_rules(data, session.get('name', 'Unknown'))
         return jsonify({
@@ -121,6 +132,49 @@ def update_vendor_rules():
         return jsonify({"error": str(e)}), 500
 
 
+@mapping_bp.route("/api/mappings/vendor/simulate", methods=["POST"])
+def simulate_vendor_rules():
+    """Preview merge/unmatched counts for a threshold and weights without saving them - Maya only."""
+    if session.get('role') != 'maya':
+        return jsonify({"error": "Unauthorized"}), 403
+    
+    data = request.get_json() or {}
+    threshold = data.get("confidence_threshold")
+    if threshold is not None and (not isinstance(threshold, int) or threshold < 0 or threshold > 100):
+        return jsonify({"error": "confidence_threshold must be between 0 and 100"}), 400
+    for key in ("name_weight", "address_weight"):
+        weight = data.get(key)
+        if weight is not None and (not isinstance(weight, (int, float)) or weight < 0 or weight > 1):
+            return jsonify({"error": f"{key} must be between 0 and 1"}), 400
+    
+    try:
+        result = simulate_vendor_thresholds(
+            confidence_threshold=threshold,
+            name_weight=data.get("name_weight"),
+            address_weight=data.get("address_weight"),
+        )
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@mapping_bp.route("/api/mappings/vendor/approximate/recall", methods=["POST"])
+def approximate_vendor_recall():
+    """Recall of approximate (LSH) vendor matching against exact matching on a sample - Maya only."""
+    if session.get('role') != 'maya':
+        return jsonify({"error": "Unauthorized"}), 403
+    
+    data = request.get_json(silent=True) or {}
+    sample_size = data.get("sample_size", DEFAULT_RECALL_SAMPLE)
+    if not isinstance(sample_size, int) or sample_size < 1 or sample_size > MAX_RECALL_SAMPLE:
+        return jsonify({"error": f"sample_size must be between 1 and {MAX_RECALL_SAMPLE}"}), 400
+    
+    try:
+        return jsonify(measure_approximate_recall(sample_size))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @mapping_bp.route("/api/mappings/vendor/overrides", methods=["POST"])
 def create_vendor_override():
     """Create a vendor match override - Maya only."""
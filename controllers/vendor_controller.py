@@ -1,6 +1,10 @@
-from flask import Blueprint, jsonify, render_template, Response, session, redirect, url_for, request
+from flask import Blueprint, jsonify, render_template, Response, stream_with_context, session, redirect, url_for, request
 
-from services.vendor_service import load_raw_vendor_data, harmonize_vendors, harmonized_vendors_csv, raw_vendors_csv
+from services.vendor_service import (
+    load_raw_vendor_data, harmonize_vendors, harmonized_vendors_csv, raw_vendors_csv, get_harmonization_stats,
+    query_harmonized_vendors, query_raw_vendors,
+)
+from utils.vendor_search import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from services.mapping_governance_service import add_vendor_manual_merge
 
 vendor_bp = Blueprint("vendors", __name__)
@@ -13,21 +17,76 @@ def vendor_page():
     return render_template("vendors.html")
 
 
+PAGE_PARAMS = ("limit", "cursor", "q", "brand", "min_confidence")
+
+
+def _page_params() -> dict:
+    """Parse paging/search query parameters. Raises ValueError on bad input."""
+    limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+    if limit < 0 or limit > MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 0 and {MAX_PAGE_SIZE}")
+    cursor = request.args.get("cursor")
+    min_confidence = request.args.get("min_confidence")
+    return {
+        "q": request.args.get("q", "").strip() or None,
+        "brand": request.args.get("brand", "").strip() or None,
+        "cursor": int(cursor) if cursor else None,
+        "limit": limit,
+        "min_confidence": int(min_confidence) if min_confidence else None,
+    }
+
+
 @vendor_bp.route("/api/vendors/raw")
 def vendor_raw():
-    return jsonify(load_raw_vendor_data())
+    """
+    All raw vendors grouped by brand, or - when any of limit, cursor, q, brand
+    is given - one page of rows with the total match count.
+    """
+    if not any(param in request.args for param in PAGE_PARAMS):
+        return jsonify(load_raw_vendor_data())
+    try:
+        params = _page_params()
+        params.pop("min_confidence")
+        return jsonify(query_raw_vendors(**params))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
 
 @vendor_bp.route("/api/vendors/harmonized")
 def vendor_harmonized():
-    return jsonify({"data": harmonize_vendors()})
+    """
+    All harmonized vendors, or - when any of limit, cursor, q, brand,
+    min_confidence is given - one page with the total match count.
+    """
+    if not any(param in request.args for param in PAGE_PARAMS):
+        return jsonify({"data": harmonize_vendors()})
+    try:
+        return jsonify(query_harmonized_vendors(**_page_params()))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+@vendor_bp.route("/api/vendors/harmonized/stats")
+def vendor_harmonized_stats():
+    """Matching counters from the last harmonization run."""
+    return jsonify(get_harmonization_stats())
+
+
+@vendor_bp.route("/api/vendors/harmonized/rebuild", methods=["POST"])
+def vendor_harmonized_rebuild():
+    """Discard the persisted vendor state and re-match every raw row (Maya only)."""
+    if session.get('role') != 'maya':
+        return jsonify({"error": "Unauthorized"}), 403
+    
+    data = harmonize_vendors(rebuild=True)
+    return jsonify({"ok": True, "vendor_count": len(data), "stats": get_harmonization_stats()})
 
 
 @vendor_bp.route("/api/vendors/harmonized/csv")
 def vendor_harmonized_csv():
-    csv_content = harmonized_vendors_csv()
+    # No Content-Length: rows are sent with chunked transfer encoding as they are written
     return Response(
-        csv_content,
+        stream_with_context(harmonized_vendors_csv()),
         mimetype="text/csv",
         headers={"Content-Disposition": "attachment; filename=unified_vendors.csv"},
     )
@@ -36,11 +95,11 @@ def vendor_harmonized_csv():
 @vendor_bp.route("/api/vendors/raw/csv")
 def vendor_raw_csv():
     brand = request.args.get("brand", "").lower()  # Get brand from query parameter
-    csv_content = raw_vendors_csv(brand if brand in ["tmh", "raymond"] else None)
+    csv_chunks = raw_vendors_csv(brand if brand in ["tmh", "raymond"] else None)
     
     filename = f"raw_vendors_{brand}.csv" if brand in ["tmh", "raymond"] else "raw_vendors.csv"
     return Response(
-        csv_content,
+        stream_with_context(csv_chunks),
         mimetype="text/csv",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -1,14 +1,78 @@
+import sys
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
+from utils.harmonization_helpers import canonicalize_address
 
-@dataclass
+# Source brands, in display order; a record's brands are a bitmask over these bits
+BRANDS = ("TMH", "Raymond")
+BRAND_BITS = {brand: 1 << position for position, brand in enumerate(BRANDS)}
+# Display string for every mask value, e.g. 0b11 -> "TMH, Raymond"
+BRAND_LABELS = tuple(
+    ", ".join(brand for brand in BRANDS if mask & BRAND_BITS[brand])
+    for mask in range(1 << len(BRANDS))
+)
+# Display string of a manually or automatically merged record: its brands sorted by name, e.g. 0b11 -> "Raymond, TMH"
+MERGED_BRAND_LABELS = tuple(
+    ", ".join(sorted(brand for brand in BRANDS if mask & BRAND_BITS[brand]))
+    for mask in range(1 << len(BRANDS))
+)
+
+
+def brand_mask(source_brands: str) -> int:
+    """Bitmask for a comma-joined brand string such as "TMH, Raymond" (unknown names are ignored)."""
+    mask = 0
+    for brand in source_brands.split(","):
+        mask |= BRAND_BITS.get(brand.strip(), 0)
+    return mask
+
+
+@lru_cache(maxsize=1024)
+def _append_label(label: str, brand: str) -> str:
+    # Records matched by the same brands in the same order share one label string
+    return f"{label}, {brand}"
+
+
+@dataclass(slots=True)
 class VendorRecord:
+    """
+    One unified vendor. Slotted (no per-instance __dict__) since the
+    harmonizer holds one per vendor; normalized name and phone are interned,
+    so equal values across records share one string. address_key is the
+    canonical address, computed once here and used by both scoring and
+    auto-merge.
+
+    brands is the bitmask used for brand tests and merges. source_brands is
+    the display string: the brand of every matched row in arrival order
+    ("TMH, Raymond", "TMH, TMH"), or MERGED_BRAND_LABELS for merged records.
+    """
     unified_vendor_id: str
     vendor_name: str
     normalized_name: str
     address: str
     phone: str
-    source_brands: str
+    brands: int
     match_confidence: Optional[int] = None
+    address_key: Optional[str] = None
+    source_brands: Optional[str] = None
+
+    def __post_init__(self):
+        if self.address_key is None:
+            self.address_key = canonicalize_address(self.address)
+        if type(self.normalized_name) is str:
+            self.normalized_name = sys.intern(self.normalized_name)
+        if type(self.phone) is str:
+            self.phone = sys.intern(self.phone)
+        if self.source_brands is None:
+            self.source_brands = BRAND_LABELS[self.brands]
+        elif type(self.source_brands) is str:
+            self.source_brands = sys.intern(self.source_brands)
+
+    def add_source(self, brand: str) -> None:
+        """Record another row matched into this vendor."""
+        self.brands |= BRAND_BITS[brand]
+        self.source_brands = _append_label(self.source_brands, brand)
 
+    def has_brand(self, brand: str) -> bool:
+        return bool(self.brands & BRAND_BITS[brand])
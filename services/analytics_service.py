@@ -4,17 +4,16 @@ Does not modify any existing workflows or data structures.
 """
 from typing import Dict, List, Optional
 from pathlib import Path
-import csv
 from datetime import datetime
 from services.financial_service import (
-    load_raw_accounts,
     load_unified_account_mapping,
     load_unified_cost_center_mapping,
     calculate_variances,
-    load_submissions,
-    FINANCIAL_DATA_PATH
+    load_submissions
 )
 from services.vendor_service import harmonize_vendors
+from services import financial_engine
+from services.financial_storage import get_submission_store
 
 
 def compute_data_quality_analytics(brand: Optional[str] = None) -> Dict:
@@ -28,28 +27,17 @@ def compute_data_quality_analytics(brand: Optional[str] = None) -> Dict:
         - readiness_percent: Percentage ready to submit
     """
     try:
-        raw_accounts = load_raw_accounts(brand)
-        account_mapping = load_unified_account_mapping()
-        cost_center_mapping = load_unified_cost_center_mapping()
-        
-        total_raw_rows = len(raw_accounts)
-        fully_mapped = 0
-        
-        for row in raw_accounts:
-            source_account_name = row.get("source_account_name", "").strip()
-            source_cost_center = row.get("source_cost_center", "").strip()
-            
-            if source_account_name in account_mapping and source_cost_center in cost_center_mapping:
-                fully_mapped += 1
-        
-        unmapped = total_raw_rows - fully_mapped
-        readiness_percent = (fully_mapped / total_raw_rows * 100) if total_raw_rows > 0 else 0.0
+        snapshot = financial_engine.harmonize_financials(brand)
+        total_raw_rows = snapshot.total_rows
+        fully_mapped = snapshot.fully_mapped_rows
+        unmapped = snapshot.unmapped_rows
+        readiness_percent = snapshot.readiness_percent
         
         return {
             "total_raw_rows": total_raw_rows,
             "fully_mapped_rows": fully_mapped,
             "unmapped_rows": unmapped,
-            "readiness_percent": round(readiness_percent, 1)
+            "readiness_percent": readiness_percent
         }
     except Exception as e:
         print(f"[ANALYTICS] Error computing data quality: {e}")
@@ -113,6 +101,8 @@ def compute_submission_analytics(brand: Optional[str] = None) -> Dict:
         by_status = {}
         by_brand = {}
         approval_times = []
+        # submission_id -> approved_timestamp of its first approved row, loaded on first use
+        approved_timestamps = None
         
         for sub in submissions:
             status = sub.get("status", "UNKNOWN")
@@ -127,20 +117,17 @@ def compute_submission_analytics(brand: Optional[str] = None) -> Dict:
                 if timestamp_str:
                     try:
                         submitted_time = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                        # Check if approved_timestamp exists in brand_approved_financials
-                        approved_path = FINANCIAL_DATA_PATH / "brand_approved_financials.csv"
-                        if approved_path.exists():
-                            with open(approved_path, 'r', encoding='utf-8') as f:
-                                reader = csv.DictReader(f)
-                                for row in reader:
-                                    if row.get("submission_id") == sub.get("submission_id"):
-                                        approved_str = row.get("approved_timestamp", "")
-                                        if approved_str:
-                                            approved_time = datetime.fromisoformat(approved_str.replace('Z', '+00:00'))
-                                            hours = (approved_time - submitted_time).total_seconds() / 3600
-                                            if hours > 0:
-                                                approval_times.append(hours)
-                                        break
+                        # Check if approved_timestamp exists in the approved ledger
+                        if approved_timestamps is None:
+                            approved_timestamps = {}
+                            for row in get_submission_store().load_approved():
+                                approved_timestamps.setdefault(row.get("submission_id"), row.get("approved_timestamp", ""))
+                        approved_str = approved_timestamps.get(sub.get("submission_id"))
+                        if approved_str:
+                            approved_time = datetime.fromisoformat(approved_str.replace('Z', '+00:00'))
+                            hours = (approved_time - submitted_time).total_seconds() / 3600
+                            if hours > 0:
+                                approval_times.append(hours)
                     except Exception:
                         pass  # Skip if timestamp parsing fails
         
@@ -176,22 +163,14 @@ def compute_mapping_impact_analytics() -> Dict:
         account_mapping = load_unified_account_mapping()
         cost_center_mapping = load_unified_cost_center_mapping()
         
-        # Get current variance count
-        variances = calculate_variances(None)
-        
-        # Get total source accounts from raw data
-        raw_accounts = load_raw_accounts(None)
-        unique_accounts = set()
-        for row in raw_accounts:
-            account_name = row.get("source_account_name", "").strip()
-            if account_name:
-                unique_accounts.add(account_name)
+        # Current variance count and unique source accounts, from one pass over the raw data
+        snapshot = financial_engine.harmonize_financials(None)
         
         return {
             "total_account_mappings": len(account_mapping),
             "total_cost_center_mappings": len(cost_center_mapping),
-            "current_variances": len(variances),
-            "total_source_accounts": len(unique_accounts)
+            "current_variances": len(snapshot.variances),
+            "total_source_accounts": snapshot.source_accounts
         }
     except Exception as e:
         print(f"[ANALYTICS] Error computing mapping impact: {e}")
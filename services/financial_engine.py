@@ -0,0 +1,157 @@
+"""
+Financial Engine - one pass over the raw accounts against the current mappings.
+
+The preview rows, data quality issues, variances and readiness counters
+are all joins of financial_raw_accounts.csv against the same two mapping
+indexes, so they are produced together in a single walk and cached per
+brand. A cached result stays valid while the raw file is unchanged and
+mapping_repository hands back the same mapping indexes (it builds new
+ones whenever a mapping file changes or is saved).
+
+Results are shared between callers and must be treated as read-only.
+"""
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from services import mapping_repository
+
+# brand key -> (raw file signature, account index, cost center index, result)
+_cache: Dict[str, Tuple[Optional[Tuple[int, int]], Dict, Dict, "FinancialSnapshot"]] = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class FinancialSnapshot:
+    """Everything derived from the raw accounts of one brand (or of all brands)."""
+    brand: Optional[str]
+    preview: List[Dict] = field(default_factory=list)
+    issues: List[Dict] = field(default_factory=list)
+    variances: List[Dict] = field(default_factory=list)
+    total_rows: int = 0
+    fully_mapped_rows: int = 0
+    unmapped_account_rows: int = 0
+    unmapped_cost_center_rows: int = 0
+    brands: List[str] = field(default_factory=list)
+    source_accounts: int = 0
+
+    @property
+    def unmapped_rows(self) -> int:
+        return self.total_rows - self.fully_mapped_rows
+
+    @property
+    def readiness_percent(self) -> float:
+        return round(self.fully_mapped_rows / self.total_rows * 100, 1) if self.total_rows > 0 else 0.0
+
+    @property
+    def blocking_variances(self) -> List[Dict]:
+        return [v for v in self.variances if v.get("variance_type") in ["UNMAPPED_ACCOUNT", "UNMAPPED_COST_CENTER"]]
+
+
+def _raw_signature() -> Optional[Tuple[int, int]]:
+    from services.financial_service import FINANCIAL_DATA_PATH
+    try:
+        stat = os.stat(FINANCIAL_DATA_PATH / "financial_raw_accounts.csv")
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _harmonize(brand: Optional[str], account_mapping: Dict[str, Dict], cost_center_mapping: Dict[str, Dict]) -> FinancialSnapshot:
+    from services.financial_service import load_raw_accounts
+
+    snapshot = FinancialSnapshot(brand=brand.upper() if brand else None)
+    brands = set()
+    source_accounts = set()
+
+    for row in load_raw_accounts(brand):
+        source_account_name = row.get("source_account_name", "").strip()
+        source_cost_center = row.get("source_cost_center", "").strip()
+        source_account_number = row.get("source_account_number", "").strip()
+        row_brand = row.get("brand", "").upper()
+        issue_brand = row.get("brand", brand.upper() if brand else "")
+
+        snapshot.total_rows += 1
+        if row_brand.strip():
+            brands.add(row_brand.strip())
+        if source_account_name:
+            source_accounts.add(source_account_name)
+
+        account_map = account_mapping.get(source_account_name)
+        cc_map = cost_center_mapping.get(source_cost_center)
+
+        # Preview: only rows with both account and cost center mapped
+        if account_map is not None and cc_map is not None:
+            snapshot.fully_mapped_rows += 1
+            snapshot.preview.append({
+                "brand": brand.upper() if brand else row_brand,
+                "source_account": source_account_number,
+                "source_account_name": source_account_name,
+                "unified_account": account_map["unified_account_number"],
+                "unified_account_name": account_map["unified_account_name"],
+                "unified_cost_center": cc_map["unified_cost_center"],
+                "unified_cost_center_name": cc_map["unified_cost_center_name"],
+                "amount": row.get("amount", "").strip()
+            })
+
+        if account_map is None:
+            snapshot.unmapped_account_rows += 1
+            snapshot.issues.append({
+                "type": "UNMAPPED_ACCOUNT",
+                "message": f"Account '{source_account_name} ({source_account_number})' could not be mapped. Resolve this in Mapping Governance.",
+                "source_account_name": source_account_name,
+                "source_account_number": source_account_number,
+                "brand": issue_brand
+            })
+            snapshot.variances.append({
+                "variance_type": "UNMAPPED_ACCOUNT",
+                "brand": row_brand,
+                "unified_account": "UNMAPPED",
+                "source_account_number": source_account_number,
+                "source_account_name": source_account_name,
+                "source_cost_center": source_cost_center,
+                "message": f"Account '{source_account_name} ({source_account_number})' has no unified mapping"
+            })
+
+        if source_cost_center and cc_map is None:
+            snapshot.unmapped_cost_center_rows += 1
+            snapshot.issues.append({
+                "type": "UNMAPPED_COST_CENTER",
+                "message": f"Cost center '{source_cost_center}' could not be mapped. Resolve this in Mapping Governance.",
+                "source_account_name": source_account_name,
+                "source_account_number": source_account_number,
+                "source_cost_center": source_cost_center,
+                "brand": issue_brand
+            })
+            snapshot.variances.append({
+                "variance_type": "UNMAPPED_COST_CENTER",
+                "brand": row_brand,
+                "unified_account": account_map["unified_account_number"] if account_map is not None else "UNMAPPED",
+                "source_account_number": source_account_number,
+                "source_account_name": source_account_name,
+                "source_cost_center": source_cost_center,
+                "message": f"Cost center '{source_cost_center}' has no unified mapping"
+            })
+
+    snapshot.brands = sorted(brands)
+    snapshot.source_accounts = len(source_accounts)
+    return snapshot
+
+
+def harmonize_financials(brand: Optional[str] = None) -> FinancialSnapshot:
+    """Preview rows, data quality issues, variances and readiness counters for a brand (None = all brands)."""
+    key = brand.upper() if brand else ""
+    raw_signature = _raw_signature()
+    account_mapping = mapping_repository.get_account_mapping_index()
+    cost_center_mapping = mapping_repository.get_cost_center_mapping_index()
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == raw_signature and cached[1] is account_mapping and cached[2] is cost_center_mapping:
+            return cached[3]
+
+    snapshot = _harmonize(brand, account_mapping, cost_center_mapping)
+    with _cache_lock:
+        _cache[key] = (raw_signature, account_mapping, cost_center_mapping, snapshot)
+    return snapshot
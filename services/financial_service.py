@@ -2,11 +2,19 @@
 Financial Integration Service - CSV-driven, minimal workflow.
 """
 import csv
+import hashlib
+import io
+import os
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import uuid
 
+from services import financial_engine, mapping_repository
+from services.financial_storage import get_submission_store, write_atomic
+from utils.minor_units import format_amount
+
 BASE_PATH = Path(__file__).resolve().parent.parent
 FINANCIAL_DATA_PATH = BASE_PATH / "data" / "financial"
 
@@ -29,123 +37,78 @@ def load_raw_accounts(brand: Optional[str] = None) -> List[Dict]:
 
 
 def load_unified_account_mapping() -> Dict[str, Dict]:
-    """Load unified account mappings."""
-    mappings = {}
-    path = FINANCIAL_DATA_PATH / "unified_account_mapping.csv"
-    if path.exists():
-        with open(path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                source_name = row.get("source_account_name", "").strip()
-                mappings[source_name] = {
-                    "unified_account_name": row.get("unified_account_name", "").strip(),
-                    "unified_account_number": row.get("unified_account_number", "").strip()
-                }
-    return mappings
+    """Load unified account mappings (cached, read-only)."""
+    return mapping_repository.get_account_mapping_index()
 
 
 def load_unified_cost_center_mapping() -> Dict[str, Dict]:
-    """Load unified cost center mappings."""
-    mappings = {}
-    path = FINANCIAL_DATA_PATH / "unified_cost_center_mapping.csv"
-    if path.exists():
-        with open(path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                source_cc = row.get("source_cost_center", "").strip()
-                mappings[source_cc] = {
-                    "unified_cost_center": row.get("unified_cost_center", "").strip(),
-                    "unified_cost_center_name": row.get("unified_cost_center_name", "").strip()
-                }
-    return mappings
+    """Load unified cost center mappings (cached, read-only)."""
+    return mapping_repository.get_cost_center_mapping_index()
 
 
 def check_data_quality(brand: Optional[str] = None) -> List[Dict]:
     """Check data quality issues - visible to Maya, read-only, indicates Mapping Governance fix."""
-    raw_accounts = load_raw_accounts(brand)
-    account_mapping = load_unified_account_mapping()
-    cost_center_mapping = load_unified_cost_center_mapping()
-    
-    issues = []
-    
-    for row in raw_accounts:
-        source_account_name = row.get("source_account_name", "").strip()
-        source_cost_center = row.get("source_cost_center", "").strip()
-        source_account_number = row.get("source_account_number", "").strip()
-        
-        # Check for unmapped account
-        if source_account_name not in account_mapping:
-            issues.append({
-                "type": "UNMAPPED_ACCOUNT",
-                "message": f"Account '{source_account_name} ({source_account_number})' could not be mapped. Resolve this in Mapping Governance.",
-                "source_account_name": source_account_name,
-                "source_account_number": source_account_number,
-                "brand": row.get("brand", brand.upper() if brand else "")
-            })
-        
-        # Check for unmapped cost center
-        if source_cost_center and source_cost_center not in cost_center_mapping:
-            issues.append({
-                "type": "UNMAPPED_COST_CENTER",
-                "message": f"Cost center '{source_cost_center}' could not be mapped. Resolve this in Mapping Governance.",
-                "source_account_name": source_account_name,
-                "source_account_number": source_account_number,
-                "source_cost_center": source_cost_center,
-                "brand": row.get("brand", brand.upper() if brand else "")
-            })
-    
-    return issues
+    return list(financial_engine.harmonize_financials(brand).issues)
 
 
 def _compute_preview_submission(brand: str) -> List[Dict]:
     """
     Internal function to compute preview submission from raw data using current mappings.
-    This performs the harmonization logic.
+    This performs the harmonization logic (shared single pass, see financial_engine).
     """
-    raw_accounts = load_raw_accounts(brand)
-    account_mapping = load_unified_account_mapping()
-    cost_center_mapping = load_unified_cost_center_mapping()
-    
-    preview = []
-    
-    for row in raw_accounts:
-        source_account_name = row.get("source_account_name", "").strip()
-        source_cost_center = row.get("source_cost_center", "").strip()
-        
-        # Check if both account and cost center are mapped
-        if source_account_name in account_mapping and source_cost_center in cost_center_mapping:
-            account_map = account_mapping[source_account_name]
-            cc_map = cost_center_mapping[source_cost_center]
-            
-            preview.append({
-                "brand": brand.upper(),
-                "source_account": row.get("source_account_number", "").strip(),
-                "source_account_name": source_account_name,
-                "unified_account": account_map["unified_account_number"],
-                "unified_account_name": account_map["unified_account_name"],
-                "unified_cost_center": cc_map["unified_cost_center"],
-                "unified_cost_center_name": cc_map["unified_cost_center_name"],
-                "amount": row.get("amount", "").strip()
-            })
-    
-    return preview
+    return list(financial_engine.harmonize_financials(brand).preview)
+
+
+PREVIEW_FIELDNAMES = ["brand", "source_account", "source_account_name", "unified_account",
+                      "unified_account_name", "unified_cost_center", "unified_cost_center_name", "amount"]
+
+# preview path -> (file signature, sha1 of its contents) as last written or read
+_preview_digests: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+_preview_lock = threading.Lock()
+
 
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _stored_preview_digest(path: Path) -> Optional[str]:
+    signature = _file_signature(path)
+    if signature is None:
+        return None
+    cached = _preview_digests.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    digest = hashlib.sha1(path.read_bytes()).hexdigest()
+    _preview_digests[path] = (signature, digest)
+    return digest
 
-def save_preview_submission(brand: str, preview_data: List[Dict]) -> None:
-    """Save preview submission data for a brand to CSV (replaces existing data)."""
+
+def save_preview_submission(brand: str, preview_data: List[Dict]) -> bool:
+    """
+    Save preview submission data for a brand to CSV (replaces existing data).
+    The file is only rewritten when its contents would change; returns whether it was.
+    """
     preview_path = FINANCIAL_DATA_PATH / f"preview_submission_{brand.lower()}.csv"
     
-    # Ensure directory exists
-    preview_path.parent.mkdir(parents=True, exist_ok=True)
+    buffer = io.StringIO(newline='')
+    writer = csv.DictWriter(buffer, fieldnames=PREVIEW_FIELDNAMES)
+    writer.writeheader()
+    writer.writerows(preview_data)
+    payload = buffer.getvalue().encode('utf-8')
+    digest = hashlib.sha1(payload).hexdigest()
     
-    with open(preview_path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ["brand", "source_account", "source_account_name", "unified_account", 
-                     "unified_account_name", "unified_cost_center", "unified_cost_center_name", "amount"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(preview_data)
+    with _preview_lock:
+        if _stored_preview_digest(preview_path) == digest:
+            return False
+        write_atomic(preview_path, payload)
+        _preview_digests[preview_path] = (_file_signature(preview_path), digest)
     
     print(f"[FINANCIAL] Preview submission saved for {brand.upper()} - {len(preview_data)} records")
+    return True
 
 
 def load_preview_submission(brand: str) -> List[Dict]:
@@ -181,12 +144,7 @@ def recompute_preview_submissions_for_all_brands() -> None:
     This replaces existing preview data (does not append).
     """
     # Get all unique brands from raw data
-    raw_accounts = load_raw_accounts(None)
-    brands = set()
-    for row in raw_accounts:
-        brand = row.get("brand", "").strip().upper()
-        if brand:
-            brands.add(brand)
+    brands = financial_engine.harmonize_financials(None).brands
     
     if not brands:
         print(f"[FINANCIAL] No brands found in raw data - skipping preview recomputation")
@@ -211,12 +169,17 @@ def get_preview_submission(brand: str) -> List[Dict]:
     preview = _compute_preview_submission(brand)
     
     # Save the computed preview (replaces any existing stored data)
-    # This ensures stored preview always matches current mappings
+    # This ensures stored preview always matches current mappings; unchanged previews are not rewritten
     save_preview_submission(brand, preview)
     
     return preview
 
 
+def recover_submission_files() -> Dict[str, int]:
+    """Startup check of the submission store (truncates a torn trailing CSV line)."""
+    return get_submission_store().recover()
+
+
 def submit_to_corporate(brand: str) -> Dict:
     """
     Submit brand data to corporate - create submission record and snapshot.
@@ -224,13 +187,10 @@ def submit_to_corporate(brand: str) -> Dict:
     Blocks submission if there are unmapped accounts or cost centers.
     """
     # Recompute variances dynamically to check eligibility
-    variances = calculate_variances(brand)
+    snapshot = financial_engine.harmonize_financials(brand)
     
     # Check for blocking variances (unmapped accounts or cost centers)
-    blocking_variances = [
-        v for v in variances 
-        if v.get("variance_type") in ["UNMAPPED_ACCOUNT", "UNMAPPED_COST_CENTER"]
-    ]
+    blocking_variances = snapshot.blocking_variances
     
     if blocking_variances:
         blocking_count = len(blocking_variances)
@@ -249,311 +209,122 @@ def submit_to_corporate(brand: str) -> Dict:
     submission_id = str(uuid.uuid4())
     timestamp = datetime.now().isoformat()
     
-    # Write to financial_submissions.csv
-    submissions_path = FINANCIAL_DATA_PATH / "financial_submissions.csv"
-    submissions = []
-    
-    if submissions_path.exists():
-        with open(submissions_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            submissions = [dict(row) for row in reader]
-    
-    submissions.append({
-        "submission_id": submission_id,
-        "brand": brand.upper(),
-        "status": "SUBMITTED",
-        "timestamp": timestamp
-    })
-    
-    with open(submissions_path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ["submission_id", "brand", "status", "timestamp"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(submissions)
-    
-    # Write to financial_submission_rows.csv
-    rows_path = FINANCIAL_DATA_PATH / "financial_submission_rows.csv"
-    submission_rows = []
-    
-    if rows_path.exists():
-        with open(rows_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            submission_rows = [dict(row) for row in reader]
-    
-    for row in preview:
-        submission_rows.append({
+    get_submission_store().append_submission(
+        {
             "submission_id": submission_id,
             "brand": brand.upper(),
-            "source_account": row.get("source_account", ""),
-            "unified_account": row.get("unified_account", ""),
-            "unified_cost_center": row.get("unified_cost_center", ""),
-            "amount": row.get("amount", "")
-        })
-    
-    with open(rows_path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ["submission_id", "brand", "source_account", "unified_account", "unified_cost_center", "amount"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(submission_rows)
+            "status": "SUBMITTED",
+            "timestamp": timestamp
+        },
+        [
+            {
+                "submission_id": submission_id,
+                "brand": brand.upper(),
+                "source_account": row.get("source_account", ""),
+                "unified_account": row.get("unified_account", ""),
+                "unified_cost_center": row.get("unified_cost_center", ""),
+                "amount": row.get("amount", "")
+            }
+            for row in preview
+        ]
+    )
     
     return {"ok": True, "submission_id": submission_id, "record_count": len(preview)}
 
 
 def load_submissions(brand: Optional[str] = None) -> List[Dict]:
     """Load submissions."""
-    path = FINANCIAL_DATA_PATH / "financial_submissions.csv"
-    if not path.exists():
-        return []
-    
-    submissions = []
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if brand and row.get("brand", "").upper() != brand.upper():
-                continue
-            submissions.append(dict(row))
-    
-    return submissions
+    return get_submission_store().load_submissions(brand)
 
 
 def load_submission_rows(submission_id: str) -> List[Dict]:
     """Load rows for a specific submission."""
-    path = FINANCIAL_DATA_PATH / "financial_submission_rows.csv"
-    if not path.exists():
-        return []
-    
-    rows = []
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get("submission_id") == submission_id:
-                rows.append(dict(row))
-    
-    return rows
+    return get_submission_store().load_submission_rows(submission_id)
+
+
+def load_submission_rows_batch(submission_ids: List[str]) -> Dict[str, List[Dict]]:
+    """Load rows for several submissions at once, keyed by submission_id."""
+    return get_submission_store().load_submission_rows_batch(submission_ids)
 
 
 def get_brand_approved_view(brand: str) -> List[Dict]:
-    """Get brand-level approved view - reads from brand_approved_financials.csv filtered by brand."""
-    path = FINANCIAL_DATA_PATH / "brand_approved_financials.csv"
-    if not path.exists():
-        return []
-    
+    """Get brand-level approved view - approved ledger rows filtered by brand."""
     rows = []
-    brand_upper = brand.upper()
-    
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get("brand", "").upper() == brand_upper:
-                # Return format compatible with frontend expectations
-                rows.append({
-                    "source_account": "",  # Not stored in approved data
-                    "unified_account": row.get("unified_account", ""),
-                    "unified_cost_center": row.get("unified_cost_center", ""),
-                    "amount": row.get("amount", "")
-                })
+    for row in get_submission_store().load_approved(brand):
+        # Return format compatible with frontend expectations
+        rows.append({
+            "source_account": "",  # Not stored in approved data
+            "unified_account": row.get("unified_account", ""),
+            "unified_cost_center": row.get("unified_cost_center", ""),
+            "amount": row.get("amount", "")
+        })
     
     return rows
 
 
 def get_corporate_unified_view() -> List[Dict]:
-    """Get corporate unified view - aggregates from brand_approved_financials.csv by unified_account + unified_cost_center, SUM amounts."""
-    path = FINANCIAL_DATA_PATH / "brand_approved_financials.csv"
-    if not path.exists():
-        return []
-    
-    # Load all approved rows
-    rows = []
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = [dict(row) for row in reader]
-    
-    # Aggregate by unified_account + unified_cost_center, SUM amounts
-    aggregated = {}
-    
-    for row in rows:
-        unified_account = row.get("unified_account", "").strip()
-        unified_cost_center = row.get("unified_cost_center", "").strip()
-        brand = row.get("brand", "").upper()
-        amount_str = row.get("amount", "").strip()
-        
-        try:
-            amount = float(amount_str) if amount_str else 0.0
-        except:
-            amount = 0.0
-        
-        # Create composite key
-        key = (unified_account, unified_cost_center)
-        
-        if key not in aggregated:
-            aggregated[key] = {
-                "unified_account": unified_account,
-                "unified_cost_center": unified_cost_center,
-                "amount": 0.0,
-                "brands": set()
-            }
-        
-        aggregated[key]["amount"] += amount
-        aggregated[key]["brands"].add(brand)
-    
-    # Convert to list format (brand NOT a row dimension)
+    """Get corporate unified view - approved amounts summed by unified_account + unified_cost_center, as exact decimal strings."""
+    # Maintained on approval/rejection, so this is O(groups) rather than a pass over the ledger
     result = []
-    for key, agg in aggregated.items():
+    for group in get_submission_store().load_aggregate().unified():
         result.append({
-            "unified_account": agg["unified_account"],
-            "unified_cost_center": agg["unified_cost_center"],
-            "amount": str(agg["amount"]),
-            "contributing_brands": sorted(list(agg["brands"]))  # Metadata only
+            "unified_account": group["unified_account"],
+            "unified_cost_center": group["unified_cost_center"],
+            "amount": format_amount(group["amount"]),
+            "contributing_brands": sorted(group["brands"])  # Metadata only (brand is NOT a row dimension)
         })
-    
-    # Sort by unified_account, then unified_cost_center
-    result.sort(key=lambda x: (x["unified_account"], x["unified_cost_center"]))
-    
     return result
 
 
 def calculate_variances(brand: Optional[str] = None) -> List[Dict]:
     """
     Calculate variances from RAW data + CURRENT mappings.
-    Computed dynamically, not dependent on approvals or submissions.
+    Computed dynamically, not dependent on approvals or submissions
+    (cached by financial_engine until the raw data or a mapping changes).
     
     Variance types:
     - UNMAPPED_ACCOUNT: Account name has no unified mapping
     - UNMAPPED_COST_CENTER: Cost center has no unified mapping
     """
-    # Load raw data and current mappings
-    raw_accounts = load_raw_accounts(brand)
-    account_mapping = load_unified_account_mapping()
-    cost_center_mapping = load_unified_cost_center_mapping()
-    
-    variances = []
-    
-    # A) UNMAPPED_ACCOUNT and UNMAPPED_COST_CENTER (brand-specific)
-    for row in raw_accounts:
-        source_account_name = row.get("source_account_name", "").strip()
-        source_cost_center = row.get("source_cost_center", "").strip()
-        source_account_number = row.get("source_account_number", "").strip()
-        row_brand = row.get("brand", "").upper()
-        
-        # A) UNMAPPED_ACCOUNT
-        if source_account_name not in account_mapping:
-            variances.append({
-                "variance_type": "UNMAPPED_ACCOUNT",
-                "brand": row_brand,
-                "unified_account": "UNMAPPED",
-                "source_account_number": source_account_number,
-                "source_account_name": source_account_name,
-                "source_cost_center": source_cost_center,
-                "message": f"Account '{source_account_name} ({source_account_number})' has no unified mapping"
-            })
-        
-        # B) UNMAPPED_COST_CENTER
-        if source_cost_center and source_cost_center not in cost_center_mapping:
-            unified_account = account_mapping.get(source_account_name, {}).get("unified_account_number", "UNMAPPED")
-            variances.append({
-                "variance_type": "UNMAPPED_COST_CENTER",
-                "brand": row_brand,
-                "unified_account": unified_account,
-                "source_account_number": source_account_number,
-                "source_account_name": source_account_name,
-                "source_cost_center": source_cost_center,
-                "message": f"Cost center '{source_cost_center}' has no unified mapping"
-                })
-    
-    return variances
+    return list(financial_engine.harmonize_financials(brand).variances)
 
 
 def persist_approved_data(submission_id: str, brand: str) -> None:
-    """Persist approved submission rows to brand_approved_financials.csv."""
+    """Persist approved submission rows to the approved ledger (brand_approved_financials)."""
     # Load submission rows
     submission_rows = load_submission_rows(submission_id)
     if not submission_rows:
         return
     
-    # Load existing approved data
-    approved_path = FINANCIAL_DATA_PATH / "brand_approved_financials.csv"
-    existing_rows = []
-    
-    if approved_path.exists():
-        with open(approved_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            existing_rows = [dict(row) for row in reader]
-    
-    # Remove any existing rows for this submission_id (in case re-approving)
-    existing_rows = [r for r in existing_rows if r.get("submission_id") != submission_id]
-    
-    # Add new approved rows with approved_timestamp
+    # Replace any existing rows for this submission_id (in case re-approving)
     approved_timestamp = datetime.now().isoformat()
-    for row in submission_rows:
-        existing_rows.append({
+    get_submission_store().replace_approved(submission_id, [
+        {
             "submission_id": submission_id,
             "brand": brand.upper(),
             "unified_account": row.get("unified_account", ""),
             "unified_cost_center": row.get("unified_cost_center", ""),
             "amount": row.get("amount", ""),
             "approved_timestamp": approved_timestamp
-        })
-    
-    # Write back
-    with open(approved_path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ["submission_id", "brand", "unified_account", "unified_cost_center", "amount", "approved_timestamp"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(existing_rows)
+        }
+        for row in submission_rows
+    ])
 
 
 def remove_approved_data(submission_id: str) -> None:
     """Remove approved data for a rejected submission."""
-    approved_path = FINANCIAL_DATA_PATH / "brand_approved_financials.csv"
-    if not approved_path.exists():
-        return
-    
-    # Load existing approved data
-    existing_rows = []
-    with open(approved_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        existing_rows = [dict(row) for row in reader]
-    
-    # Remove rows for this submission_id
-    filtered_rows = [r for r in existing_rows if r.get("submission_id") != submission_id]
-    
-    # Write back
-    with open(approved_path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ["submission_id", "brand", "unified_account", "unified_cost_center", "amount", "approved_timestamp"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(filtered_rows)
+    get_submission_store().remove_approved(submission_id)
 
 
 def update_submission_status(submission_id: str, status: str) -> Dict:
     """Update submission status (APPROVED or REJECTED) and persist/remove approved data."""
-    path = FINANCIAL_DATA_PATH / "financial_submissions.csv"
-    if not path.exists():
+    try:
+        submission_brand = get_submission_store().set_submission_status(submission_id, status)
+    except FileNotFoundError:
         return {"ok": False, "error": "No submissions found"}
-    
-    submissions = []
-    found = False
-    submission_brand = None
-    
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get("submission_id") == submission_id:
-                submission_brand = row.get("brand", "")
-                row["status"] = status
-                found = True
-            submissions.append(dict(row))
-    
-    if not found:
+    if submission_brand is None:
         return {"ok": False, "error": "Submission not found"}
     
-    # Update submissions CSV
-    with open(path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ["submission_id", "brand", "status", "timestamp"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(submissions)
-    
     # Persist or remove approved data based on status
     if status == "APPROVED" and submission_brand:
         persist_approved_data(submission_id, submission_brand)
@@ -586,76 +357,8 @@ def reset_financial_integration_state() -> Dict:
     - Vendor data
     - UI/layout/roles
     """
-    reset_steps = []
-    
-    # STEP 1: Delete all records from financial_submissions.csv (hard reset)
-    submissions_path = FINANCIAL_DATA_PATH / "financial_submissions.csv"
-    if submissions_path.exists():
-        # Read to count how many we're deleting
-        with open(submissions_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            count = sum(1 for _ in reader)
-        
-        # Create empty file with header only
-        with open(submissions_path, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ["submission_id", "brand", "status", "timestamp"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-        
-        reset_steps.append(f"Deleted {count} submission record(s) from financial_submissions.csv")
-    else:
-        # Create empty file with header
-        with open(submissions_path, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ["submission_id", "brand", "status", "timestamp"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-        reset_steps.append("Created empty financial_submissions.csv")
-    
-    # STEP 2: Delete all records from financial_submission_rows.csv (hard reset)
-    submission_rows_path = FINANCIAL_DATA_PATH / "financial_submission_rows.csv"
-    if submission_rows_path.exists():
-        # Read to count how many we're deleting
-        with open(submission_rows_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            count = sum(1 for _ in reader)
-        
-        # Create empty file with header only
-        with open(submission_rows_path, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ["submission_id", "brand", "source_account", "unified_account", "unified_cost_center", "amount"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-        
-        reset_steps.append(f"Deleted {count} submission row(s) from financial_submission_rows.csv")
-    else:
-        # Create empty file with header
-        with open(submission_rows_path, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ["submission_id", "brand", "source_account", "unified_account", "unified_cost_center", "amount"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-        reset_steps.append("Created empty financial_submission_rows.csv")
-    
-    # STEP 3: Clear brand_approved_financials.csv (empty but keep header)
-    approved_path = FINANCIAL_DATA_PATH / "brand_approved_financials.csv"
-    if approved_path.exists():
-        # Read to count how many we're deleting
-        with open(approved_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            count = sum(1 for _ in reader)
-        
-        # Write empty file with just header
-        with open(approved_path, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ["submission_id", "brand", "unified_account", "unified_cost_center", "amount", "approved_timestamp"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-        
-        reset_steps.append(f"Deleted {count} approved record(s) from brand_approved_financials.csv")
-    else:
-        # Create empty file with header
-        with open(approved_path, 'w', encoding='utf-8', newline='') as f:
-            fieldnames = ["submission_id", "brand", "unified_account", "unified_cost_center", "amount", "approved_timestamp"]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-        reset_steps.append("Created empty brand_approved_financials.csv")
+    # STEPS 1-3: Delete submission records, submission rows and approved records
+    reset_steps = get_submission_store().reset()
     
     # STEP 4: Regenerate Preview Submission for all brands
     try:
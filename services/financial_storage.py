@@ -0,0 +1,985 @@
+"""
+Financial Storage - pluggable persistence for submission history, submission
+rows and the brand-approved ledger.
+
+Two backends share the SubmissionStore interface:
+- csv:    the flat files in data/financial (the default; fine for small installs),
+          plus a byte-offset index into the submission rows file
+- sqlite: data/financial/financial.sqlite in WAL mode, so readers never block
+          on a writer, with indexes on submission_id, brand and
+          (unified_account, unified_cost_center). The first open imports the
+          existing CSVs once.
+
+Both keep a running corporate unified aggregate of the approved ledger
+(exact totals per unified account, cost center and brand, summed as int64
+minor units by utils.minor_units), updated by the same deltas that approve
+or reject a submission, so the corporate view does not re-read the ledger.
+
+The backend is picked by the FINANCIAL_STORAGE_BACKEND environment variable.
+
+    python -m services.financial_storage migrate [--force]
+    python -m services.financial_storage rebuild-row-index
+    python -m services.financial_storage verify-aggregate [--rebuild] [--backend csv|sqlite]
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.minor_units import sum_amounts
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+FINANCIAL_DATA_PATH = BASE_PATH / "data" / "financial"
+SQLITE_FILE_NAME = "financial.sqlite"
+
+STORAGE_BACKENDS = ("csv", "sqlite")
+DEFAULT_STORAGE_BACKEND = "csv"
+
+SUBMISSION_FIELDNAMES = ["submission_id", "brand", "status", "timestamp"]
+SUBMISSION_ROW_FIELDNAMES = ["submission_id", "brand", "source_account", "unified_account", "unified_cost_center", "amount"]
+APPROVED_FIELDNAMES = ["submission_id", "brand", "unified_account", "unified_cost_center", "amount", "approved_timestamp"]
+
+SUBMISSIONS_FILE = "financial_submissions.csv"
+SUBMISSION_ROWS_FILE = "financial_submission_rows.csv"
+APPROVED_FILE = "brand_approved_financials.csv"
+# Corporate unified totals of the approved ledger, maintained by the CSV backend
+APPROVED_AGGREGATE_FILE = "brand_approved_financials.aggregate.json"
+# Files only ever appended to by append_submission
+APPEND_ONLY_FILES = [SUBMISSIONS_FILE, SUBMISSION_ROWS_FILE]
+
+_append_lock = threading.Lock()
+
+
+# File helpers
+def write_atomic(path: Path, payload: bytes) -> None:
+    """Write via a temp file in the same directory and rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def _complete_row(line: bytes, field_count: int) -> bool:
+    """Whether an unterminated last line is a whole CSV row rather than a write cut short."""
+    try:
+        rows = list(csv.reader(io.StringIO(line.decode('utf-8')), strict=True))
+    except (UnicodeDecodeError, csv.Error):
+        return False
+    return len(rows) == 1 and len(rows[0]) >= field_count
+
+
+def truncate_torn_tail(path: Path) -> int:
+    """
+    Repair a last line without a line ending. A whole row (it parses and
+    has as many fields as the header) only gets the missing line ending; a
+    write interrupted mid-row is cut off. Returns the bytes removed.
+    """
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return 0
+        # Scan backwards for the last complete line
+        end = size
+        keep = 0
+        while end > 0:
+            start = max(0, end - 65536)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b'\n')
+            if newline != -1:
+                keep = start + newline + 1
+                break
+            end = start
+        f.seek(0)
+        header = f.readline()
+        f.seek(keep)
+        tail = f.read()
+        field_count = len(next(csv.reader([header.decode('utf-8', 'replace')]), []))
+        if _complete_row(tail.rstrip(b'\r'), field_count):
+            # Same line ending as the header (csv writes \r\n)
+            ending = b'\r\n' if header.endswith(b'\r\n') or not header.endswith(b'\n') else b'\n'
+            f.seek(size)
+            f.write(b'\n' if tail.endswith(b'\r') else ending)
+            keep = size
+        else:
+            f.truncate(keep)
+        f.flush()
+        os.fsync(f.fileno())
+    return size - keep
+
+
+def append_csv_rows(path: Path, fieldnames: List[str], rows: List[Dict]) -> None:
+    """
+    Append rows to a CSV with one buffered write and fsync; the cost does not
+    grow with the file. A missing or empty file gets the header first; a file
+    with a different header is rewritten once with the expected one.
+    """
+    with _append_lock:
+        header = b""
+        if path.exists():
+            with open(path, 'rb') as f:
+                header = f.readline()
+        buffer = io.StringIO(newline='')
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+
+        if header and header.decode('utf-8').strip() != ",".join(fieldnames):
+            with open(path, 'r', encoding='utf-8') as f:
+                existing = [dict(row) for row in csv.DictReader(f)]
+            writer.writeheader()
+            writer.writerows({key: row.get(key, "") for key in fieldnames} for row in existing + rows)
+            write_atomic(path, buffer.getvalue().encode('utf-8'))
+            return
+
+        if not header:
+            writer.writeheader()
+        else:
+            truncate_torn_tail(path)
+        writer.writerows(rows)
+        with open(path, 'ab') as f:
+            f.write(buffer.getvalue().encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _read_csv(path: Path) -> List[Dict]:
+    if not path.exists():
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [dict(row) for row in csv.DictReader(f)]
+
+
+def _write_csv(path: Path, fieldnames: List[str], rows: Iterable[Dict]) -> None:
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class SubmissionRowIndex:
+    """
+    Byte ranges of each submission's rows in financial_submission_rows.csv,
+    so one submission is read with a seek and a bounded read instead of a
+    scan of the whole file.
+
+    The sidecar file (<rows file>.idx) holds one "submission_id,start,end"
+    line per range and is only ever appended to. Each sync indexes whatever
+    the rows file gained since the last one (normally just the rows of the
+    latest submission); a rows file that shrank, or a range that no longer
+    holds the submission's rows, triggers a full rebuild. Derived data
+    only: deleting the sidecar is always safe.
+    """
+
+    def __init__(self, rows_path: Path):
+        self.rows_path = Path(rows_path)
+        self.path = self.rows_path.with_name(self.rows_path.name + ".idx")
+        self._lock = threading.RLock()
+        self._ranges: Dict[str, List[List[int]]] = {}
+        # Range ending furthest into the file, as (submission_id, [start, end])
+        self._last = None
+        self._header: List[str] = []
+        self._covered = 0
+        self._signature = None
+        self._loaded = False
+
+    def _read_header(self, f) -> int:
+        f.seek(0)
+        line = f.readline()
+        self._header = next(csv.reader([line.decode('utf-8')]), []) if line else []
+        return len(line)
+
+    def _add_range(self, submission_id: str, start: int, end: int) -> bool:
+        """Record a range; returns False when it just extended the submission's last range."""
+        ranges = self._ranges.setdefault(submission_id, [])
+        extended = bool(ranges) and ranges[-1][1] == start
+        if extended:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+        if self._last is None or end >= self._last[1][1]:
+            self._last = (submission_id, ranges[-1])
+        return not extended
+
+    def _scan(self, f, start: int) -> List[List]:
+        """Index the records from byte offset start to the end of the file."""
+        position = self._header.index("submission_id") if "submission_id" in self._header else 0
+        added: List[List] = []
+        f.seek(start)
+        offset = start
+        while True:
+            record = f.readline()
+            if not record:
+                break
+            # A quoted field may span lines: read on until the quotes balance
+            while record.count(b'"') % 2:
+                more = f.readline()
+                if not more:
+                    break
+                record += more
+            end = offset + len(record)
+            if record.strip():
+                if position == 0 and b'"' not in record:
+                    submission_id = record.split(b',', 1)[0].rstrip(b'\r\n').decode('utf-8')
+                else:
+                    fields = next(csv.reader([record.decode('utf-8')]), [])
+                    submission_id = fields[position] if position < len(fields) else ""
+                extended = not self._add_range(submission_id, offset, end)
+                if extended and added and added[-1][0] == submission_id and added[-1][2] == offset:
+                    added[-1][2] = end
+                else:
+                    added.append([submission_id, offset, end])
+            offset = end
+        self._covered = offset
+        return added
+
+    def _write_sidecar(self, entries: List[List], mode: str) -> None:
+        if not entries and mode == 'a':
+            return
+        buffer = io.StringIO(newline='')
+        csv.writer(buffer).writerows(entries)
+        with open(self.path, mode, encoding='utf-8', newline='') as f:
+            f.write(buffer.getvalue())
+
+    def _load_sidecar(self, header_end: int) -> bool:
+        self._ranges, self._last = {}, None
+        self._covered = header_end
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8', newline='') as f:
+                for submission_id, start, end in csv.reader(f):
+                    self._add_range(submission_id, int(start), int(end))
+                    self._covered = max(self._covered, int(end))
+        except (ValueError, csv.Error):
+            return False
+        return True
+
+    def rebuild(self) -> int:
+        """Re-index the whole rows file; returns the number of submissions indexed."""
+        with self._lock:
+            self._ranges, self._last = {}, None
+            if not self.rows_path.exists():
+                self._covered = 0
+                self._signature = None
+                if self.path.exists():
+                    self.path.unlink()
+                return 0
+            with open(self.rows_path, 'rb') as f:
+                header_end = self._read_header(f)
+                entries = self._scan(f, header_end)
+            self._write_sidecar(entries, 'w')
+            self._signature = _file_signature(self.rows_path)
+            self._loaded = True
+            return len(self._ranges)
+
+    def _tail_matches(self, f) -> bool:
+        """Cheap check that the last indexed range still holds its submission (file not replaced)."""
+        if self._last is None:
+            return True
+        submission_id, (start, end) = self._last
+        f.seek(start)
+        first = next(csv.reader([f.readline().decode('utf-8', errors='replace')]), [])
+        f.seek(end - 1)
+        position = self._header.index("submission_id") if "submission_id" in self._header else 0
+        return f.read(1) == b'\n' and position < len(first) and first[position] == submission_id
+
+    def sync(self) -> None:
+        """Bring the index up to date with the rows file."""
+        with self._lock:
+            signature = _file_signature(self.rows_path)
+            if signature is not None and signature == self._signature:
+                return
+            if signature is None:
+                self._ranges, self._last, self._covered, self._signature = {}, None, 0, None
+                return
+            with open(self.rows_path, 'rb') as f:
+                header_end = self._read_header(f)
+                if not self._loaded:
+                    self._loaded = self._load_sidecar(header_end)
+                stale = not self._loaded or signature[0] < self._covered or not self._tail_matches(f)
+                if not stale and signature[0] > self._covered:
+                    self._write_sidecar(self._scan(f, self._covered), 'a')
+            if stale:
+                self.rebuild()
+                return
+            self._signature = signature
+
+    def _read_ranges(self, submission_id: str) -> Optional[List[Dict]]:
+        rows = []
+        with open(self.rows_path, 'rb') as f:
+            for start, end in self._ranges.get(submission_id, []):
+                f.seek(start)
+                text = f.read(end - start).decode('utf-8')
+                for row in csv.DictReader(io.StringIO(text, newline=''), fieldnames=self._header):
+                    if row.get("submission_id") != submission_id:
+                        return None
+                    rows.append(row)
+        return rows
+
+    def rows(self, submission_id: str) -> List[Dict]:
+        """Rows of one submission, in file order."""
+        with self._lock:
+            self.sync()
+            rows = self._read_ranges(submission_id)
+            if rows is None:
+                # The file was rewritten in place; offsets are stale
+                self.rebuild()
+                rows = self._read_ranges(submission_id) or []
+            return rows
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "submissions": len(self._ranges),
+                "ranges": sum(len(ranges) for ranges in self._ranges.values()),
+                "bytes_indexed": self._covered,
+            }
+
+
+def parse_amount(amount: Optional[str]) -> Decimal:
+    """Exact value of a stored amount string; blank or unparseable amounts count as 0 (as before)."""
+    try:
+        value = Decimal((amount or "").strip() or "0")
+    except InvalidOperation:
+        return Decimal(0)
+    return value if value.is_finite() else Decimal(0)
+
+
+class ApprovedAggregate:
+    """
+    Corporate unified totals of the approved ledger, kept per
+    (unified_account, unified_cost_center, brand) as an exact amount and a
+    row count. Approving a submission adds its rows and rejecting subtracts
+    them, so reads cost O(groups) instead of a pass over every approved row.
+    A (account, cost center, brand) entry disappears once its row count
+    drops to zero.
+    """
+
+    def __init__(self):
+        self.groups: Dict[Tuple[str, str, str], List] = {}
+
+    @staticmethod
+    def key(row: Dict) -> Tuple[str, str, str]:
+        return (
+            (row.get("unified_account") or "").strip(),
+            (row.get("unified_cost_center") or "").strip(),
+            (row.get("brand") or "").upper(),
+        )
+
+    @classmethod
+    def totals(cls, rows: Iterable[Dict]) -> Dict[Tuple[str, str, str], List]:
+        """Exact amount and row count per (account, cost center, brand), summed as int64 minor units."""
+        rows = rows if isinstance(rows, list) else list(rows)
+        # Each key column as small integer codes of its normalized values, combined into one int64 per row
+        combined = np.zeros(len(rows), dtype=np.int64)
+        radix = 1
+        for field, normalize in (("unified_account", str.strip), ("unified_cost_center", str.strip), ("brand", str.upper)):
+            raw: Dict[str, int] = {}
+            codes = [raw.setdefault(row.get(field) or "", len(raw)) for row in rows]
+            normalized: Dict[str, int] = {}
+            remap = np.array([normalized.setdefault(normalize(value), len(normalized)) for value in raw], dtype=np.int64)
+            if radix * len(normalized) >= 2 ** 62:
+                combined = np.unique(combined, return_inverse=True)[1].astype(np.int64)
+                radix = int(combined.max(initial=0)) + 1
+            combined = combined * len(normalized) + remap[np.asarray(codes, dtype=np.int64)]
+            radix *= max(len(normalized), 1)
+        groups, first_rows, group_codes = np.unique(combined, return_index=True, return_inverse=True)
+        amounts = [row.get("amount") or "" for row in rows]
+        sums, counts = sum_amounts(group_codes, amounts, len(groups), parse_amount)
+        return {cls.key(rows[first]): [sums[code], int(counts[code])] for code, first in enumerate(first_rows.tolist())}
+
+    def apply(self, rows: Iterable[Dict], sign: int = 1) -> None:
+        for key, (amount, count) in self.totals(rows).items():
+            entry = self.groups.setdefault(key, [Decimal(0), 0])
+            entry[0] += sign * amount
+            entry[1] += sign * count
+            if entry[1] <= 0:
+                del self.groups[key]
+
+    @classmethod
+    def from_ledger(cls, rows: Iterable[Dict]) -> "ApprovedAggregate":
+        aggregate = cls()
+        aggregate.apply(rows)
+        return aggregate
+
+    def to_rows(self) -> List[Dict]:
+        return [
+            {"unified_account": account, "unified_cost_center": cost_center, "brand": brand,
+             "amount": str(amount), "rows": count}
+            for (account, cost_center, brand), (amount, count) in self.groups.items()
+        ]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict]) -> "ApprovedAggregate":
+        aggregate = cls()
+        for row in rows:
+            key = (row["unified_account"], row["unified_cost_center"], row["brand"])
+            aggregate.groups[key] = [Decimal(row["amount"]), int(row["rows"])]
+        return aggregate
+
+    def unified(self) -> List[Dict]:
+        """Totals per (unified_account, unified_cost_center) with the contributing brands, sorted by key."""
+        merged: Dict[Tuple[str, str], Dict] = {}
+        for (account, cost_center, brand), (amount, _) in self.groups.items():
+            group = merged.setdefault((account, cost_center), {
+                "unified_account": account,
+                "unified_cost_center": cost_center,
+                "amount": Decimal(0),
+                "brands": set()
+            })
+            group["amount"] += amount
+            group["brands"].add(brand)
+        return [merged[key] for key in sorted(merged)]
+
+    def differences(self, other: "ApprovedAggregate") -> List[Dict]:
+        """Entries whose amount or row count differ between two aggregates."""
+        return [
+            {"unified_account": key[0], "unified_cost_center": key[1], "brand": key[2],
+             "stored": self.groups.get(key), "expected": other.groups.get(key)}
+            for key in sorted(set(self.groups) | set(other.groups))
+            if self.groups.get(key) != other.groups.get(key)
+        ]
+
+
+class SubmissionStore(ABC):
+    """
+    Submission history, submission rows and the approved ledger. Rows are
+    plain dicts keyed by the CSV column names, returned in insertion order.
+    A backend missing one of the abstract methods fails when instantiated.
+    """
+    name = ""
+
+    @abstractmethod
+    def append_submission(self, submission: Dict, rows: List[Dict]) -> None:
+        ...
+
+    @abstractmethod
+    def load_submissions(self, brand: Optional[str] = None) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def load_submission_rows(self, submission_id: str) -> List[Dict]:
+        ...
+
+    def load_submission_rows_batch(self, submission_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Rows of several submissions, keyed by submission_id."""
+        return {submission_id: self.load_submission_rows(submission_id) for submission_id in dict.fromkeys(submission_ids)}
+
+    @abstractmethod
+    def set_submission_status(self, submission_id: str, status: str) -> Optional[str]:
+        """
+        Update a submission's status; returns its brand, or None if it does not
+        exist. Raises FileNotFoundError when there is no submission history yet.
+        """
+
+    @abstractmethod
+    def replace_approved(self, submission_id: str, rows: List[Dict]) -> None:
+        """Drop any approved rows of the submission and append these."""
+
+    @abstractmethod
+    def remove_approved(self, submission_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def load_approved(self, brand: Optional[str] = None) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def load_aggregate(self) -> ApprovedAggregate:
+        """The maintained corporate unified aggregate of the approved ledger."""
+
+    @abstractmethod
+    def rebuild_aggregate(self) -> ApprovedAggregate:
+        """Recompute the aggregate from the approved ledger and store it."""
+
+    def verify_aggregate(self) -> List[Dict]:
+        """
+        Differences between the stored aggregate and one recomputed from the
+        ledger (empty when consistent). Never rebuilds the stored aggregate.
+        """
+        return self.load_aggregate().differences(ApprovedAggregate.from_ledger(self.load_approved()))
+
+    @abstractmethod
+    def reset(self) -> List[str]:
+        """Delete all submission history and approvals; returns one message per step."""
+
+    def recover(self) -> Dict[str, int]:
+        """Startup consistency check."""
+        return {}
+
+
+class CsvSubmissionStore(SubmissionStore):
+    """The flat CSV files. Submissions are appended; status and approval changes rewrite the file."""
+    name = "csv"
+
+    def __init__(self, data_path: Path = FINANCIAL_DATA_PATH):
+        self.data_path = Path(data_path)
+        self.submissions_path = self.data_path / SUBMISSIONS_FILE
+        self.rows_path = self.data_path / SUBMISSION_ROWS_FILE
+        self.approved_path = self.data_path / APPROVED_FILE
+        self.aggregate_path = self.data_path / APPROVED_AGGREGATE_FILE
+        self.row_index = SubmissionRowIndex(self.rows_path)
+        self._lock = threading.RLock()
+        # (ledger signature, aggregate) last loaded or saved
+        self._aggregate: Optional[Tuple[Optional[Tuple[int, int]], ApprovedAggregate]] = None
+
+    def append_submission(self, submission: Dict, rows: List[Dict]) -> None:
+        # Detail rows first and the submission record last, so a crash in
+        # between leaves orphan rows rather than a submission without rows
+        append_csv_rows(self.rows_path, SUBMISSION_ROW_FIELDNAMES, rows)
+        # Indexes just the appended rows
+        self.row_index.sync()
+        append_csv_rows(self.submissions_path, SUBMISSION_FIELDNAMES, [submission])
+
+    def load_submissions(self, brand: Optional[str] = None) -> List[Dict]:
+        rows = _read_csv(self.submissions_path)
+        if brand:
+            rows = [row for row in rows if row.get("brand", "").upper() == brand.upper()]
+        return rows
+
+    def load_submission_rows(self, submission_id: str) -> List[Dict]:
+        return self.row_index.rows(submission_id)
+
+    def set_submission_status(self, submission_id: str, status: str) -> Optional[str]:
+        if not self.submissions_path.exists():
+            raise FileNotFoundError(self.submissions_path)
+        with self._lock:
+            submissions = _read_csv(self.submissions_path)
+            brand = None
+            for row in submissions:
+                if row.get("submission_id") == submission_id:
+                    brand = row.get("brand", "")
+                    row["status"] = status
+            if brand is None:
+                return None
+            _write_csv(self.submissions_path, SUBMISSION_FIELDNAMES, submissions)
+        return brand
+
+    def replace_approved(self, submission_id: str, rows: List[Dict]) -> None:
+        with self._lock:
+            aggregate = self.load_aggregate()
+            existing = _read_csv(self.approved_path)
+            kept = [row for row in existing if row.get("submission_id") != submission_id]
+            aggregate.apply((row for row in existing if row.get("submission_id") == submission_id), -1)
+            aggregate.apply(rows)
+            _write_csv(self.approved_path, APPROVED_FIELDNAMES, kept + rows)
+            self._save_aggregate(aggregate)
+
+    def remove_approved(self, submission_id: str) -> None:
+        if not self.approved_path.exists():
+            return
+        with self._lock:
+            aggregate = self.load_aggregate()
+            existing = _read_csv(self.approved_path)
+            removed = [row for row in existing if row.get("submission_id") == submission_id]
+            if not removed:
+                return
+            aggregate.apply(removed, -1)
+            _write_csv(self.approved_path, APPROVED_FIELDNAMES, [row for row in existing if row.get("submission_id") != submission_id])
+            self._save_aggregate(aggregate)
+
+    def load_approved(self, brand: Optional[str] = None) -> List[Dict]:
+        rows = _read_csv(self.approved_path)
+        if brand:
+            rows = [row for row in rows if row.get("brand", "").upper() == brand.upper()]
+        return rows
+
+    def _save_aggregate(self, aggregate: ApprovedAggregate) -> None:
+        """Store the aggregate with the signature of the ledger it matches. Call with the lock held."""
+        signature = _file_signature(self.approved_path)
+        payload = {"ledger_signature": signature, "groups": aggregate.to_rows()}
+        write_atomic(self.aggregate_path, json.dumps(payload).encode("utf-8"))
+        self._aggregate = (signature, aggregate)
+
+    def _read_sidecar(self) -> Optional[Tuple[Optional[Tuple[int, int]], ApprovedAggregate]]:
+        """(ledger signature, aggregate) as stored in the sidecar file, or None if it is missing or unreadable."""
+        try:
+            with open(self.aggregate_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            signature = payload.get("ledger_signature")
+            return (tuple(signature) if signature else None), ApprovedAggregate.from_rows(payload["groups"])
+        except (OSError, ValueError, KeyError, TypeError, InvalidOperation):
+            return None
+
+    def load_aggregate(self) -> ApprovedAggregate:
+        """
+        The aggregate kept in memory, else the sidecar file; either is only
+        used while the ledger's signature is the one it was saved with. A
+        ledger edited outside the store is re-aggregated once.
+        """
+        with self._lock:
+            signature = _file_signature(self.approved_path)
+            if self._aggregate and self._aggregate[0] == signature:
+                return self._aggregate[1]
+            stored = self._read_sidecar()
+            if stored and stored[0] == signature:
+                self._aggregate = stored
+                return stored[1]
+            return self.rebuild_aggregate()
+
+    def verify_aggregate(self) -> List[Dict]:
+        """
+        Compares the sidecar file as stored - never rebuilt - with the ledger. A
+        missing sidecar, or one saved for another version of the ledger, is
+        reported as a difference of its own.
+        """
+        with self._lock:
+            signature = _file_signature(self.approved_path)
+            expected = ApprovedAggregate.from_ledger(_read_csv(self.approved_path))
+            stored = self._read_sidecar()
+        if stored is None:
+            return [{"problem": f"{self.aggregate_path.name} is missing or unreadable"}]
+        differences = stored[1].differences(expected)
+        if stored[0] != signature:
+            differences.insert(0, {"problem": f"{self.aggregate_path.name} was saved for another version of {self.approved_path.name}"})
+        return differences
+
+    def rebuild_aggregate(self) -> ApprovedAggregate:
+        with self._lock:
+            aggregate = ApprovedAggregate.from_ledger(_read_csv(self.approved_path))
+            self._save_aggregate(aggregate)
+            print(f"[FINANCIAL] Rebuilt {self.aggregate_path.name}: {len(aggregate.groups)} group(s)")
+            return aggregate
+
+    def reset(self) -> List[str]:
+        steps = []
+        for path, fieldnames, label in (
+            (self.submissions_path, SUBMISSION_FIELDNAMES, "submission record(s)"),
+            (self.rows_path, SUBMISSION_ROW_FIELDNAMES, "submission row(s)"),
+            (self.approved_path, APPROVED_FIELDNAMES, "approved record(s)"),
+        ):
+            existed = path.exists()
+            count = len(_read_csv(path)) if existed else 0
+            # Empty file with header only
+            _write_csv(path, fieldnames, [])
+            steps.append(f"Deleted {count} {label} from {path.name}" if existed else f"Created empty {path.name}")
+        with self._lock:
+            self._save_aggregate(ApprovedAggregate())
+        return steps
+
+    def recover(self) -> Dict[str, int]:
+        removed = {}
+        for name in APPEND_ONLY_FILES:
+            path = self.data_path / name
+            if path.exists():
+                removed[name] = truncate_torn_tail(path)
+                if removed[name]:
+                    print(f"[FINANCIAL] Recovered {name}: truncated {removed[name]} bytes of a torn trailing line")
+        return removed
+
+
+class SqliteSubmissionStore(SubmissionStore):
+    """
+    SQLite file in WAL mode with one connection per thread. Amounts and
+    timestamps are stored as the same strings the CSVs hold.
+    """
+    name = "sqlite"
+
+    def __init__(self, data_path: Path = FINANCIAL_DATA_PATH, path: Optional[Path] = None):
+        self.data_path = Path(data_path)
+        self.path = Path(path) if path else self.data_path / SQLITE_FILE_NAME
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        if not self._ready:
+            with self._schema_lock:
+                if not self._ready:
+                    self._create_schema(conn)
+                    if not self._meta(conn, "migrated_from_csv"):
+                        self.migrate_from_csv(conn)
+                    elif not self._meta(conn, "aggregate_built"):
+                        # Databases migrated before the aggregate table existed
+                        with conn:
+                            self._write_aggregate(conn, self._ledger_aggregate(conn))
+                    self._ready = True
+        return conn
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS submissions ("
+                " id INTEGER PRIMARY KEY, submission_id TEXT, brand TEXT, status TEXT, timestamp TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS submission_rows ("
+                " id INTEGER PRIMARY KEY, submission_id TEXT, brand TEXT, source_account TEXT,"
+                " unified_account TEXT, unified_cost_center TEXT, amount TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS approved ("
+                " id INTEGER PRIMARY KEY, submission_id TEXT, brand TEXT, unified_account TEXT,"
+                " unified_cost_center TEXT, amount TEXT, approved_timestamp TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS approved_aggregate ("
+                " unified_account TEXT, unified_cost_center TEXT, brand TEXT, amount TEXT, rows INTEGER,"
+                " PRIMARY KEY (unified_account, unified_cost_center, brand))"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE INDEX IF NOT EXISTS submissions_submission_id ON submissions (submission_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS submissions_brand ON submissions (brand COLLATE NOCASE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS submission_rows_submission_id ON submission_rows (submission_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS submission_rows_brand ON submission_rows (brand COLLATE NOCASE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS approved_submission_id ON approved (submission_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS approved_brand ON approved (brand COLLATE NOCASE)")
+            conn.execute("CREATE INDEX IF NOT EXISTS approved_unified ON approved (unified_account, unified_cost_center)")
+
+    @staticmethod
+    def _meta(conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, table: str, fieldnames: List[str], rows: Iterable[Dict]) -> None:
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(fieldnames)}) VALUES ({', '.join('?' * len(fieldnames))})",
+            ([row.get(key) for key in fieldnames] for row in rows),
+        )
+
+    @staticmethod
+    def _select(conn: sqlite3.Connection, table: str, fieldnames: List[str], where: str = "", params=()) -> List[Dict]:
+        cursor = conn.execute(f"SELECT {', '.join(fieldnames)} FROM {table} {where} ORDER BY id", params)
+        return [dict(zip(fieldnames, row)) for row in cursor]
+
+    AGGREGATE_FIELDNAMES = ["unified_account", "unified_cost_center", "brand", "amount", "rows"]
+
+    def _ledger_aggregate(self, conn: sqlite3.Connection) -> ApprovedAggregate:
+        return ApprovedAggregate.from_ledger(self._select(conn, "approved", APPROVED_FIELDNAMES))
+
+    def _read_aggregate(self, conn: sqlite3.Connection) -> ApprovedAggregate:
+        cursor = conn.execute(f"SELECT {', '.join(self.AGGREGATE_FIELDNAMES)} FROM approved_aggregate")
+        return ApprovedAggregate.from_rows(dict(zip(self.AGGREGATE_FIELDNAMES, row)) for row in cursor)
+
+    def _write_aggregate(self, conn: sqlite3.Connection, aggregate: ApprovedAggregate) -> None:
+        """Replace the aggregate table. Call inside a transaction."""
+        conn.execute("DELETE FROM approved_aggregate")
+        conn.executemany(
+            "INSERT INTO approved_aggregate (unified_account, unified_cost_center, brand, amount, rows) VALUES (?, ?, ?, ?, ?)",
+            ([row[key] for key in self.AGGREGATE_FIELDNAMES] for row in aggregate.to_rows()),
+        )
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('aggregate_built', '1')")
+
+    def _update_aggregate(self, conn: sqlite3.Connection, removed: List[Dict], added: List[Dict]) -> None:
+        """Apply approved-row deltas to the touched aggregate entries. Call inside a transaction."""
+        delta: Dict[Tuple[str, str, str], List] = {}
+        for rows, sign in ((removed, -1), (added, 1)):
+            for key, (amount, count) in ApprovedAggregate.totals(rows).items():
+                entry = delta.setdefault(key, [Decimal(0), 0])
+                entry[0] += sign * amount
+                entry[1] += sign * count
+        for (account, cost_center, brand), (amount, count) in delta.items():
+            if not count and not amount:
+                continue
+            current = conn.execute(
+                "SELECT amount, rows FROM approved_aggregate WHERE unified_account = ? AND unified_cost_center = ? AND brand = ?",
+                (account, cost_center, brand),
+            ).fetchone()
+            total, rows_total = (Decimal(current[0]) + amount, current[1] + count) if current else (amount, count)
+            if rows_total <= 0:
+                conn.execute(
+                    "DELETE FROM approved_aggregate WHERE unified_account = ? AND unified_cost_center = ? AND brand = ?",
+                    (account, cost_center, brand),
+                )
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO approved_aggregate (unified_account, unified_cost_center, brand, amount, rows) VALUES (?, ?, ?, ?, ?)",
+                    (account, cost_center, brand, str(total), rows_total),
+                )
+
+    def migrate_from_csv(self, conn: Optional[sqlite3.Connection] = None, force: bool = False) -> Dict[str, int]:
+        """
+        Import the CSV files into the database once. With force, the tables are
+        emptied and re-imported (the CSVs are left untouched either way).
+        """
+        conn = conn or self._connect()
+        if self._meta(conn, "migrated_from_csv") and not force:
+            return {}
+        counts = {}
+        with conn:
+            for table, file_name, fieldnames in (
+                ("submissions", SUBMISSIONS_FILE, SUBMISSION_FIELDNAMES),
+                ("submission_rows", SUBMISSION_ROWS_FILE, SUBMISSION_ROW_FIELDNAMES),
+                ("approved", APPROVED_FILE, APPROVED_FIELDNAMES),
+            ):
+                rows = _read_csv(self.data_path / file_name)
+                conn.execute(f"DELETE FROM {table}")
+                self._insert(conn, table, fieldnames, rows)
+                counts[table] = len(rows)
+            self._write_aggregate(conn, self._ledger_aggregate(conn))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_csv', ?)", (str(self.data_path),))
+        print(f"[FINANCIAL] Migrated CSV submission data into {self.path.name}: "
+              + ", ".join(f"{count} {table}" for table, count in counts.items()))
+        return counts
+
+    def append_submission(self, submission: Dict, rows: List[Dict]) -> None:
+        conn = self._connect()
+        with conn:
+            self._insert(conn, "submission_rows", SUBMISSION_ROW_FIELDNAMES, rows)
+            self._insert(conn, "submissions", SUBMISSION_FIELDNAMES, [submission])
+
+    def load_submissions(self, brand: Optional[str] = None) -> List[Dict]:
+        if brand:
+            return self._select(self._connect(), "submissions", SUBMISSION_FIELDNAMES, "WHERE brand = ? COLLATE NOCASE", (brand,))
+        return self._select(self._connect(), "submissions", SUBMISSION_FIELDNAMES)
+
+    def load_submission_rows(self, submission_id: str) -> List[Dict]:
+        return self._select(self._connect(), "submission_rows", SUBMISSION_ROW_FIELDNAMES, "WHERE submission_id = ?", (submission_id,))
+
+    def load_submission_rows_batch(self, submission_ids: List[str]) -> Dict[str, List[Dict]]:
+        result = {submission_id: [] for submission_id in submission_ids}
+        ids = list(result)
+        conn = self._connect()
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            for row in self._select(conn, "submission_rows", SUBMISSION_ROW_FIELDNAMES,
+                                    f"WHERE submission_id IN ({', '.join('?' * len(chunk))})", chunk):
+                result[row["submission_id"]].append(row)
+        return result
+
+    def set_submission_status(self, submission_id: str, status: str) -> Optional[str]:
+        conn = self._connect()
+        with conn:
+            row = conn.execute("SELECT brand FROM submissions WHERE submission_id = ? ORDER BY id DESC LIMIT 1", (submission_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE submissions SET status = ? WHERE submission_id = ?", (status, submission_id))
+        return row[0] or ""
+
+    def replace_approved(self, submission_id: str, rows: List[Dict]) -> None:
+        conn = self._connect()
+        with conn:
+            removed = self._select(conn, "approved", APPROVED_FIELDNAMES, "WHERE submission_id = ?", (submission_id,))
+            conn.execute("DELETE FROM approved WHERE submission_id = ?", (submission_id,))
+            self._insert(conn, "approved", APPROVED_FIELDNAMES, rows)
+            self._update_aggregate(conn, removed, rows)
+
+    def remove_approved(self, submission_id: str) -> None:
+        conn = self._connect()
+        with conn:
+            removed = self._select(conn, "approved", APPROVED_FIELDNAMES, "WHERE submission_id = ?", (submission_id,))
+            conn.execute("DELETE FROM approved WHERE submission_id = ?", (submission_id,))
+            self._update_aggregate(conn, removed, [])
+
+    def load_approved(self, brand: Optional[str] = None) -> List[Dict]:
+        if brand:
+            return self._select(self._connect(), "approved", APPROVED_FIELDNAMES, "WHERE brand = ? COLLATE NOCASE", (brand,))
+        return self._select(self._connect(), "approved", APPROVED_FIELDNAMES)
+
+    def load_aggregate(self) -> ApprovedAggregate:
+        return self._read_aggregate(self._connect())
+
+    def rebuild_aggregate(self) -> ApprovedAggregate:
+        conn = self._connect()
+        with conn:
+            aggregate = self._ledger_aggregate(conn)
+            self._write_aggregate(conn, aggregate)
+        print(f"[FINANCIAL] Rebuilt the approved_aggregate table: {len(aggregate.groups)} group(s)")
+        return aggregate
+
+    def reset(self) -> List[str]:
+        conn = self._connect()
+        steps = []
+        with conn:
+            for table, label in (("submissions", "submission record(s)"), ("submission_rows", "submission row(s)"), ("approved", "approved record(s)")):
+                count = conn.execute(f"DELETE FROM {table}").rowcount
+                steps.append(f"Deleted {count} {label} from the {table} table")
+            conn.execute("DELETE FROM approved_aggregate")
+        return steps
+
+
+_stores: Dict[tuple, SubmissionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_submission_store(backend: Optional[str] = None, data_path: Path = FINANCIAL_DATA_PATH) -> SubmissionStore:
+    """Shared store for the configured backend (FINANCIAL_STORAGE_BACKEND, default csv)."""
+    backend = (backend or os.environ.get("FINANCIAL_STORAGE_BACKEND") or DEFAULT_STORAGE_BACKEND).lower()
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown financial storage backend '{backend}' (expected one of {', '.join(STORAGE_BACKENDS)})")
+    key = (backend, Path(data_path))
+    with _stores_lock:
+        if key not in _stores:
+            store_class = SqliteSubmissionStore if backend == "sqlite" else CsvSubmissionStore
+            _stores[key] = store_class(data_path)
+        return _stores[key]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Financial submission storage maintenance.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    migrate = commands.add_parser("migrate", help="import the submission CSVs into the SQLite backend")
+    migrate.add_argument("--force", action="store_true", help="re-import even if already migrated (replaces the tables)")
+    commands.add_parser("rebuild-row-index", help="rebuild the byte-offset index of the CSV submission rows")
+    verify = commands.add_parser("verify-aggregate", help="compare the approved aggregate with the approved ledger")
+    verify.add_argument("--rebuild", action="store_true", help="recompute the aggregate from the ledger if they differ")
+    verify.add_argument("--backend", choices=STORAGE_BACKENDS, help="storage backend (default: FINANCIAL_STORAGE_BACKEND or csv)")
+    args = parser.parse_args()
+
+    if args.command == "rebuild-row-index":
+        store = get_submission_store("csv")
+        count = store.row_index.rebuild()
+        print(f"[FINANCIAL] Indexed rows of {count} submission(s) into {store.row_index.path.name}")
+    elif args.command == "verify-aggregate":
+        store = get_submission_store(args.backend)
+        differences = store.verify_aggregate()
+        describe = lambda entry: f"{entry[0]} over {entry[1]} row(s)" if entry else "nothing"
+        for difference in differences:
+            if "problem" in difference:
+                print(f"[FINANCIAL] {difference['problem']}")
+                continue
+            print(f"[FINANCIAL] {difference['unified_account']} / {difference['unified_cost_center']} / {difference['brand']}: "
+                  f"stored {describe(difference['stored'])}, ledger {describe(difference['expected'])}")
+        if not differences:
+            print(f"[FINANCIAL] Approved aggregate ({store.name}) matches the ledger")
+        elif args.rebuild:
+            store.rebuild_aggregate()
+        else:
+            print(f"[FINANCIAL] {len(differences)} difference(s) between the aggregate and the ledger; use --rebuild to fix")
+            raise SystemExit(1)
+    elif args.command == "migrate":
+        store = get_submission_store("sqlite")
+        existed = store.path.exists()
+        # Opening a new database migrates it already
+        counts = store.migrate_from_csv(force=args.force)
+        if existed and not counts:
+            print(f"[FINANCIAL] {store.path.name} was already migrated; use --force to re-import")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,26 @@
 """
 Mapping Governance Service - Corporate-only (Maya) access to financial mappings.
 """
-import csv
 from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
+from services import mapping_repository
+
 BASE_PATH = Path(__file__).resolve().parent.parent
 FINANCIAL_DATA_PATH = BASE_PATH / "data" / "financial"
 VENDOR_RULES_PATH = BASE_PATH / "data" / "vendor_rules.json"
 
 
-# Financial Mappings (CSV-based)
+# Financial Mappings (CSV-based, parsed once in mapping_repository)
 def load_financial_account_mappings() -> List[Dict]:
     """Load unified account mappings."""
-    path = FINANCIAL_DATA_PATH / "unified_account_mapping.csv"
-    if not path.exists():
-        return []
-    
-    mappings = []
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            mappings.append(dict(row))
-    
-    return mappings
+    return mapping_repository.get_account_mappings()
 
 
 def save_financial_account_mappings(mappings: List[Dict], user: str):
     """Save unified account mappings and automatically trigger re-harmonization."""
-    path = FINANCIAL_DATA_PATH / "unified_account_mapping.csv"
-    
-    with open(path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ["source_account_name", "unified_account_name", "unified_account_number"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(mappings)
+    mapping_repository.save_account_mappings(mappings)
     
     print(f"[MAPPING] Account mappings updated by {user} at {datetime.now().isoformat()}")
     
@@ -50,51 +35,12 @@ def save_financial_account_mappings(mappings: List[Dict], user: str):
 
 def load_financial_cost_center_mappings() -> List[Dict]:
     """Load unified cost center mappings."""
-    path = FINANCIAL_DATA_PATH / "unified_cost_center_mapping.csv"
-    if not path.exists():
-        return []
-    
-    mappings = []
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        # Check if headers are correct
-        expected_headers = ["source_cost_center", "unified_cost_center", "unified_cost_center_name"]
-        if reader.fieldnames != expected_headers:
-            # File might be missing header - skip first row and use expected headers
-            f.seek(0)
-            first_line = f.readline().strip()
-            # If first line doesn't look like a header, it's data
-            if first_line and not first_line.startswith('source_cost_center'):
-                # Rewind and read with expected headers
-                f.seek(0)
-                # Skip first line (it's data, not header)
-                f.readline()
-                reader = csv.DictReader(f, fieldnames=expected_headers)
-        
-        for row in reader:
-            # Only add if it has the expected keys
-            if all(key in row for key in expected_headers):
-                mappings.append({
-                    "source_cost_center": row.get("source_cost_center", "").strip(),
-                    "unified_cost_center": row.get("unified_cost_center", "").strip(),
-                    "unified_cost_center_name": row.get("unified_cost_center_name", "").strip()
-                })
-    
-    return mappings
+    return mapping_repository.get_cost_center_mappings()
 
 
 def save_financial_cost_center_mappings(mappings: List[Dict], user: str):
     """Save unified cost center mappings and automatically trigger re-harmonization."""
-    path = FINANCIAL_DATA_PATH / "unified_cost_center_mapping.csv"
-    
-    # Ensure directory exists
-    path.parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(path, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ["source_cost_center", "unified_cost_center", "unified_cost_center_name"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()  # Always write header
-        writer.writerows(mappings)
+    mapping_repository.save_cost_center_mappings(mappings)
     
     print(f"[MAPPING] Cost center mappings updated by {user} at {datetime.now().isoformat()} - saved {len(mappings)} mappings")
     
@@ -121,6 +67,12 @@ def load_vendor_rules() -> Dict:
                 "remove_punctuation": True,
                 "collapse_spaces": True
             },
+            "approximate_matching": {
+                "enabled": False,
+                "bands": 32,
+                "rows": 4,
+                "shingle_size": 3
+            },
             "manual_overrides": {},
             "last_updated": datetime.now().isoformat(),
             "updated_by": "system"
@@ -140,6 +92,10 @@ def save_vendor_rules(rules: Dict, user: str):
     VENDOR_RULES_PATH.parent.mkdir(parents=True, exist_ok=True)
     with open(VENDOR_RULES_PATH, 'w') as f:
         json.dump(rules, f, indent=2)
+    
+    # Overrides and manual merges live in this file, so every save invalidates harmonized vendors
+    from services.vendor_service import invalidate_harmonization_cache
+    invalidate_harmonization_cache()
 
 
 def add_vendor_override(unified_name: str, tmh_name: str, raymond_name: str, user: str):
@@ -166,6 +122,19 @@ def get_vendor_overrides() -> Dict:
     return rules.get("manual_overrides", {})
 
 
+def index_vendor_overrides(overrides: Dict) -> Dict[str, List[str]]:
+    """
+    Source vendor name -> override unified names, in override order.
+    Built once per run so matching looks a row up instead of scanning every override.
+    """
+    index: Dict[str, List[str]] = {}
+    for override in overrides.values():
+        unified_name = override.get("unified_name")
+        for name in {override.get("tmh_name"), override.get("raymond_name")}:
+            index.setdefault(name, []).append(unified_name)
+    return index
+
+
 def add_vendor_manual_merge(vendor_ids: List[str], unified_name: str, unified_address: str, unified_phone: str, user: str) -> Dict:
     """
     Add a manual vendor merge - unifies multiple vendor records into one.
@@ -0,0 +1,131 @@
+"""
+Mapping Repository - parsed financial mapping CSVs shared by the financial,
+analytics and mapping governance services.
+
+Each mapping file is parsed once and kept in memory together with its
+lookup index (source key -> unified values). A cached parse is reused until
+the file's size or mtime changes, or until it is rewritten through the save
+functions here, so lookups on request paths cost one stat() and no reads.
+
+Returned lists are copies; the lookup indexes are shared and must be
+treated as read-only.
+"""
+import csv
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+FINANCIAL_DATA_PATH = BASE_PATH / "data" / "financial"
+ACCOUNT_MAPPING_PATH = FINANCIAL_DATA_PATH / "unified_account_mapping.csv"
+COST_CENTER_MAPPING_PATH = FINANCIAL_DATA_PATH / "unified_cost_center_mapping.csv"
+
+ACCOUNT_MAPPING_FIELDS = ["source_account_name", "unified_account_name", "unified_account_number"]
+COST_CENTER_MAPPING_FIELDS = ["source_cost_center", "unified_cost_center", "unified_cost_center_name"]
+
+# path -> (file signature, rows, index by source key)
+_cache: Dict[Path, Tuple[Tuple[int, int], List[Dict], Dict[str, Dict]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def _parse_accounts(path: Path) -> Tuple[List[Dict], Dict[str, Dict]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        rows = [dict(row) for row in csv.DictReader(f)]
+    index = {}
+    for row in rows:
+        index[(row.get("source_account_name") or "").strip()] = {
+            "unified_account_name": (row.get("unified_account_name") or "").strip(),
+            "unified_account_number": (row.get("unified_account_number") or "").strip()
+        }
+    return rows, index
+
+
+def _parse_cost_centers(path: Path) -> Tuple[List[Dict], Dict[str, Dict]]:
+    rows = []
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames != COST_CENTER_MAPPING_FIELDS:
+            # File might be missing its header: if the first line is data, skip it and use the expected headers
+            f.seek(0)
+            first_line = f.readline().strip()
+            if first_line and not first_line.startswith('source_cost_center'):
+                f.seek(0)
+                f.readline()
+                reader = csv.DictReader(f, fieldnames=COST_CENTER_MAPPING_FIELDS)
+
+        for row in reader:
+            # Only keep rows that have the expected keys
+            if all(key in row for key in COST_CENTER_MAPPING_FIELDS):
+                rows.append({key: (row.get(key) or "").strip() for key in COST_CENTER_MAPPING_FIELDS})
+    index = {}
+    for row in rows:
+        index[row["source_cost_center"]] = {
+            "unified_cost_center": row["unified_cost_center"],
+            "unified_cost_center_name": row["unified_cost_center_name"]
+        }
+    return rows, index
+
+
+def _load(path: Path, parse: Callable[[Path], Tuple[List[Dict], Dict[str, Dict]]]) -> Tuple[List[Dict], Dict[str, Dict]]:
+    signature = _signature(path)
+    if signature is None:
+        return [], {}
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == signature:
+            return cached[1], cached[2]
+        rows, index = parse(path)
+        _cache[path] = (signature, rows, index)
+        return rows, index
+
+
+def _save(path: Path, fieldnames: List[str], rows: List[Dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _cache_lock:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+        # A rewrite within the mtime resolution could keep the same signature
+        _cache.pop(path, None)
+
+
+def get_account_mappings() -> List[Dict]:
+    """Account mapping rows as stored in the CSV."""
+    rows, _ = _load(ACCOUNT_MAPPING_PATH, _parse_accounts)
+    return [dict(row) for row in rows]
+
+
+def get_account_mapping_index() -> Dict[str, Dict]:
+    """source_account_name -> {unified_account_name, unified_account_number} (read-only)."""
+    _, index = _load(ACCOUNT_MAPPING_PATH, _parse_accounts)
+    return index
+
+
+def save_account_mappings(mappings: List[Dict]) -> None:
+    _save(ACCOUNT_MAPPING_PATH, ACCOUNT_MAPPING_FIELDS, mappings)
+
+
+def get_cost_center_mappings() -> List[Dict]:
+    """Cost center mapping rows, values stripped."""
+    rows, _ = _load(COST_CENTER_MAPPING_PATH, _parse_cost_centers)
+    return [dict(row) for row in rows]
+
+
+def get_cost_center_mapping_index() -> Dict[str, Dict]:
+    """source_cost_center -> {unified_cost_center, unified_cost_center_name} (read-only)."""
+    _, index = _load(COST_CENTER_MAPPING_PATH, _parse_cost_centers)
+    return index
+
+
+def save_cost_center_mappings(mappings: List[Dict]) -> None:
+    _save(COST_CENTER_MAPPING_PATH, COST_CENTER_MAPPING_FIELDS, mappings)
@@ -0,0 +1,336 @@
+"""
+Vendor Matching - assigns incoming vendor rows to unified vendor records.
+
+Two scoring engines produce identical assignments:
+- serial: scores each row against its candidates one pair at a time (thefuzz)
+- batch:  scores a brand's rows against the unified set as NumPy score
+          matrices (rapidfuzz cdist/cpdist) and picks the best match per row
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+from thefuzz import fuzz
+
+from models.vendor_model import VendorRecord, BRAND_BITS
+from services.mapping_governance_service import index_vendor_overrides
+from utils.harmonization_helpers import NormalizationEngine, get_normalizer, canonicalize_address, canonicalize_addresses
+from utils.vendor_blocking import BlockingIndex, DEFAULT_STRATEGIES, DEFAULT_PREFIX_LENGTH
+from utils.vendor_lsh import MinHashLSHIndex, DEFAULT_BANDS, DEFAULT_ROWS, DEFAULT_SHINGLE_SIZE, DEFAULT_SEED
+from utils import vendor_scoring
+
+SCORING_ENGINES = ("batch", "serial")
+
+
+def build_candidate(row: Dict, normalizer: NormalizationEngine = None) -> Dict:
+    """Normalize a raw vendor row into the candidate shape used for matching."""
+    normalizer = normalizer or get_normalizer()
+    return {
+        "Vendor_Name": row.get("Vendor_Name", ""),
+        "Address": row.get("Address", ""),
+        "Phone": normalizer.normalize_phone(row.get("Phone", "")),
+        "normalized_name": normalizer.normalize_text(row.get("Vendor_Name", "")),
+    }
+
+
+class VendorMatcher:
+    """
+    Holds the unified vendor list while brand rows are matched into it.
+
+    Rows are assigned in order: a row merges into the best-scoring existing
+    record when the weighted score reaches the confidence threshold,
+    otherwise it becomes a new unified record that later rows can match.
+    """
+
+    def __init__(self, rules: Dict, overrides: Dict, score_cache=None):
+        self.confidence_threshold = rules.get("confidence_threshold", 85)
+        self.name_weight = rules.get("name_weight", 0.7)
+        self.address_weight = rules.get("address_weight", 0.3)
+        self.overrides = overrides
+        self.override_targets = index_vendor_overrides(overrides)
+        # Optional services.vendor_score_cache.ScoreCache consulted before scoring a pair
+        self.score_cache = score_cache
+        self._cache_counts = (score_cache.hits, score_cache.misses) if score_cache is not None else (0, 0)
+        self.normalizer = get_normalizer(rules.get("normalization_rules"))
+        self.engine = rules.get("scoring_engine", "batch")
+        if self.engine not in SCORING_ENGINES:
+            raise ValueError(f"Unknown scoring engine: {self.engine}")
+
+        # Blocking limits fuzzy scoring to records sharing a name prefix, phone or city/state;
+        # approximate mode replaces it with MinHash LSH buckets over name/address shingles
+        blocking = rules.get("blocking", {})
+        approximate = rules.get("approximate_matching", {})
+        self.index: Optional[Union[BlockingIndex, MinHashLSHIndex]] = None
+        if approximate.get("enabled", False):
+            self.index = MinHashLSHIndex(
+                bands=approximate.get("bands", DEFAULT_BANDS),
+                rows=approximate.get("rows", DEFAULT_ROWS),
+                shingle_size=approximate.get("shingle_size", DEFAULT_SHINGLE_SIZE),
+                seed=approximate.get("seed", DEFAULT_SEED),
+            )
+        elif blocking.get("enabled", True):
+            self.index = BlockingIndex(
+                strategies=blocking.get("strategies", DEFAULT_STRATEGIES),
+                prefix_length=blocking.get("prefix_length", DEFAULT_PREFIX_LENGTH),
+            )
+
+        self.unified: List[VendorRecord] = []
+        # First unified record per vendor name, for override lookups
+        self._by_name: Dict[str, VendorRecord] = {}
+        self.next_id = 1
+        self.pairs_compared = 0
+        self.pairs_skipped = 0
+        # Scorer-processed strings per unified record, aligned with self.unified
+        self._names: List[str] = []
+        self._addresses: List[str] = []
+
+    def seed(self, records: List[VendorRecord], next_id: int) -> None:
+        """Load previously harmonized records so new rows are matched against them."""
+        for record in records:
+            self._append(record)
+        self.next_id = max(self.next_id, next_id)
+
+    def add_brand(self, rows: List[Dict], source: str) -> List[VendorRecord]:
+        """Match a brand's rows in order. Returns the unified record each row was assigned to."""
+        candidates = [build_candidate(row, self.normalizer) for row in rows]
+        if self.engine == "serial":
+            return [self._assign(candidate, source, self.find_match(candidate)) for candidate in candidates]
+        return self._add_batch(candidates, source)
+
+    def stats(self) -> Dict:
+        if self.index is not None:
+            stats = self.index.stats()
+            stats["pairs_compared"] += self.pairs_compared
+            stats["pairs_skipped"] += self.pairs_skipped
+            total = stats["pairs_compared"] + stats["pairs_skipped"]
+            stats["reduction_percent"] = round(stats["pairs_skipped"] / total * 100, 1) if total else 0.0
+        else:
+            stats = {
+                "strategies": [],
+                "blocks": 0,
+                "records_indexed": len(self.unified),
+                "pairs_compared": self.pairs_compared,
+                "pairs_skipped": 0,
+                "reduction_percent": 0.0,
+            }
+        stats["scoring_engine"] = self.engine
+        if self.score_cache is not None:
+            # Lifetime counters from the cache, plus this matcher's share of them
+            cache_stats = self.score_cache.stats()
+            run_hits = cache_stats["hits"] - self._cache_counts[0]
+            run_lookups = run_hits + cache_stats["misses"] - self._cache_counts[1]
+            cache_stats["run_hits"] = run_hits
+            cache_stats["run_misses"] = run_lookups - run_hits
+            cache_stats["run_hit_rate"] = round(run_hits / run_lookups * 100, 1) if run_lookups else 0.0
+            stats["score_cache"] = cache_stats
+        return stats
+
+    def _override_match(self, candidate: Dict) -> Optional[VendorRecord]:
+        # First override naming this row whose unified vendor already exists
+        for unified_name in self.override_targets.get(candidate.get("Vendor_Name"), ()):
+            record = self._by_name.get(unified_name)
+            if record is not None:
+                return record
+        return None
+
+    def find_match(self, candidate: Dict) -> Dict:
+        """Serial engine: best existing record for one candidate."""
+        override = self._override_match(candidate)
+        if override is not None:
+            return {"record": override, "score": 100}
+
+        pruned = False
+        if self.index is not None:
+            pool = [(p, self.unified[p]) for p in self.index.candidates(candidate["normalized_name"], candidate["Address"], candidate["Phone"])]
+            if not pool and self.unified:
+                # Nothing plausible shares a block, so no merge; the row still reports its best score
+                # against every record, as an unblocked scan would
+                pruned = True
+                pool = list(enumerate(self.unified))
+                self.pairs_compared += len(self.unified)
+                self.pairs_skipped -= len(self.unified)
+        else:
+            pool = list(enumerate(self.unified))
+            self.pairs_compared += len(self.unified)
+
+        if self.score_cache is not None:
+            name_key, address_key = vendor_scoring.prepare([candidate["normalized_name"], canonicalize_address(candidate["Address"])])
+
+        best = None
+        best_score = 0
+        for position, record in pool:
+            if self.score_cache is not None:
+                score = self.score_cache.score(
+                    self._names[position], name_key,
+                    lambda: fuzz.token_set_ratio(record.normalized_name, candidate["normalized_name"]),
+                )
+                address_score = self.score_cache.score(
+                    self._addresses[position], address_key,
+                    lambda: fuzz.token_set_ratio(record.address_key, canonicalize_address(candidate["Address"])),
+                )
+            else:
+                score = fuzz.token_set_ratio(record.normalized_name, candidate["normalized_name"])
+                address_score = fuzz.token_set_ratio(record.address_key, canonicalize_address(candidate["Address"]))
+            combined = int((score * self.name_weight) + (address_score * self.address_weight))
+            if combined > best_score:
+                best_score = combined
+                best = record
+        if pruned:
+            return {"record": None, "score": best_score, "pruned": True}
+        return {"record": best, "score": best_score}
+
+    def _assign(self, candidate: Dict, source: str, match: Dict, name_key: str = None, address_key: str = None) -> VendorRecord:
+        if match["record"] and match["score"] >= self.confidence_threshold:
+            match["record"].add_source(source)
+            match["record"].match_confidence = match["score"]
+            return match["record"]
+
+        record = VendorRecord(
+            unified_vendor_id=f"V{self.next_id:04d}",
+            vendor_name=candidate["Vendor_Name"],
+            normalized_name=candidate["normalized_name"],
+            address=candidate["Address"],
+            phone=candidate["Phone"],
+            brands=BRAND_BITS[source],
+            match_confidence=match["score"] if match["record"] or match.get("pruned") else 100,
+        )
+        self._append(record, name_key, address_key)
+        self.next_id += 1
+        return record
+
+    def _append(self, record: VendorRecord, name_key: str = None, address_key: str = None) -> None:
+        if name_key is None:
+            name_key, address_key = vendor_scoring.prepare([record.normalized_name, record.address_key])
+        position = len(self.unified)
+        self.unified.append(record)
+        self._by_name.setdefault(record.vendor_name, record)
+        self._names.append(name_key)
+        self._addresses.append(address_key)
+        if self.index is not None:
+            self.index.add(position, record.normalized_name, record.address, record.phone)
+
+    def _add_batch(self, candidates: List[Dict], source: str) -> List[VendorRecord]:
+        """Batch engine: match a brand's rows in chunks sized to the score-matrix budget."""
+        names = vendor_scoring.prepare([c["normalized_name"] for c in candidates])
+        addresses = vendor_scoring.prepare(canonicalize_addresses([c["Address"] for c in candidates]))
+        if isinstance(self.index, MinHashLSHIndex):
+            self.index.prepare([c["normalized_name"] for c in candidates], [c["Address"] for c in candidates])
+        assigned = []
+        start = 0
+        while start < len(candidates):
+            stop = min(len(candidates), start + vendor_scoring.chunk_rows(len(self.unified)))
+            assigned.extend(self._match_chunk(candidates[start:stop], names[start:stop], addresses[start:stop], source))
+            start = stop
+        return assigned
+
+    def _match_chunk(self, chunk: List[Dict], names: List[str], addresses: List[str], source: str) -> List[VendorRecord]:
+        existing = len(self.unified)
+        size = len(chunk)
+
+        # Best existing record per row, and scores against earlier rows of the same chunk,
+        # since rows that become new records are matchable by the rows after them.
+        if self.index is None:
+            scores = vendor_scoring.score_matrix(names, addresses, self._names, self._addresses, self.name_weight, self.address_weight)
+            best_cols = scores.argmax(axis=1) if existing else np.full(size, -1)
+            best_scores = scores[np.arange(size), best_cols] if existing else np.zeros(size, dtype=np.int64)
+            self.pairs_compared += size * existing
+            intra = vendor_scoring.score_matrix(names, addresses, names, addresses, self.name_weight, self.address_weight)
+            self.pairs_compared += size * (size - 1) // 2
+            has_pool = [existing > 0] * size
+            intra_pairs = None
+        else:
+            rows, cols = [], []
+            keys_by_block = defaultdict(list)
+            intra_rows, intra_cols = [], []
+            for i, candidate in enumerate(chunk):
+                keys = self.index.keys_for(candidate["normalized_name"], candidate["Address"], candidate["Phone"])
+                positions = self.index.candidates(candidate["normalized_name"], candidate["Address"], candidate["Phone"])
+                rows.extend([i] * len(positions))
+                cols.extend(positions)
+                earlier = set()
+                for key in keys:
+                    earlier.update(keys_by_block[key])
+                    keys_by_block[key].append(i)
+                intra_rows.extend([i] * len(earlier))
+                intra_cols.extend(sorted(earlier))
+            rows, cols = np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64)
+            pair_values = vendor_scoring.pair_scores(
+                [names[r] for r in rows], [addresses[r] for r in rows],
+                [self._names[c] for c in cols], [self._addresses[c] for c in cols],
+                self.name_weight, self.address_weight, self.score_cache,
+            )
+            best_cols, best_scores = vendor_scoring.best_per_row(rows, cols, pair_values, size)
+            has_pool = np.bincount(rows, minlength=size) > 0 if len(rows) else np.zeros(size, dtype=bool)
+            intra_values = vendor_scoring.pair_scores(
+                [names[r] for r in intra_rows], [addresses[r] for r in intra_rows],
+                [names[c] for c in intra_cols], [addresses[c] for c in intra_cols],
+                self.name_weight, self.address_weight, self.score_cache,
+            )
+            self.pairs_compared += len(intra_rows)
+            intra_pairs = defaultdict(list)
+            for r, c, v in zip(intra_rows, intra_cols, intra_values.tolist()):
+                intra_pairs[r].append((c, v))
+            intra = None
+
+        assigned = []
+        created = {}  # chunk row -> position of the unified record it created
+        pruned = []  # chunk rows with no blocking candidate
+        for i, candidate in enumerate(chunk):
+            override = self._override_match(candidate)
+            if override is not None:
+                match = {"record": override, "score": 100}
+            else:
+                best, best_score = None, 0
+                if best_cols[i] >= 0 and best_scores[i] > 0:
+                    best, best_score = self.unified[best_cols[i]], int(best_scores[i])
+                pool_found = bool(has_pool[i])
+                if intra is not None:
+                    earlier = [j for j in created if j < i]
+                    if earlier:
+                        values = intra[i, earlier]
+                        k = int(values.argmax())
+                        if values[k] > best_score:
+                            best, best_score = self.unified[created[earlier[k]]], int(values[k])
+                else:
+                    for j, value in intra_pairs.get(i, ()):
+                        if j in created:
+                            pool_found = True
+                            if value > best_score:
+                                best, best_score = self.unified[created[j]], value
+                if self.index is not None and not pool_found and self.unified:
+                    match = {"record": None, "score": 0, "pruned": True}
+                    pruned.append(i)
+                else:
+                    match = {"record": best, "score": best_score}
+            before = len(self.unified)
+            assigned.append(self._assign(candidate, source, match, names[i], addresses[i]))
+            if len(self.unified) > before:
+                created[i] = before
+        if pruned:
+            # A later row of the chunk that joined one of these records already set its confidence
+            joined = {id(record) for j, record in enumerate(assigned) if j not in created}
+            pruned = [i for i in pruned if id(self.unified[created[i]]) not in joined]
+            self._score_pruned(pruned, [created[i] for i in pruned], names, addresses, existing)
+        return assigned
+
+    def _score_pruned(self, rows: List[int], positions: List[int], names: List[str], addresses: List[str], existing: int) -> None:
+        """
+        Confidence for chunk rows that had no blocking candidate: their best score
+        against every record created before them, as an unblocked scan reports it.
+        Merges are unaffected; the rows already became new records at positions.
+        """
+        if not rows:
+            return
+        last = max(positions)
+        scores = vendor_scoring.score_matrix(
+            [names[i] for i in rows], [addresses[i] for i in rows],
+            self._names[:last], self._addresses[:last],
+            self.name_weight, self.address_weight,
+        )
+        earlier = np.arange(last)[None, :] < np.array(positions)[:, None]
+        best_scores = np.where(earlier, scores, 0).max(axis=1, initial=0)
+        for position, score in zip(positions, best_scores.tolist()):
+            self.unified[position].match_confidence = score
+        self.pairs_compared += sum(positions)
+        # The index counted the records present at chunk start as skipped for these rows
+        self.pairs_skipped -= existing * len(rows)
@@ -0,0 +1,198 @@
+"""
+Vendor Parallel - sharded multi-process vendor matching.
+
+Raw rows are split into independent shards (by normalized city/state or by
+first name token), each shard is matched with its own VendorMatcher in a
+ProcessPoolExecutor worker, and a final pass in the parent reconciles
+duplicates that landed in different shards.
+
+Output depends only on the rows and rules, never on the worker count:
+shards are matched independently, reconciliation walks records in founding
+row order, and unified IDs are assigned in that same order.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from models.vendor_model import VendorRecord
+from services.vendor_matching import VendorMatcher
+from utils.disjoint_set import DisjointSet
+from utils.harmonization_helpers import normalize_text
+from utils.vendor_blocking import BlockingIndex, city_state_keys
+from utils import vendor_scoring
+
+SHARD_STRATEGIES = ("city_state", "first_token")
+DEFAULT_SHARD_BY = "city_state"
+DEFAULT_RECONCILE_STRATEGIES = ("phone", "token_prefix")
+# Work units per worker, so uneven shard sizes still balance across processes
+UNITS_PER_WORKER = 4
+
+
+def shard_key(row: Dict, shard_by: str, override_groups: Dict[str, str]) -> str:
+    """Shard for a raw row. Rows named in a manual override share a shard with the override target."""
+    name = row.get("Vendor_Name", "")
+    if name in override_groups:
+        return f"override:{override_groups[name]}"
+    if shard_by == "first_token":
+        tokens = normalize_text(name).split()
+        return f"tok:{tokens[0]}" if tokens else ""
+    keys = city_state_keys("", row.get("Address", ""), "", 0)
+    return next(iter(keys)) if keys else ""
+
+
+def _override_groups(overrides: Dict) -> Dict[str, str]:
+    groups = {}
+    for override in overrides.values():
+        unified_name = override.get("unified_name", "")
+        for name in (unified_name, override.get("tmh_name"), override.get("raymond_name")):
+            if name:
+                groups.setdefault(name, unified_name)
+    return groups
+
+
+def _match_unit(args: Tuple[Dict, Dict, List[List[Tuple[int, str, Dict]]]]) -> List[List[Tuple[VendorRecord, List[int]]]]:
+    """
+    Worker entry point: match every shard of a work unit independently.
+    Returns, per shard, each unified record with the global positions of its member rows.
+    """
+    rules, overrides, shards = args
+    results = []
+    for shard in shards:
+        matcher = VendorMatcher(rules, overrides)
+        members: Dict[int, List[int]] = {}
+        for source in ("TMH", "Raymond"):
+            part = [(position, row) for position, row_source, row in shard if row_source == source]
+            assigned = matcher.add_brand([row for _, row in part], source)
+            for (position, _), record in zip(part, assigned):
+                members.setdefault(id(record), []).append(position)
+        results.append([(record, members[id(record)]) for record in matcher.unified])
+    return results
+
+
+def _pack_units(shards: List[List], unit_count: int) -> List[List[List]]:
+    """Greedy size-balanced packing of shards into work units (largest shards first)."""
+    units: List[List[List]] = [[] for _ in range(max(1, unit_count))]
+    loads = [0] * len(units)
+    for shard in sorted(shards, key=lambda s: (-len(s), s[0][0])):
+        target = loads.index(min(loads))
+        units[target].append(shard)
+        loads[target] += len(shard)
+    return [unit for unit in units if unit]
+
+
+def match_sharded(raw: Dict[str, List[Dict]], rules: Dict, overrides: Dict) -> Tuple[List[VendorRecord], List[VendorRecord], int, Dict]:
+    """
+    Match all raw rows with sharded workers.
+
+    Returns (unified records, record assigned to each row in TMH-then-Raymond
+    order, next free ID number, stats).
+    """
+    parallel = rules.get("parallel", {})
+    workers = int(parallel.get("workers") or os.cpu_count() or 1)
+    shard_by = parallel.get("shard_by", DEFAULT_SHARD_BY)
+    if shard_by not in SHARD_STRATEGIES:
+        raise ValueError(f"Unknown shard strategy: {shard_by}")
+
+    rows: List[Tuple[str, Dict]] = [("TMH", row) for row in raw.get("tmh", [])] + [("Raymond", row) for row in raw.get("raymond", [])]
+    groups = _override_groups(overrides)
+    shards_by_key: Dict[str, List[Tuple[int, str, Dict]]] = {}
+    for position, (source, row) in enumerate(rows):
+        shards_by_key.setdefault(shard_key(row, shard_by, groups), []).append((position, source, row))
+    shards = list(shards_by_key.values())
+
+    units = _pack_units(shards, workers * UNITS_PER_WORKER)
+    tasks = [(rules, overrides, unit) for unit in units]
+    if workers <= 1 or len(units) <= 1:
+        unit_results = [_match_unit(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            unit_results = list(executor.map(_match_unit, tasks))
+
+    # Flatten shard results, remembering which shard produced each record
+    shard_records: List[Tuple[int, VendorRecord, List[int]]] = []
+    for unit_result in unit_results:
+        for shard_result in unit_result:
+            shard_id = shard_result[0][1][0] if shard_result else -1  # first row position identifies the shard
+            for record, members in shard_result:
+                shard_records.append((shard_id, record, members))
+    shard_records.sort(key=lambda item: item[2][0])  # founding row order
+
+    merged, edge_scores, pairs_scored = _reconcile(shard_records, rules)
+
+    groups_by_root = merged.groups()
+    unified: List[VendorRecord] = []
+    assigned: List[VendorRecord] = [None] * len(rows)
+    for number, root in enumerate(sorted(groups_by_root), start=1):
+        member_positions = groups_by_root[root]
+        first = shard_records[root][1]
+        brands = 0
+        for p in member_positions:
+            brands |= shard_records[p][1].brands
+        source_brands = first.source_brands
+        if len(member_positions) > 1:
+            # Brands of all member rows in row order, as a single matcher would have labelled them
+            row_positions = sorted(row_position for p in member_positions for row_position in shard_records[p][2])
+            source_brands = ", ".join(rows[row_position][0] for row_position in row_positions)
+        record = VendorRecord(
+            unified_vendor_id=f"V{number:04d}",
+            vendor_name=first.vendor_name,
+            normalized_name=first.normalized_name,
+            address=first.address,
+            address_key=first.address_key,
+            phone=first.phone,
+            brands=brands,
+            match_confidence=first.match_confidence,
+            source_brands=source_brands,
+        )
+        if len(member_positions) > 1:
+            record.match_confidence = max(edge_scores.get(p, 0) for p in member_positions[1:])
+        unified.append(record)
+        for p in member_positions:
+            for row_position in shard_records[p][2]:
+                assigned[row_position] = record
+
+    stats = {
+        "parallel_workers": workers,
+        "shard_by": shard_by,
+        "shards": len(shards),
+        "work_units": len(units),
+        "shard_records": len(shard_records),
+        "cross_shard_pairs_scored": pairs_scored,
+        "cross_shard_merges": len(shard_records) - len(unified),
+    }
+    return unified, assigned, len(unified) + 1, stats
+
+
+def _reconcile(shard_records: List[Tuple[int, VendorRecord, List[int]]], rules: Dict):
+    """
+    Union records from different shards that reach the confidence threshold.
+    Candidates come from a blocking index over the shard records.
+    """
+    parallel = rules.get("parallel", {})
+    threshold = rules.get("confidence_threshold", 85)
+    index = BlockingIndex(strategies=parallel.get("reconcile_strategies", DEFAULT_RECONCILE_STRATEGIES))
+    left, right = [], []
+    for position, (shard_id, record, _) in enumerate(shard_records):
+        for candidate in index.candidates(record.normalized_name, record.address, record.phone):
+            if shard_records[candidate][0] != shard_id:
+                left.append(position)
+                right.append(candidate)
+        index.add(position, record.normalized_name, record.address, record.phone)
+
+    names = vendor_scoring.prepare([record.normalized_name for _, record, _ in shard_records])
+    addresses = vendor_scoring.prepare([record.address_key for _, record, _ in shard_records])
+    scores = vendor_scoring.pair_scores(
+        [names[p] for p in left], [addresses[p] for p in left],
+        [names[p] for p in right], [addresses[p] for p in right],
+        rules.get("name_weight", 0.7), rules.get("address_weight", 0.3),
+    )
+
+    merged = DisjointSet(len(shard_records))
+    edge_scores: Dict[int, int] = {}
+    for position in np.flatnonzero(scores >= threshold).tolist():
+        a, b = left[position], right[position]
+        merged.union(a, b)
+        edge_scores[a] = max(edge_scores.get(a, 0), int(scores[position]))
+    return merged, edge_scores, len(left)
@@ -0,0 +1,313 @@
+"""
+Vendor Score Cache - persistent pairwise similarity scores for vendor matching.
+
+Scores are stored in a local SQLite file keyed on (scorer version, string A,
+string B), where A and B are the scorer-processed name or address strings.
+Each distinct string gets an integer id, and a pair is keyed on its two ids
+(smaller first, since token_set_ratio is symmetric), so a whole batch of
+pairs is looked up with NumPy searchsorted instead of per-pair dict probes.
+
+Only SQLite allocates persisted ids (AUTOINCREMENT, so an id is never reused
+for another string). Strings first seen in this process get provisional ids
+from the top of the 31-bit range; flush() resolves every string of the pairs
+it writes to its database id inside the write transaction and re-keys the
+in-memory pairs, so several processes or cache instances can share one file.
+
+The entries for the current scorer version are loaded into memory on first
+use; scores computed during a run are written back by flush(), which also
+evicts the least recently used entries beyond the size bound.
+"""
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import rapidfuzz
+
+from utils import vendor_scoring
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+SCORE_CACHE_PATH = BASE_PATH / "data" / "vendor_score_cache.sqlite"
+
+# Bump when the scoring function or string processing changes
+SCORER_VERSION = f"token_set_ratio:rounded:rapidfuzz-{rapidfuzz.__version__}:1"
+DEFAULT_MAX_ENTRIES = 2_000_000
+# Provisional ids count down from here (both ids of a pair must fit a signed int64 key);
+# database ids count up from 1
+_PROVISIONAL_ID_TOP = (1 << 31) - 1
+_ID_MASK = (1 << 32) - 1
+
+_caches: Dict[Tuple[Path, int], "ScoreCache"] = {}
+_caches_lock = threading.Lock()
+
+
+class ScoreCache:
+    """
+    In-memory view of the persisted scores plus the scores added or used this run.
+    Each process (or instance) keeps its own view; the SQLite file is shared.
+    """
+
+    def __init__(self, path: Path = SCORE_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._loaded = False
+        self._string_ids: Dict[str, int] = {}
+        self._texts: Dict[int, str] = {}
+        self._next_provisional_id = _PROVISIONAL_ID_TOP
+        # Sorted pair keys and their scores
+        self._keys = np.zeros(0, dtype=np.int64)
+        self._values = np.zeros(0, dtype=np.uint8)
+        self._new_keys: List[np.ndarray] = []
+        self._used_keys: List[np.ndarray] = []
+        # Scalar-path misses and hits, folded into the arrays above before batch lookups and flush
+        self._pending: Dict[int, int] = {}
+        self._used: List[int] = []
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'strings'").fetchone():
+            # Files from before ids were allocated by SQLite may hold pairs keyed on clashing ids
+            with conn:
+                conn.execute("DROP TABLE strings")
+                conn.execute("DROP TABLE IF EXISTS scores")
+        conn.execute("CREATE TABLE IF NOT EXISTS string_ids (id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT NOT NULL UNIQUE)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            " version TEXT NOT NULL, pair INTEGER NOT NULL, score INTEGER NOT NULL, used INTEGER NOT NULL,"
+            " PRIMARY KEY (version, pair))"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        return conn
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with self._connect() as conn:
+                self._string_ids = {text: string_id for string_id, text in conn.execute("SELECT id, text FROM string_ids")}
+                self._texts = {string_id: text for text, string_id in self._string_ids.items()}
+                rows = conn.execute("SELECT pair, score FROM scores WHERE version = ? ORDER BY pair", (SCORER_VERSION,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"[VENDOR] Score cache unavailable, scoring without it: {e}")
+            return
+        if rows:
+            data = np.array(rows, dtype=np.int64)
+            self._keys = data[:, 0].copy()
+            self._values = data[:, 1].astype(np.uint8)
+
+    def _ids(self, values: Sequence[str]) -> np.ndarray:
+        ids = self._string_ids
+        out = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values):
+            string_id = ids.get(value)
+            if string_id is None:
+                string_id = self._next_provisional_id
+                self._next_provisional_id -= 1
+                ids[value] = string_id
+                self._texts[string_id] = value
+            out[i] = string_id
+        return out
+
+    def _pair_keys(self, queries: Sequence[str], choices: Sequence[str]) -> np.ndarray:
+        # Distinct strings are far fewer than pairs, so id lookups are done once per string
+        distinct = list(dict.fromkeys(list(queries) + list(choices)))
+        distinct_ids = dict(zip(distinct, self._ids(distinct).tolist()))
+        a = np.fromiter((distinct_ids[q] for q in queries), dtype=np.int64, count=len(queries))
+        b = np.fromiter((distinct_ids[c] for c in choices), dtype=np.int64, count=len(choices))
+        return (np.minimum(a, b) << 32) | np.maximum(a, b)
+
+    def _lookup(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        positions = np.searchsorted(self._keys, keys)
+        positions[positions == len(self._keys)] = 0
+        found = (self._keys[positions] == keys) if len(self._keys) else np.zeros(len(keys), dtype=bool)
+        return positions, found
+
+    def _insert(self, keys: np.ndarray, values: np.ndarray) -> None:
+        order = np.argsort(keys)
+        keys, values = keys[order], values[order]
+        positions = np.searchsorted(self._keys, keys)
+        self._keys = np.insert(self._keys, positions, keys)
+        self._values = np.insert(self._values, positions, values)
+        self._new_keys.append(keys)
+
+    def scores(self, queries: Sequence[str], choices: Sequence[str]) -> np.ndarray:
+        """Rounded token_set_ratio for aligned processed pairs; only uncached distinct pairs are scored."""
+        if not len(queries):
+            return np.zeros(0)
+        self._load()
+        self._merge_pending()
+        keys = self._pair_keys(queries, choices)
+        positions, found = self._lookup(keys)
+        missing_keys, first = np.unique(keys[~found], return_index=True)
+        if len(missing_keys):
+            missing_rows = np.flatnonzero(~found)[first]
+            computed = vendor_scoring.token_set_scores(
+                [queries[i] for i in missing_rows.tolist()], [choices[i] for i in missing_rows.tolist()]
+            )
+            self._insert(missing_keys, computed.astype(np.uint8))
+            positions, found = self._lookup(keys)
+        self.misses += len(missing_keys)
+        self.hits += len(keys) - len(missing_keys)
+        self._used_keys.append(keys)
+        return self._values[positions].astype(np.float64)
+
+    def score(self, a: str, b: str, compute: Callable[[], int]) -> int:
+        """Cached score for one processed string pair; compute() is called on a miss."""
+        self._load()
+        a_id = self._string_ids.get(a) or self._ids([a])[0]
+        b_id = self._string_ids.get(b) or self._ids([b])[0]
+        key = (min(a_id, b_id) << 32) | max(a_id, b_id)
+        value = self._pending.get(key)
+        if value is None:
+            position = self._keys.searchsorted(key)
+            if position < len(self._keys) and self._keys[position] == key:
+                value = int(self._values[position])
+                self._used.append(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        # Single misses are buffered in a dict; np.insert per pair would be quadratic
+        value = int(compute())
+        self._pending[key] = value
+        return value
+
+    def _merge_pending(self) -> None:
+        if self._pending:
+            keys = np.fromiter(self._pending.keys(), dtype=np.int64, count=len(self._pending))
+            values = np.fromiter(self._pending.values(), dtype=np.uint8, count=len(self._pending))
+            self._pending = {}
+            self._insert(keys, values)
+        if self._used:
+            self._used_keys.append(np.array(self._used, dtype=np.int64))
+            self._used = []
+
+    def flush(self) -> None:
+        """
+        Persist scores computed this run and evict beyond max_entries.
+        Entries hit this run are marked as used only when eviction is needed,
+        which keeps warm runs from rewriting every cached row.
+        """
+        self._merge_pending()
+        if not self._new_keys:
+            self._used_keys = []
+            return
+        new_keys = np.unique(np.concatenate(self._new_keys))
+        positions, _ = self._lookup(new_keys)
+        new_values = self._values[positions]
+        try:
+            with self._connect() as conn:
+                # Database ids of every string in the written pairs, resolved in this transaction
+                local_ids = np.unique(np.concatenate((new_keys >> 32, new_keys & _ID_MASK)))
+                texts = [self._texts[string_id] for string_id in local_ids.tolist()]
+                conn.executemany("INSERT OR IGNORE INTO string_ids (text) VALUES (?)", zip(texts))
+                database_ids = np.array(
+                    [conn.execute("SELECT id FROM string_ids WHERE text = ?", (text,)).fetchone()[0] for text in texts],
+                    dtype=np.int64,
+                )
+                stored_keys = self._remap_keys(new_keys, local_ids, database_ids)
+
+                row = conn.execute("SELECT value FROM meta WHERE key = 'run'").fetchone()
+                run = (row[0] if row else 0) + 1
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('run', ?)", (run,))
+                purged = conn.execute("DELETE FROM scores WHERE version != ?", (SCORER_VERSION,)).rowcount
+                conn.executemany(
+                    "INSERT OR REPLACE INTO scores (version, pair, score, used) VALUES (?, ?, ?, ?)",
+                    zip([SCORER_VERSION] * len(stored_keys), stored_keys.tolist(), new_values.tolist(), [run] * len(stored_keys)),
+                )
+                excess = len(self._keys) - self.max_entries
+                evicted = []
+                if excess > 0:
+                    used_keys = [self._remap_keys(used, local_ids, database_ids) for used in self._used_keys]
+                    evicted = self._evict(conn, run, excess, used_keys)
+                if purged or evicted:
+                    # Strings no longer in any pair; AUTOINCREMENT keeps their ids from being reused
+                    conn.execute(
+                        "DELETE FROM string_ids WHERE id NOT IN ("
+                        " SELECT pair >> 32 FROM scores UNION SELECT pair & ? FROM scores)",
+                        (_ID_MASK,),
+                    )
+        except sqlite3.Error as e:
+            print(f"[VENDOR] Failed to persist score cache: {e}")
+            return
+        # Only after the commit: a rolled-back id may later be given to another string
+        self._adopt_ids(local_ids, database_ids, texts)
+        if evicted:
+            keep = ~np.isin(self._keys, np.array(evicted, dtype=np.int64))
+            self._keys, self._values = self._keys[keep], self._values[keep]
+            self.evicted += len(evicted)
+        self._new_keys = []
+        self._used_keys = []
+
+    @staticmethod
+    def _remap_keys(keys: np.ndarray, old_ids: np.ndarray, new_ids: np.ndarray) -> np.ndarray:
+        """Pair keys with ids in old_ids (sorted) replaced by the matching new_ids."""
+        def remap(ids: np.ndarray) -> np.ndarray:
+            positions = np.searchsorted(old_ids, ids)
+            positions[positions == len(old_ids)] = 0
+            hit = old_ids[positions] == ids if len(old_ids) else np.zeros(len(ids), dtype=bool)
+            return np.where(hit, new_ids[positions] if len(new_ids) else ids, ids)
+        a, b = remap(keys >> 32), remap(keys & _ID_MASK)
+        return (np.minimum(a, b) << 32) | np.maximum(a, b)
+
+    def _adopt_ids(self, local_ids: np.ndarray, database_ids: np.ndarray, texts: List[str]) -> None:
+        """Switch in-memory strings and pairs from the ids used so far to their database ids."""
+        changed = local_ids != database_ids
+        if not changed.any():
+            return
+        old_ids, new_ids = local_ids[changed], database_ids[changed]
+        for old_id, new_id, text in zip(old_ids.tolist(), new_ids.tolist(), np.array(texts, dtype=object)[changed].tolist()):
+            self._texts.pop(old_id, None)
+            self._texts[new_id] = text
+            self._string_ids[text] = new_id
+        keys = self._remap_keys(self._keys, old_ids, new_ids)
+        order = np.argsort(keys)
+        self._keys, self._values = keys[order], self._values[order]
+
+    def _evict(self, conn: sqlite3.Connection, run: int, excess: int, used_keys: List[np.ndarray]) -> List[int]:
+        """Delete the least recently used scores from the file; returns the evicted pair keys."""
+        if used_keys:
+            used = np.unique(np.concatenate(used_keys))
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS used_pairs (pair INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM used_pairs")
+            conn.executemany("INSERT INTO used_pairs (pair) VALUES (?)", zip(used.tolist()))
+            conn.execute(
+                "UPDATE scores SET used = ? WHERE version = ? AND pair IN (SELECT pair FROM used_pairs)",
+                (run, SCORER_VERSION),
+            )
+        evicted = [pair for (pair,) in conn.execute(
+            "SELECT pair FROM scores WHERE version = ? ORDER BY used LIMIT ?", (SCORER_VERSION, excess)
+        )]
+        conn.executemany("DELETE FROM scores WHERE version = ? AND pair = ?", ((SCORER_VERSION, pair) for pair in evicted))
+        return evicted
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "scorer_version": SCORER_VERSION,
+            "entries": int(len(self._keys)),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+            "evicted": self.evicted,
+        }
+
+
+def get_score_cache(rules: Dict) -> Optional[ScoreCache]:
+    """Shared score cache configured by rules["score_cache"], or None when disabled."""
+    config = rules.get("score_cache", {})
+    if not config.get("enabled", True):
+        return None
+    max_entries = int(config.get("max_entries", DEFAULT_MAX_ENTRIES))
+    key = (SCORE_CACHE_PATH, max_entries)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ScoreCache(SCORE_CACHE_PATH, max_entries)
+        return _caches[key]
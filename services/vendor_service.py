@@ -1,261 +1,344 @@
+import csv
+import hashlib
+import threading
 from io import StringIO
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+import numpy as np
 import pandas as pd
-from thefuzz import fuzz
 
-from models.vendor_model import VendorRecord
-from utils.harmonization_helpers import normalize_text, normalize_phone, normalize_address
-from services.mapping_governance_service import load_vendor_rules, get_vendor_overrides, get_vendor_manual_merges
+from models.vendor_model import VendorRecord, MERGED_BRAND_LABELS
+from utils.harmonization_helpers import normalize_text, normalize_phone
+from utils.disjoint_set import DisjointSet
+from utils.vendor_search import VendorSearchIndex, DEFAULT_PAGE_SIZE
+from services.vendor_state_service import match_incremental
+from services.vendor_simulation import VendorScoreTable, simulate, approximate_recall, DEFAULT_RECALL_SAMPLE
+from services.vendor_score_cache import get_score_cache
+from services.mapping_governance_service import load_vendor_rules, get_vendor_overrides, get_vendor_manual_merges, VENDOR_RULES_PATH
 
 BASE_PATH = Path(__file__).resolve().parent.parent
 DATA_PATH = BASE_PATH / "data"
 
+HARMONIZED_CSV_COLUMNS = [
+    "unified_vendor_id", "unified_name", "tmh_source_name", "raymond_source_name",
+    "unified_address", "unified_phone", "confidence", "source_brands",
+]
+RAW_CSV_COLUMNS = ["Vendor_Name", "Address", "Phone", "Source_Brand"]
+# Rows per chunk yielded by the CSV exports
+CSV_STREAM_BATCH = 500
+# Raw vendor files per brand (preferred name first) and rows read per chunk
+RAW_VENDOR_FILES = {
+    "tmh": ("tmh_vendors.csv", "TMH_Vendors.csv"),
+    "raymond": ("raymond_vendors.csv", "Raymond_Vendors.csv"),
+}
+RAW_CSV_CHUNK_ROWS = 50_000
 
-def load_raw_vendor_data() -> Dict[str, List[Dict]]:
+# Counters from the most recent harmonize_vendors() run
+_last_run_stats: Dict = {}
+
+# Memoized harmonize_vendors() result, keyed on the fingerprint of its input files
+_result_cache: Dict = {"key": None, "result": None}
+_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+_cache_lock = threading.Lock()
+# path -> ((size, mtime_ns), sha1) so unchanged files are not re-hashed
+_file_digests: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+
+# Raw rows, rules and overrides of the last harmonization run, and the
+# candidate-pair score table built from them for threshold simulations
+_last_run_inputs: Dict = {}
+_score_table: Dict = {"result_id": None, "table": None}
+
+# Search indexes for the paginated vendor APIs, rebuilt when their source data changes
+_search_indexes: Dict[str, Tuple[object, VendorSearchIndex]] = {}
+_search_lock = threading.Lock()
+
+
+def get_harmonization_stats() -> Dict:
+    """Get matching counters (pairs compared vs. skipped by blocking) from the last harmonization run, plus cache counters."""
+    stats = dict(_last_run_stats)
+    stats["cache"] = dict(_cache_stats)
+    return stats
+
+
+def _file_fingerprint(path: Path) -> Optional[Tuple[int, int, str]]:
+    """(size, mtime_ns, sha1) of a file; the hash is only recomputed when size or mtime change."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _file_digests.get(path)
+    if cached is None or cached[0] != signature:
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        cached = (signature, digest.hexdigest())
+        _file_digests[path] = cached
+    return signature + (cached[1],)
+
+
+def _raw_inputs_key() -> Tuple:
+    return tuple(_file_fingerprint(DATA_PATH / file_name) for file_names in RAW_VENDOR_FILES.values() for file_name in file_names)
+
+
+def _harmonization_inputs_key() -> Tuple:
+    return _raw_inputs_key() + (_file_fingerprint(VENDOR_RULES_PATH),)
+
+
+def invalidate_harmonization_cache() -> None:
+    """Drop the memoized harmonization result (called when vendor rules, overrides or merges are saved)."""
+    with _cache_lock:
+        _result_cache["key"] = None
+        _result_cache["result"] = None
+        _cache_stats["invalidations"] += 1
+
+
+def _raw_vendor_file(brand_key: str, data_path: Path) -> Optional[Path]:
+    for file_name in RAW_VENDOR_FILES[brand_key]:
+        if (data_path / file_name).exists():
+            return data_path / file_name
+    return None
+
+
+def _full_address(chunk: pd.DataFrame) -> pd.Series:
+    """Non-blank address, city, state and country values joined with ", ", built column by column."""
+    full = pd.Series("", index=chunk.index, dtype=object)
+    for column in ("address", "city", "state", "country"):
+        if column not in chunk:
+            continue
+        part = chunk[column]
+        keep = part.str.strip() != ""
+        separator = np.where((full != "") & keep, ", ", "")
+        full = full + separator + part.where(keep, "")
+    return full
+
+
+def iter_raw_vendor_rows(brand_key: str, data_path: Path = None, chunk_rows: int = RAW_CSV_CHUNK_ROWS) -> Iterator[List[Dict]]:
     """
-    Load raw vendor data from CSV files.
-    Supports both new format (vendor_id, address, city, state, country) and old format (Vendor_Name, Address, Phone).
+    Yield one brand's raw vendor rows in chunks of up to chunk_rows, as
+    {"Vendor_Name", "Address", "Phone"} dicts in file order.
+
+    Columns are read as strings (empty cells stay empty rather than NaN, and
+    phones keep their digits as written), so a chunk never holds more than
+    chunk_rows rows of the file. Supports both the new format (vendor_id,
+    vendor_name, address, city, state, country, phone) and the old format
+    (Vendor_Name, Address, Phone).
     """
-    def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-        df.columns = [col.strip().replace(" ", "_") for col in df.columns]
-        return df
-    
-    def normalize_vendor_format(records: List[Dict]) -> List[Dict]:
-        """Normalize vendor data to standard internal structure."""
-        normalized = []
-        for row in records:
-            # Handle new format (vendor_id, vendor_name, address, city, state, country, phone)
-            if "vendor_name" in row and "vendor_id" in row:
-                # Build full address from components
-                address_parts = [
-                    str(row.get("address", "")),
-                    str(row.get("city", "")),
-                    str(row.get("state", "")),
-                    str(row.get("country", ""))
-                ]
-                full_address = ", ".join([p for p in address_parts if p.strip()])
-                
-                normalized.append({
-                    "Vendor_Name": str(row.get("vendor_name", "")),
-                    "Address": full_address,
-                    "Phone": str(row.get("phone", "")),  # Include phone from CSV
-                })
-            # Handle old format (Vendor_Name, Address, Phone)
-            else:
-                normalized.append({
-                    "Vendor_Name": str(row.get("Vendor_Name", "")),
-                    "Address": str(row.get("Address", "")),
-                    "Phone": str(row.get("Phone", "")),
-                })
-        return normalized
-    
-    # Try new format first, fall back to old format
-    tmh = None
-    raymond = None
-    
-    if (DATA_PATH / "tmh_vendors.csv").exists():
-        tmh = normalize_columns(pd.read_csv(DATA_PATH / "tmh_vendors.csv"))
-    elif (DATA_PATH / "TMH_Vendors.csv").exists():
-        tmh = normalize_columns(pd.read_csv(DATA_PATH / "TMH_Vendors.csv"))
-    
-    if (DATA_PATH / "raymond_vendors.csv").exists():
-        raymond = normalize_columns(pd.read_csv(DATA_PATH / "raymond_vendors.csv"))
-    elif (DATA_PATH / "Raymond_Vendors.csv").exists():
-        raymond = normalize_columns(pd.read_csv(DATA_PATH / "Raymond_Vendors.csv"))
-    
-    if tmh is None or raymond is None:
+    path = _raw_vendor_file(brand_key, data_path or DATA_PATH)
+    if path is None:
+        return
+    for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_rows):
+        chunk.columns = [col.strip().replace(" ", "_") for col in chunk.columns]
+        if "vendor_name" in chunk and "vendor_id" in chunk:
+            names, addresses = chunk["vendor_name"], _full_address(chunk)
+            phones = chunk["phone"] if "phone" in chunk else None
+        else:
+            names = chunk["Vendor_Name"] if "Vendor_Name" in chunk else None
+            addresses = chunk["Address"] if "Address" in chunk else None
+            phones = chunk["Phone"] if "Phone" in chunk else None
+        blank = [""] * len(chunk)
+        yield [
+            {"Vendor_Name": name, "Address": address, "Phone": phone}
+            for name, address, phone in zip(
+                blank if names is None else names.tolist(),
+                blank if addresses is None else addresses.tolist(),
+                blank if phones is None else phones.tolist(),
+            )
+        ]
+
+
+def load_raw_vendor_data(data_path: Path = None) -> Dict[str, List[Dict]]:
+    """
+    Load raw vendor data from CSV files (in data/ unless another directory is given).
+    Both brand files must be present; otherwise both lists are empty.
+    """
+    data_path = data_path or DATA_PATH
+    if _raw_vendor_file("tmh", data_path) is None or _raw_vendor_file("raymond", data_path) is None:
         return {
             "tmh": [],
             "raymond": [],
         }
-    
-    # Normalize to standard format
-    tmh_records = normalize_vendor_format(tmh.to_dict(orient="records"))
-    raymond_records = normalize_vendor_format(raymond.to_dict(orient="records"))
-    
-    return {
-        "tmh": tmh_records,
-        "raymond": raymond_records,
-    }
 
+    raw: Dict[str, List[Dict]] = {}
+    for brand_key in RAW_VENDOR_FILES:
+        rows: List[Dict] = []
+        for chunk in iter_raw_vendor_rows(brand_key, data_path):
+            rows.extend(chunk)
+        raw[brand_key] = rows
+    return raw
 
-def harmonize_vendors() -> List[Dict]:
-    raw = load_raw_vendor_data()
-    
-    # Load vendor rules from governance service
-    rules = load_vendor_rules()
-    confidence_threshold = rules.get("confidence_threshold", 85)
-    name_weight = rules.get("name_weight", 0.7)
-    address_weight = rules.get("address_weight", 0.3)
-    overrides = get_vendor_overrides()
+
+def auto_merge_groups(unified: List[VendorRecord]) -> DisjointSet:
+    """
+    Disjoint set over record positions joining each record to the earliest
+    anchor it shares a normalized name, or both a canonical address and a
+    phone, with. A record that joins no anchor becomes one.
+
+    Merges are not transitive: a record that joined an anchor never pulls in
+    later records itself. Each record is hashed once under its name key and
+    its address+phone key, so the pass is linear in the number of records.
+    """
+    groups = DisjointSet(len(unified))
+    anchor_by_key: Dict[tuple, int] = {}
     
-    unified: List[VendorRecord] = []
-    next_id = 1
-
-    def find_match(candidate: Dict) -> Dict:
-        # Check manual overrides first
-        for override_key, override in overrides.items():
-            if override.get("tmh_name") == candidate.get("Vendor_Name") or override.get("raymond_name") == candidate.get("Vendor_Name"):
-                # Check if we already have this unified vendor
-                for record in unified:
-                    if record.vendor_name == override.get("unified_name"):
-                        return {"record": record, "score": 100}
-        
-        best = None
-        best_score = 0
-        for record in unified:
-            score = fuzz.token_set_ratio(record.normalized_name, candidate["normalized_name"])
-            address_score = fuzz.token_set_ratio(
-                normalize_address(record.address), normalize_address(candidate["Address"])
-            )
-            combined = int((score * name_weight) + (address_score * address_weight))
-            if combined > best_score:
-                best_score = combined
-                best = record
-        return {"record": best, "score": best_score}
-
-    def add_record(row: Dict, source: str):
-        nonlocal next_id
-        normalized_name = normalize_text(row.get("Vendor_Name", ""))
-        candidate = {
-            "Vendor_Name": row.get("Vendor_Name", ""),
-            "Address": row.get("Address", ""),
-            "Phone": normalize_phone(row.get("Phone", "")),
-            "normalized_name": normalized_name,
-        }
-        match = find_match(candidate)
-        if match["record"] and match["score"] >= confidence_threshold:
-            match["record"].source_brands = f"{match['record'].source_brands}, {source}"
-            match["record"].match_confidence = match["score"]
+    for position, record in enumerate(unified):
+        keys = []
+        if record.normalized_name:
+            keys.append(("name", record.normalized_name))
+        address_key = record.address_key
+        phone_key = normalize_phone(record.phone)
+        if address_key and phone_key:
+            keys.append(("address_phone", address_key, phone_key))
+        anchors = [anchor_by_key[key] for key in keys if key in anchor_by_key]
+        if anchors:
+            groups.union(min(anchors), position)
         else:
-            unified.append(
-                VendorRecord(
-                    unified_vendor_id=f"V{next_id:04d}",
-                    vendor_name=candidate["Vendor_Name"],
-                    normalized_name=candidate["normalized_name"],
-                    address=candidate["Address"],
-                    phone=candidate["Phone"],
-                    source_brands=source,
-                    match_confidence=match["score"] if match["record"] else 100,
-                )
-            )
-            next_id += 1
-
-    for tmh_row in raw["tmh"]:
-        add_record(tmh_row, "TMH")
+            for key in keys:
+                anchor_by_key[key] = position
+    return groups
 
-    for raymond_row in raw["raymond"]:
-        add_record(raymond_row, "Raymond")
 
-    # Apply manual merges
-    manual_merges = get_vendor_manual_merges()
-    merged_vendor_ids = set()
+def auto_merge_vendors(unified: List[VendorRecord]) -> List[VendorRecord]:
+    """
+    Merge each record into the earliest anchor record it shares a normalized name, or both a
+    canonical address and a phone, with (see auto_merge_groups).
+    Each merged group keeps the data of its first record and is appended after the untouched records.
+    """
+    groups = auto_merge_groups(unified)
+    kept = []
+    merged = []
+    for root, members in sorted(groups.groups().items()):
+        if len(members) == 1:
+            kept.append(unified[root])
+            continue
+        
+        brands = 0
+        for position in members:
+            brands |= unified[position].brands
+        
+        # Use the first vendor's name and data as the merged record
+        first = unified[root]
+        merged.append(VendorRecord(
+            unified_vendor_id=first.unified_vendor_id,
+            vendor_name=first.vendor_name,
+            normalized_name=first.normalized_name,
+            address=first.address,
+            address_key=first.address_key,
+            phone=first.phone,
+            brands=brands,
+            match_confidence=100,
+            source_brands=MERGED_BRAND_LABELS[brands]
+        ))
     
+    return kept + merged
+
+
+def apply_manual_merges(unified: List[VendorRecord], manual_merges: Dict) -> Tuple[List[VendorRecord], Set[str]]:
+    """
+    Apply governance manual merges in order, in one pass over the merges.
+
+    Records are indexed by vendor ID up front, so each merge touches only its
+    own IDs. A merge combines the records present (at least two) into one
+    record under its first ID, appended after the remaining records; later
+    merges can pick that record up again. Also returns the non-surviving IDs.
+    """
+    by_id = {record.unified_vendor_id: record for record in unified}
+    order = {vendor_id: position for position, vendor_id in enumerate(by_id)}
+    next_position = len(order)
+    merged_vendor_ids: Set[str] = set()
+
     for merge_key, merge_info in manual_merges.items():
         vendor_ids_to_merge = merge_info.get("vendor_ids", [])
         if len(vendor_ids_to_merge) < 2:
             continue
-        
-        # Find records to merge
-        records_to_merge = [r for r in unified if r.unified_vendor_id in vendor_ids_to_merge]
-        if len(records_to_merge) < 2:
+
+        # Records to merge, in their current list order
+        present = sorted({vendor_id for vendor_id in vendor_ids_to_merge if vendor_id in by_id}, key=order.__getitem__)
+        if len(present) < 2:
             continue
-        
-        # Create merged record
-        all_source_brands = set()
+        records_to_merge = [by_id.pop(vendor_id) for vendor_id in present]
+
+        brands = 0
         for r in records_to_merge:
-            all_source_brands.update(r.source_brands.split(", "))
-        
+            brands |= r.brands
+
         merged_record = VendorRecord(
             unified_vendor_id=vendor_ids_to_merge[0],  # Use first ID as the merged ID
             vendor_name=merge_info.get("unified_name", records_to_merge[0].vendor_name),
             normalized_name=normalize_text(merge_info.get("unified_name", records_to_merge[0].vendor_name)),
             address=merge_info.get("unified_address", records_to_merge[0].address),
             phone=merge_info.get("unified_phone", records_to_merge[0].phone),
-            source_brands=", ".join(sorted(all_source_brands)),
-            match_confidence=100
+            brands=brands,
+            match_confidence=100,
+            source_brands=MERGED_BRAND_LABELS[brands]
         )
-        
-        # Remove merged records and add the merged one
-        unified = [r for r in unified if r.unified_vendor_id not in vendor_ids_to_merge]
-        unified.append(merged_record)
+
+        # Re-inserting moves the merged record after the remaining ones
+        by_id.pop(merged_record.unified_vendor_id, None)
+        by_id[merged_record.unified_vendor_id] = merged_record
+        order[merged_record.unified_vendor_id] = next_position
+        next_position += 1
         merged_vendor_ids.update(vendor_ids_to_merge[1:])  # Track which IDs were merged
 
+    return list(by_id.values()), merged_vendor_ids
+
+
+def harmonize_vendors(rebuild: bool = False) -> List[Dict]:
+    """
+    Harmonize TMH and Raymond vendors into unified vendors.
+    The result is memoized until the vendor files or vendor_rules.json change.
+    Only raw rows that are new or changed since the persisted state are re-matched;
+    pass rebuild=True to re-match every row from scratch.
+    Callers must treat the returned rows as read-only.
+    """
+    return list(_harmonized_result(rebuild))
+
+
+def _harmonized_result(rebuild: bool = False) -> List[Dict]:
+    """The memoized harmonization result itself (not a copy)."""
+    with _cache_lock:
+        key = _harmonization_inputs_key()
+        if not rebuild and _result_cache["key"] == key:
+            _cache_stats["hits"] += 1
+            return _result_cache["result"]
+        
+        _cache_stats["misses"] += 1
+        result = _harmonize_vendors_uncached(rebuild)
+        # Keyed on the pre-run fingerprint, so a file edited mid-run is picked up next call
+        _result_cache["key"] = key
+        _result_cache["result"] = result
+        return result
+
+
+def _harmonize_vendors_uncached(rebuild: bool) -> List[Dict]:
+    global _last_run_stats, _last_run_inputs
+    raw = load_raw_vendor_data()
+    
+    # Load vendor rules from governance service
+    rules = load_vendor_rules()
+    overrides = get_vendor_overrides()
+    _last_run_inputs = {"raw": raw, "rules": rules, "overrides": overrides}
+    
+    unified, _last_run_stats = match_incremental(raw, rules, overrides, rebuild=rebuild)
+
+    # Apply manual merges
+    unified, merged_vendor_ids = apply_manual_merges(unified, get_vendor_manual_merges())
+
     # Auto-merge vendors with same normalized name OR same address+phone
     # This automatically merges vendors like "SteelWorks Inc" and "Steel Works Incorporated"
-    processed_ids = set()
-    auto_merged_vendor_ids = set()
-    
-    for i, record1 in enumerate(unified):
-        if record1.unified_vendor_id in processed_ids or record1.unified_vendor_id in auto_merged_vendor_ids:
-            continue
-        
-        # Normalize for comparison
-        normalized_name1 = record1.normalized_name
-        normalized_phone1 = normalize_phone(record1.phone)
-        normalized_address1 = normalize_address(record1.address)
-        # Handle address normalization (remove common abbreviations)
-        normalized_address1_clean = normalized_address1.replace("street", "").replace("st", "").replace("avenue", "").replace("ave", "").replace("road", "").replace("rd", "").replace("boulevard", "").replace("blvd", "")
-        
-        vendors_to_merge = [record1]
-        
-        for j, record2 in enumerate(unified[i+1:], start=i+1):
-            if record2.unified_vendor_id in processed_ids or record2.unified_vendor_id in auto_merged_vendor_ids:
-                continue
-            
-            normalized_name2 = record2.normalized_name
-            normalized_phone2 = normalize_phone(record2.phone)
-            normalized_address2 = normalize_address(record2.address)
-            normalized_address2_clean = normalized_address2.replace("street", "").replace("st", "").replace("avenue", "").replace("ave", "").replace("road", "").replace("rd", "").replace("boulevard", "").replace("blvd", "")
-            
-            # Check if should merge: same normalized name OR same address+phone
-            name_match = normalized_name1 == normalized_name2 and len(normalized_name1) > 0
-            address_phone_match = (normalized_address1_clean == normalized_address2_clean and 
-                                  normalized_phone1 == normalized_phone2 and 
-                                  len(normalized_address1_clean) > 0 and len(normalized_phone1) > 0)
-            
-            if name_match or address_phone_match:
-                vendors_to_merge.append(record2)
-                processed_ids.add(record2.unified_vendor_id)
-        
-        # If we found vendors to merge, create merged record
-        if len(vendors_to_merge) > 1:
-            all_source_brands = set()
-            for r in vendors_to_merge:
-                all_source_brands.update(r.source_brands.split(", "))
-            
-            # Use the first vendor's name and data as the merged record
-            merged_record = VendorRecord(
-                unified_vendor_id=vendors_to_merge[0].unified_vendor_id,
-                vendor_name=vendors_to_merge[0].vendor_name,
-                normalized_name=vendors_to_merge[0].normalized_name,
-                address=vendors_to_merge[0].address,
-                phone=vendors_to_merge[0].phone,
-                source_brands=", ".join(sorted(all_source_brands)),
-                match_confidence=100
-            )
-            
-            # Remove merged records
-            merge_ids = [r.unified_vendor_id for r in vendors_to_merge]
-            unified = [r for r in unified if r.unified_vendor_id not in merge_ids]
-            unified.append(merged_record)
-            
-            # Track merged IDs (except the first one which becomes the merged ID)
-            auto_merged_vendor_ids.update(merge_ids[1:])
-        
-        processed_ids.add(record1.unified_vendor_id)
+    unified = auto_merge_vendors(unified)
 
     # Convert to required format
     result = []
     for record in unified:
-        # Skip records that were merged into others (from manual merges or auto-merge)
-        if record.unified_vendor_id in merged_vendor_ids or record.unified_vendor_id in auto_merged_vendor_ids:
+        # Skip records that were merged into others by manual merges
+        if record.unified_vendor_id in merged_vendor_ids:
             continue
             
-        has_tmh = "TMH" in record.source_brands
-        has_raymond = "Raymond" in record.source_brands
+        has_tmh = record.has_brand("TMH")
+        has_raymond = record.has_brand("Raymond")
         
         result.append({
             "unified_vendor_id": record.unified_vendor_id,
@@ -271,41 +354,122 @@ def harmonize_vendors() -> List[Dict]:
     return result
 
 
-def harmonized_vendors_csv() -> str:
-    rows = harmonize_vendors()
-    df = pd.DataFrame(rows)
+def simulate_vendor_thresholds(confidence_threshold: int = None, name_weight: float = None, address_weight: float = None) -> Dict:
+    """
+    Re-evaluate vendor matching for another threshold/weights against the
+    candidate-pair scores of the last harmonization run, and compare with the
+    saved rules. The score table is built once per run, on first use.
+    """
+    result = _harmonized_result()
+    with _cache_lock:
+        if _score_table["result_id"] != id(result):
+            inputs = _last_run_inputs
+            _score_table["table"] = VendorScoreTable(inputs["raw"], inputs["rules"], inputs["overrides"], get_score_cache(inputs["rules"]))
+            _score_table["result_id"] = id(result)
+        table = _score_table["table"]
+        rules = _last_run_inputs["rules"]
+    
+    return simulate(
+        table,
+        rules,
+        rules.get("confidence_threshold", 85) if confidence_threshold is None else confidence_threshold,
+        rules.get("name_weight", 0.7) if name_weight is None else name_weight,
+        rules.get("address_weight", 0.3) if address_weight is None else address_weight,
+    )
+
+
+def measure_approximate_recall(sample_size: int = DEFAULT_RECALL_SAMPLE, seed: int = 0) -> Dict:
+    """
+    Recall of approximate (MinHash LSH) matching against exact matching on a
+    sample of the current raw vendors, using the saved rules and LSH settings.
+    """
+    return approximate_recall(load_raw_vendor_data(), load_vendor_rules(), get_vendor_overrides(), sample_size, seed)
+
+
+def _search_index(name: str, key, build) -> VendorSearchIndex:
+    """Cached search index for `name`, rebuilt via build() when `key` changes."""
+    with _search_lock:
+        cached = _search_indexes.get(name)
+        if cached is None or cached[0] != key:
+            cached = (key, build())
+            _search_indexes[name] = cached
+        return cached[1]
+
+
+def query_harmonized_vendors(q: str = None, brand: str = None, min_confidence: int = None, cursor: int = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+    """
+    One page of harmonized vendors matching a search term (name/address/phone prefixes),
+    brand and minimum confidence, with the total match count.
+    """
+    result = _harmonized_result()
+    # The index holds the result list, so its id() stays unique while it is cached
+    index = _search_index(
+        "harmonized", id(result),
+        lambda: VendorSearchIndex(result, "unified_name", "unified_address", "unified_phone", "source_brands", "confidence"),
+    )
+    return index.page(q=q, brand=brand, min_confidence=min_confidence, cursor=cursor, limit=limit)
+
+
+def query_raw_vendors(q: str = None, brand: str = None, cursor: int = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+    """One page of raw vendor rows (with a Source_Brand column) matching a search term and brand, with the total match count."""
+    def build() -> VendorSearchIndex:
+        raw_data = load_raw_vendor_data()
+        rows = [
+            {**vendor, "Source_Brand": source_brand}
+            for brand_key, source_brand in [("tmh", "TMH"), ("raymond", "Raymond")]
+            for vendor in raw_data.get(brand_key, [])
+        ]
+        return VendorSearchIndex(rows, "Vendor_Name", "Address", "Phone", "Source_Brand")
+
+    index = _search_index("raw", _raw_inputs_key(), build)
+    return index.page(q=q, brand=brand, cursor=cursor, limit=limit)
+
+
+def _stream_csv(columns: List[str], rows: Iterable[Dict]) -> Iterator[str]:
+    """Yield CSV text (header first) in blocks of CSV_STREAM_BATCH rows, reusing one small buffer."""
     buffer = StringIO()
-    df.to_csv(buffer, index=False)
-    buffer.seek(0)
-    return buffer.read()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= CSV_STREAM_BATCH:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if buffer.tell():
+        yield buffer.getvalue()
 
 
-def raw_vendors_csv(brand: str = None) -> str:
-    """Export raw vendor data as CSV. If brand is specified, export only that brand."""
-    raw_data = load_raw_vendor_data()
-    
+def harmonized_vendors_csv() -> Iterator[str]:
+    """Export harmonized vendors as CSV, yielded in chunks for a streaming response."""
+    return _stream_csv(HARMONIZED_CSV_COLUMNS, harmonize_vendors())
+
+
+def raw_vendors_csv(brand: str = None) -> Iterator[str]:
+    """
+    Export raw vendor data as CSV, yielded in chunks. If brand is specified, export only that brand.
+    Rows are read chunk by chunk from the brand files, so memory stays flat however large they are.
+    """
     # Determine which vendors to export
     if brand and brand.lower() == "tmh":
-        vendors = [(v.copy(), "TMH") for v in raw_data.get("tmh", [])]
+        sources = [("tmh", "TMH")]
     elif brand and brand.lower() == "raymond":
-        vendors = [(v.copy(), "Raymond") for v in raw_data.get("raymond", [])]
+        sources = [("raymond", "Raymond")]
     else:
         # Default: combine all vendors
-        vendors = []
-        for vendor in raw_data.get("tmh", []):
-            vendors.append((vendor.copy(), "TMH"))
-        for vendor in raw_data.get("raymond", []):
-            vendors.append((vendor.copy(), "Raymond"))
-    
-    # Add source brand column
-    all_vendors = []
-    for vendor, source_brand in vendors:
-        vendor["Source_Brand"] = source_brand
-        all_vendors.append(vendor)
-    
-    df = pd.DataFrame(all_vendors)
-    buffer = StringIO()
-    df.to_csv(buffer, index=False)
-    buffer.seek(0)
-    return buffer.read()
+        sources = [("tmh", "TMH"), ("raymond", "Raymond")]
+
+    # Like load_raw_vendor_data: without both brand files there is no raw data
+    if any(_raw_vendor_file(brand_key, DATA_PATH) is None for brand_key in RAW_VENDOR_FILES):
+        sources = []
 
+    rows = (
+        {**vendor, "Source_Brand": source_brand}
+        for brand_key, source_brand in sources
+        for chunk in iter_raw_vendor_rows(brand_key)
+        for vendor in chunk
+    )
+    return _stream_csv(RAW_CSV_COLUMNS, rows)
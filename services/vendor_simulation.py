@@ -0,0 +1,219 @@
+"""
+Vendor Simulation - what-if evaluation of vendor matching thresholds and weights,
+and recall of approximate (MinHash LSH) matching against exact matching.
+
+A score table holds the rounded name and address scores for every pair of
+raw rows that share a blocking key (every earlier row when blocking is
+disabled). Matching only ever compares a row with the founding row of an
+existing record, and merges never change a record's name or address, so
+replaying the greedy assignment over this table reproduces a full matching
+run for any threshold and weights without scoring anything again.
+"""
+import random
+import time
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from services.vendor_matching import VendorMatcher, build_candidate
+from utils.disjoint_set import DisjointSet
+from utils.harmonization_helpers import normalize_phone, canonicalize_address, canonicalize_addresses
+from utils import vendor_scoring
+
+# Changed groups returned per simulation (the full count is always reported)
+MAX_CHANGED_GROUPS = 100
+# Raw rows sampled (across both brands) for an approximate-mode recall report
+DEFAULT_RECALL_SAMPLE = 2000
+# Exact mode scores every pair of sampled rows, so the sample is capped
+MAX_RECALL_SAMPLE = 10_000
+
+
+class VendorScoreTable:
+    """Candidate-pair scores for raw rows in matching order (TMH rows, then Raymond rows)."""
+
+    def __init__(self, raw: Dict[str, List[Dict]], rules: Dict, overrides: Dict, score_cache=None):
+        matcher = VendorMatcher(rules, overrides)
+        rows = [("TMH", row) for row in raw.get("tmh", [])] + [("Raymond", row) for row in raw.get("raymond", [])]
+        candidates = [build_candidate(row, matcher.normalizer) for _, row in rows]
+        self.size = len(rows)
+        self.brands = [source for source, _ in rows]
+        self.vendor_names = [candidate["Vendor_Name"] for candidate in candidates]
+
+        left, right = [], []
+        for i, candidate in enumerate(candidates):
+            if matcher.index is not None:
+                earlier = matcher.index.candidates(candidate["normalized_name"], candidate["Address"], candidate["Phone"])
+                matcher.index.add(i, candidate["normalized_name"], candidate["Address"], candidate["Phone"])
+            else:
+                earlier = range(i)
+            left.extend([i] * len(earlier))
+            right.extend(earlier)
+
+        names = vendor_scoring.prepare([c["normalized_name"] for c in candidates])
+        address_keys = canonicalize_addresses([c["Address"] for c in candidates])
+        addresses = vendor_scoring.prepare(address_keys)
+        name_scores, address_scores = vendor_scoring.pair_component_scores(
+            [names[i] for i in left], [addresses[i] for i in left],
+            [names[j] for j in right], [addresses[j] for j in right],
+            score_cache,
+        )
+        if score_cache is not None:
+            score_cache.flush()
+        # Pairs are grouped by row with ascending partners: row i's pairs are offsets[i]:offsets[i + 1]
+        self.left = np.array(left, dtype=np.int64)
+        self.right = np.array(right, dtype=np.int64)
+        self.name_scores = name_scores.astype(np.uint8)
+        self.address_scores = address_scores.astype(np.uint8)
+        self.offsets = np.searchsorted(self.left, np.arange(self.size + 1))
+
+        # Override targets per row, in override order (first existing target wins, as in matching)
+        self.override_targets: List[List[str]] = [matcher.override_targets.get(name, []) for name in self.vendor_names]
+
+        self.merge_keys: List[List[tuple]] = []
+        # Same keys as auto_merge_groups, from the canonical address the founding row's record would get
+        for candidate, address_key in zip(candidates, address_keys):
+            keys = []
+            if candidate["normalized_name"]:
+                keys.append(("name", candidate["normalized_name"]))
+            phone_key = normalize_phone(candidate["Phone"])
+            if address_key and phone_key:
+                keys.append(("address_phone", address_key, phone_key))
+            self.merge_keys.append(keys)
+
+    @property
+    def pair_count(self) -> int:
+        return len(self.left)
+
+    def replay(self, threshold: int, name_weight: float, address_weight: float) -> List[FrozenSet[int]]:
+        """Row groups produced by matching plus auto-merge under the given settings."""
+        combined = (self.name_scores * float(name_weight) + self.address_scores * float(address_weight)).astype(np.int64)
+        row_max = np.zeros(self.size, dtype=np.int64)
+        has_pairs = self.offsets[1:] > self.offsets[:-1]
+        if len(combined):
+            row_max[has_pairs] = np.maximum.reduceat(combined, self.offsets[:-1][has_pairs])
+
+        record_of = np.arange(self.size)
+        is_founder = np.zeros(self.size, dtype=bool)
+        founder_by_name: Dict[str, int] = {}
+        for i in range(self.size):
+            target = -1
+            for unified_name in self.override_targets[i]:
+                target = founder_by_name.get(unified_name, -1)
+                if target >= 0:
+                    break
+            if target < 0 and row_max[i] > 0 and row_max[i] >= threshold:
+                start, stop = self.offsets[i], self.offsets[i + 1]
+                partners = self.right[start:stop]
+                scores = np.where(is_founder[partners], combined[start:stop], -1)
+                k = int(scores.argmax())  # first maximum = lowest founding row, like a first-wins scan
+                if scores[k] > 0 and scores[k] >= threshold:
+                    target = int(partners[k])
+            if target >= 0:
+                record_of[i] = target
+            else:
+                is_founder[i] = True
+                founder_by_name.setdefault(self.vendor_names[i], i)
+
+        # Auto-merge each founder into the earliest anchor founder sharing a normalized name or a cleaned address + phone
+        merged = DisjointSet(self.size)
+        anchor_by_key: Dict[tuple, int] = {}
+        for founder in np.flatnonzero(is_founder).tolist():
+            keys = self.merge_keys[founder]
+            anchors = [anchor_by_key[key] for key in keys if key in anchor_by_key]
+            if anchors:
+                merged.union(min(anchors), founder)
+            else:
+                for key in keys:
+                    anchor_by_key[key] = founder
+
+        groups: Dict[int, List[int]] = {}
+        for i, record in enumerate(record_of.tolist()):
+            groups.setdefault(merged.find(record), []).append(i)
+        return [frozenset(members) for members in groups.values()]
+
+    def describe(self, group: FrozenSet[int]) -> List[Dict]:
+        return [{"vendor_name": self.vendor_names[i], "brand": self.brands[i]} for i in sorted(group)]
+
+
+def _summary(table: VendorScoreTable, groups: List[FrozenSet[int]]) -> Dict:
+    return {
+        "vendor_count": len(groups),
+        "merge_count": table.size - len(groups),
+        "unmatched_count": sum(1 for group in groups if len(group) == 1),
+        "cross_brand_count": sum(1 for group in groups if len({table.brands[i] for i in group}) > 1),
+    }
+
+
+def simulate(table: VendorScoreTable, baseline_rules: Dict, threshold: int, name_weight: float, address_weight: float, max_changed: Optional[int] = MAX_CHANGED_GROUPS) -> Dict:
+    """
+    Replay matching with the given threshold and weights and compare it with
+    the baseline settings. Groups are compared as sets of raw rows; manual
+    merges are not applied since they reference unified IDs of a real run.
+    """
+    started = time.perf_counter()
+    baseline = set(table.replay(
+        baseline_rules.get("confidence_threshold", 85),
+        baseline_rules.get("name_weight", 0.7),
+        baseline_rules.get("address_weight", 0.3),
+    ))
+    simulated = set(table.replay(threshold, name_weight, address_weight))
+
+    changes: List[Tuple[int, str, FrozenSet[int]]] = [(min(group), "formed", group) for group in simulated - baseline]
+    changes += [(min(group), "dissolved", group) for group in baseline - simulated]
+    changes.sort(key=lambda change: (change[0], change[1]))
+    return {
+        "settings": {"confidence_threshold": threshold, "name_weight": name_weight, "address_weight": address_weight},
+        "baseline": _summary(table, list(baseline)),
+        "simulated": _summary(table, list(simulated)),
+        "changed_group_count": len(changes),
+        "changed_groups": [
+            {"change": change, "members": table.describe(group)}
+            for _, change, group in changes[:max_changed]
+        ],
+        "pairs": table.pair_count,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _matched_pairs(groups: Counter) -> int:
+    return sum(size * (size - 1) // 2 for size in groups.values())
+
+
+def _assignments(raw: Dict[str, List[Dict]], rules: Dict, overrides: Dict) -> Tuple[List[str], Dict]:
+    matcher = VendorMatcher(rules, overrides)
+    started = time.perf_counter()
+    assigned = matcher.add_brand(raw.get("tmh", []), "TMH") + matcher.add_brand(raw.get("raymond", []), "Raymond")
+    stats = matcher.stats()
+    stats["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return [record.unified_vendor_id for record in assigned], stats
+
+
+def approximate_recall(raw: Dict[str, List[Dict]], rules: Dict, overrides: Dict, sample_size: int = DEFAULT_RECALL_SAMPLE, seed: int = 0) -> Dict:
+    """
+    Match a random sample of raw rows (kept in file order) exactly - every
+    pair scored, no blocking - and with MinHash LSH candidates, then compare
+    the row pairs each mode puts in the same unified record. Recall is the
+    share of exact-mode matched pairs that approximate mode also matches.
+    Manual and auto merges are not applied.
+    """
+    rows = [("tmh", i) for i in range(len(raw.get("tmh", [])))] + [("raymond", i) for i in range(len(raw.get("raymond", [])))]
+    sampled = sorted(random.Random(seed).sample(rows, min(sample_size, len(rows))))
+    sample = {brand: [raw[brand][i] for b, i in sampled if b == brand] for brand in ("tmh", "raymond")}
+
+    exact_rules = dict(rules, blocking={"enabled": False}, approximate_matching={"enabled": False})
+    approximate_rules = dict(rules, approximate_matching=dict(rules.get("approximate_matching", {}), enabled=True))
+    exact, exact_stats = _assignments(sample, exact_rules, overrides)
+    approximate, approximate_stats = _assignments(sample, approximate_rules, overrides)
+
+    exact_pairs = _matched_pairs(Counter(exact))
+    approximate_pairs = _matched_pairs(Counter(approximate))
+    shared_pairs = _matched_pairs(Counter(zip(exact, approximate)))
+    return {
+        "sample_size": len(sampled),
+        "lsh": {key: approximate_stats[key] for key in ("bands", "rows")},
+        "exact": {"matched_pairs": exact_pairs, "vendor_count": len(set(exact)), "pairs_compared": exact_stats["pairs_compared"], "elapsed_ms": exact_stats["elapsed_ms"]},
+        "approximate": {"matched_pairs": approximate_pairs, "vendor_count": len(set(approximate)), "pairs_compared": approximate_stats["pairs_compared"], "elapsed_ms": approximate_stats["elapsed_ms"]},
+        "recall": round(shared_pairs / exact_pairs, 4) if exact_pairs else 1.0,
+        "precision": round(shared_pairs / approximate_pairs, 4) if approximate_pairs else 1.0,
+    }
@@ -0,0 +1,207 @@
+"""
+Vendor State Service - persisted unified-vendor state for incremental harmonization.
+
+The state records every raw vendor row's content hash and the
+unified_vendor_id it was assigned to, plus the matched unified records.
+On the next run only rows whose hash is new are re-matched, against the
+persisted records, so vendor IDs stay stable between runs.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from models.vendor_model import VendorRecord, brand_mask
+from services.financial_storage import write_atomic
+from services.vendor_matching import VendorMatcher
+from services.vendor_parallel import match_sharded
+from services.vendor_score_cache import get_score_cache
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+VENDOR_STATE_PATH = BASE_PATH / "data" / "vendor_harmonization_state.json"
+
+STATE_VERSION = 3
+
+# Rule keys that change how rows are matched; any change forces a full rebuild
+MATCHING_RULE_KEYS = ["confidence_threshold", "name_weight", "address_weight", "normalization_rules", "blocking", "approximate_matching"]
+
+BRAND_SOURCES = [("tmh", "TMH"), ("raymond", "Raymond")]
+
+
+def load_vendor_state() -> Dict:
+    """Load persisted harmonization state from JSON file."""
+    if not VENDOR_STATE_PATH.exists():
+        return {}
+    try:
+        with open(VENDOR_STATE_PATH, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get("version") != STATE_VERSION:
+        return {}
+    return state
+
+
+def save_vendor_state(state: Dict):
+    """Save harmonization state to JSON file (per-writer temp file, fsync, then rename)."""
+    # json.dumps uses the C encoder; json.dump streams through the pure-Python one
+    write_atomic(VENDOR_STATE_PATH, json.dumps(state).encode('utf-8'))
+
+
+def clear_vendor_state():
+    """Delete persisted state so the next harmonization is a full rebuild."""
+    if VENDOR_STATE_PATH.exists():
+        VENDOR_STATE_PATH.unlink()
+
+
+def rules_fingerprint(rules: Dict, overrides: Dict) -> str:
+    relevant = {key: rules.get(key) for key in MATCHING_RULE_KEYS}
+    relevant["manual_overrides"] = overrides
+    # Sharding changes results; the worker count does not
+    relevant["parallel"] = {k: v for k, v in rules.get("parallel", {}).items() if k != "workers"}
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def row_keys(rows: List[Dict], brand: str) -> List[str]:
+    """
+    Content-hash key per raw row. Identical rows get an occurrence suffix
+    so duplicates within a brand file are tracked individually.
+    """
+    keys = []
+    seen: Dict[str, int] = {}
+    for row in rows:
+        payload = "\x1f".join([brand, row.get("Vendor_Name", ""), row.get("Address", ""), row.get("Phone", "")])
+        digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        occurrence = seen.get(digest, 0)
+        seen[digest] = occurrence + 1
+        keys.append(f"{digest}:{occurrence}")
+    return keys
+
+
+def _record_from_state(entry: Dict) -> VendorRecord:
+    return VendorRecord(
+        unified_vendor_id=entry["unified_vendor_id"],
+        vendor_name=entry["vendor_name"],
+        normalized_name=entry["normalized_name"],
+        address=entry["address"],
+        phone=entry["phone"],
+        brands=brand_mask(entry["source_brands"]),
+        match_confidence=entry.get("match_confidence"),
+        source_brands=entry["source_brands"],
+    )
+
+
+def match_incremental(raw: Dict[str, List[Dict]], rules: Dict, overrides: Dict, rebuild: bool = False) -> Tuple[List[VendorRecord], Dict]:
+    """
+    Match raw vendor rows into unified records, reusing persisted state.
+
+    Rows already in the state keep their unified_vendor_id. Rows that are new
+    or changed are matched against the persisted records. When a row
+    disappears, it is dropped from its record; a record that loses its founding
+    row is dissolved and its remaining rows are re-matched.
+
+    Returns the matched unified records (before manual/auto merges) and run counters.
+    """
+    fingerprint = rules_fingerprint(rules, overrides)
+    state = {} if rebuild else load_vendor_state()
+    if state.get("rules_fingerprint") != fingerprint:
+        state = {}
+
+    current: Dict[str, Tuple[str, Dict]] = {}
+    ordered_keys: List[Tuple[str, str]] = []
+    for brand_key, source in BRAND_SOURCES:
+        rows = raw.get(brand_key, [])
+        for key, row in zip(row_keys(rows, source), rows):
+            current[key] = (source, row)
+            ordered_keys.append((source, key))
+
+    state_rows: Dict[str, Dict] = state.get("rows", {})
+    records: Dict[str, Dict] = {entry["unified_vendor_id"]: entry for entry in state.get("records", [])}
+
+    # Drop rows that no longer exist from the records they were assigned to
+    removed = [key for key in state_rows if key not in current]
+    requeue = set()
+    for key in removed:
+        if key not in state_rows:
+            continue  # already released when its record was dissolved
+        vendor_id = state_rows.pop(key)["unified_vendor_id"]
+        entry = records.get(vendor_id)
+        if entry is None:
+            continue
+        founding = entry["members"][0] == key
+        entry["members"].remove(key)
+        if founding or not entry["members"]:
+            # The record's name/address came from this row: dissolve it and re-match the rest
+            for member in entry["members"]:
+                if member in current:
+                    requeue.add(member)
+                state_rows.pop(member, None)
+            del records[vendor_id]
+        else:
+            # Brands of the remaining rows in the order they were matched, as a full run would label them
+            entry["source_brands"] = ", ".join(state_rows[member]["brand"] for member in entry["members"])
+
+    pending = {"TMH": [], "Raymond": []}
+    for source, key in ordered_keys:
+        if key not in state_rows:
+            pending[source].append(key)
+
+    kept = list(records.values())
+    unified = [_record_from_state(entry) for entry in kept]
+    members = {entry["unified_vendor_id"]: entry["members"] for entry in kept}
+    next_id = state.get("next_id", 1)
+    matched = sum(len(keys) for keys in pending.values())
+    stats: Dict = {}
+
+    if matched and not state and rules.get("parallel", {}).get("enabled", False):
+        # Full rebuild: match shards in worker processes
+        unified, assigned, next_id, stats = match_sharded(raw, rules, overrides)
+        for (source, key), record in zip(ordered_keys, assigned):
+            members.setdefault(record.unified_vendor_id, []).append(key)
+            state_rows[key] = {"brand": source, "unified_vendor_id": record.unified_vendor_id}
+    elif matched:
+        score_cache = get_score_cache(rules)
+        matcher = VendorMatcher(rules, overrides, score_cache)
+        matcher.seed(unified, next_id)
+        for source in ["TMH", "Raymond"]:
+            keys = pending[source]
+            assigned = matcher.add_brand([current[key][1] for key in keys], source)
+            for key, record in zip(keys, assigned):
+                members.setdefault(record.unified_vendor_id, []).append(key)
+                state_rows[key] = {"brand": source, "unified_vendor_id": record.unified_vendor_id}
+        unified = matcher.unified
+        next_id = matcher.next_id
+        if score_cache is not None:
+            score_cache.flush()
+        stats = matcher.stats()
+
+    if matched or removed or not state:
+        save_vendor_state({
+            "version": STATE_VERSION,
+            "rules_fingerprint": fingerprint,
+            "next_id": next_id,
+            "records": [
+                {
+                    "unified_vendor_id": record.unified_vendor_id,
+                    "vendor_name": record.vendor_name,
+                    "normalized_name": record.normalized_name,
+                    "address": record.address,
+                    "phone": record.phone,
+                    "source_brands": record.source_brands,
+                    "match_confidence": record.match_confidence,
+                    "members": members[record.unified_vendor_id],
+                }
+                for record in unified
+            ],
+            "rows": state_rows,
+        })
+
+    stats.update({
+        "full_rebuild": not state,
+        "rows_total": len(current),
+        "rows_matched": matched,
+        "rows_removed": len(removed),
+        "rows_requeued": len(requeue),
+    })
+    return unified, stats
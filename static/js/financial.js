@@ -252,6 +252,29 @@ function handleUnifiedDataSearch(searchTerm) {
 }
 
 // Brand Controller Functions
+// Source account numbers in the rows of the given submissions, fetched in one request
+async function fetchSubmittedAccountNumbers(submissionIds) {
+    const accountNumbers = new Set();
+    try {
+        const rowsResponse = await fetch('/api/financial/submissions/rows', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ submission_ids: submissionIds })
+        });
+        const rowsData = await rowsResponse.json();
+        Object.values(rowsData.data || {}).forEach(rows => {
+            rows.forEach(row => {
+                if (row.source_account) {
+                    accountNumbers.add(row.source_account);
+                }
+            });
+        });
+    } catch (err) {
+        console.error('Error loading submission rows:', err);
+    }
+    return accountNumbers;
+}
+
 async function loadRawData() {
     const tbody = document.getElementById('raw-data-body');
     if (!tbody) return;
@@ -278,22 +301,8 @@ async function loadRawData() {
                 .filter(s => s.status === 'SUBMITTED' || s.status === 'APPROVED')
                 .map(s => s.submission_id);
             
-            // Fetch submission rows to get submitted account numbers - await all in parallel
-            await Promise.all(submittedSubmissionIds.map(async (submissionId) => {
-                try {
-                    const rowsResponse = await fetch(`/api/financial/submission/${submissionId}/rows`);
-                    const rowsData = await rowsResponse.json();
-                    if (rowsData.data) {
-                        rowsData.data.forEach(row => {
-                            if (row.source_account) {
-                                submittedAccountNumbers.add(row.source_account);
-                            }
-                        });
-                    }
-                } catch (err) {
-                    console.error('Error loading submission rows:', err);
-                }
-            }));
+            // Fetch submission rows to get submitted account numbers - one batch request
+            submittedAccountNumbers = await fetchSubmittedAccountNumbers(submittedSubmissionIds);
         }
         
         const response = await fetch('/api/financial/raw');
@@ -427,22 +436,8 @@ async function loadPreview() {
         if (approvedOrSubmittedIds.length > 0) {
             const submissionIdsToCheck = approvedOrSubmittedIds;
             
-            // Fetch submission rows to get submitted account numbers
-            for (const submissionId of submissionIdsToCheck) {
-                try {
-                    const rowsResponse = await fetch(`/api/financial/submission/${submissionId}/rows`);
-                    const rowsData = await rowsResponse.json();
-                    if (rowsData.data) {
-                        rowsData.data.forEach(row => {
-                            if (row.source_account) {
-                                submittedAccountNumbers.add(row.source_account);
-                            }
-                        });
-                    }
-                } catch (err) {
-                    console.error('Error loading submission rows:', err);
-                }
-            }
+            // Fetch submission rows to get submitted account numbers - one batch request
+            submittedAccountNumbers = await fetchSubmittedAccountNumbers(submissionIdsToCheck);
         }
         
         // Fetch preview - variances are recomputed dynamically on each request
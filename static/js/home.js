@@ -15,28 +15,22 @@ const loadKPIData = async (role) => {
         const vendorEl = document.getElementById('kpi-vendor-records');
         
         if (role === 'maya') {
-            // For Maya, show harmonized vendors
-            const vendorRes = await fetch('/api/vendors/harmonized');
+            // For Maya, show harmonized vendors (only the total is needed)
+            const vendorRes = await fetch('/api/vendors/harmonized?limit=0');
             if (vendorRes.ok) {
                 const vendor = await vendorRes.json();
-                const vendorData = vendor.data || [];
                 if (vendorEl) {
-                    vendorEl.textContent = vendorData.length;
+                    vendorEl.textContent = vendor.total || 0;
                 }
             }
         } else {
             // For Liam and Ethan, show total raw vendors for their brand
-            const vendorRes = await fetch('/api/vendors/raw');
+            const brand = role === 'liam' ? 'raymond' : role === 'ethan' ? 'tmh' : '';
+            const vendorRes = brand ? await fetch(`/api/vendors/raw?brand=${brand}&limit=0`) : { ok: false };
             if (vendorRes.ok) {
                 const vendor = await vendorRes.json();
-                let vendorCount = 0;
-                if (role === 'liam') {
-                    vendorCount = (vendor.raymond || []).length;
-                } else if (role === 'ethan') {
-                    vendorCount = (vendor.tmh || []).length;
-                }
                 if (vendorEl) {
-                    vendorEl.textContent = vendorCount;
+                    vendorEl.textContent = vendor.total || 0;
                 }
             }
         }
@@ -51,36 +51,69 @@ const renderTable = (tableEl, data) => {
 
 let mayaVendorViewMode = 'tmh'; // 'tmh' or 'raymond' for Maya's raw view
 
-const renderRawVendors = (rawData, role) => {
+const VENDOR_PAGE_SIZE = 100;
+const SEARCH_DEBOUNCE_MS = 250;
+
+// Server-side paging state per table: search term, rows loaded so far, cursor for the next page
+const vendorPages = {
+  raw: { q: '', rows: [], total: 0, nextCursor: null, counts: null, seq: 0 },
+  harmonized: { q: '', rows: [], total: 0, nextCursor: null, counts: null, seq: 0, loaded: false },
+};
+
+const rawBrandForRole = (role) => {
+  if (role === 'maya') return mayaVendorViewMode;
+  if (role === 'liam') return 'raymond';
+  if (role === 'ethan') return 'tmh';
+  return '';
+};
+
+const fetchVendorPage = async (kind, params) => {
+  const query = new URLSearchParams({ limit: VENDOR_PAGE_SIZE });
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== null && value !== undefined && value !== '') query.set(key, value);
+  });
+  const res = await fetch(`/api/vendors/${kind}?${query.toString()}`);
+  if (!res.ok) throw new Error(`Failed to load ${kind} vendors`);
+  return res.json();
+};
+
+// Fetch the first page (reset) or the next page of a table; stale responses are dropped
+const loadVendorPage = async (kind, params, reset) => {
+  const state = vendorPages[kind];
+  const seq = ++state.seq;
+  const page = await fetchVendorPage(kind, { ...params, q: state.q, cursor: reset ? null : state.nextCursor });
+  if (seq !== state.seq) return false;
+  state.rows = reset ? page.data : state.rows.concat(page.data);
+  state.total = page.total;
+  state.nextCursor = page.next_cursor;
+  state.counts = page.counts;
+  return true;
+};
+
+const renderPager = (pagerId, state) => {
+  const pager = document.getElementById(pagerId);
+  if (!pager) return;
+  const summary = pager.querySelector('[data-role="summary"]');
+  const more = pager.querySelector('[data-role="more"]');
+  if (summary) summary.textContent = state.total ? `Showing ${state.rows.length} of ${state.total}` : '';
+  if (more) more.classList.toggle('hidden', !state.nextCursor);
+};
+
+const renderRawVendors = (rows) => {
   const tbody = document.getElementById('raw-vendor-body');
   if (!tbody) return;
 
-  // Determine which brands to show
-  let vendorsToShow = [];
-  if (role === 'maya') {
-    // Show only the selected brand for Maya
-    if (mayaVendorViewMode === 'tmh') {
-      vendorsToShow = (rawData.tmh || []).map(v => ({ ...v, sourceBrand: 'TMH' }));
-    } else {
-      vendorsToShow = (rawData.raymond || []).map(v => ({ ...v, sourceBrand: 'Raymond' }));
-    }
-  } else if (role === 'liam') {
-    vendorsToShow = (rawData.raymond || []).map(v => ({ ...v, sourceBrand: 'Raymond' }));
-  } else if (role === 'ethan') {
-    vendorsToShow = (rawData.tmh || []).map(v => ({ ...v, sourceBrand: 'TMH' }));
-  }
-
-  if (vendorsToShow.length === 0) {
+  if (!rows || rows.length === 0) {
     tbody.innerHTML = '<tr><td colspan="4" style="padding: 2rem; text-align: center; color: var(--slate-500);">No vendor data available</td></tr>';
     return;
   }
 
   // Render table rows
-  tbody.innerHTML = vendorsToShow.map(vendor => {
+  tbody.innerHTML = rows.map(vendor => {
     const vendorName = vendor.Vendor_Name || vendor.vendor_name || '';
     const address = vendor.Address || vendor.address || '';
     const phone = vendor.Phone || vendor.phone || '';
-    const sourceBrand = vendor.sourceBrand || '';
+    const sourceBrand = vendor.Source_Brand || '';
     const chipClass = sourceBrand.toLowerCase() === 'tmh' ? 'tmh' : 'raymond';
     
     return `
@@ -100,37 +133,36 @@ function escapeHtml(text) {
   return div.innerHTML;
 }
 
-const filterHarmonizedVendors = (data, role) => {
-  if (role === 'maya') return data;
-  if (role === 'liam') {
-    return data.filter(v =>
-      v.raymond_source_name ||
-      (v.source_brands && v.source_brands.includes('Raymond'))
-    );
-  }
-  if (role === 'ethan') {
-    return data.filter(v =>
-      v.tmh_source_name ||
-      (v.source_brands && v.source_brands.includes('TMH'))
-    );
+const loadRawVendors = async (reset = true) => {
+  const fresh = await loadVendorPage('raw', { brand: rawBrandForRole(getRole()) }, reset);
+  if (!fresh) return;
+  renderRawVendors(vendorPages.raw.rows);
+  renderPager('raw-vendor-pager', vendorPages.raw);
+};
+
+const loadHarmonizedVendors = async (reset = true) => {
+  const fresh = await loadVendorPage('harmonized', {}, reset);
+  if (!fresh) return;
+  vendorPages.harmonized.loaded = true;
+  const harmonizedTable = document.getElementById("harmonized-vendor-table");
+  if (harmonizedTable) {
+    renderTable(harmonizedTable, vendorPages.harmonized.rows);
   }
-  return data;
+  renderPager('harmonized-vendor-pager', vendorPages.harmonized);
 };
 
-const updateMetrics = (rawData, harmonizedData, role) => {
-  const raw = rawData;
-  const harmonized = filterHarmonizedVendors(harmonizedData.data, role);
+// rawCounts / harmonizedCounts are the unfiltered "counts" returned with each page
+const updateMetrics = (rawCounts, harmonizedCounts, role) => {
+  const raw = rawCounts || {};
+  const harmonized = harmonizedCounts || {};
 
   const totalRaw = role === 'maya'
-    ? (raw.tmh?.length || 0) + (raw.raymond?.length || 0)
-    : role === 'liam' ? (raw.raymond?.length || 0) : (raw.tmh?.length || 0);
+    ? (raw.tmh || 0) + (raw.raymond || 0)
+    : role === 'liam' ? (raw.raymond || 0) : (raw.tmh || 0);
 
-  const totalHarmonized = harmonized.length;
+  const totalHarmonized = harmonized.total || 0;
   const duplicatesRemoved = Math.max(0, totalRaw - totalHarmonized);
-  const crossMatches = harmonized.filter(v =>
-    (v.tmh_source_name && v.raymond_source_name) ||
-    (v.source_brands && v.source_brands.includes('TMH') && v.source_brands.includes('Raymond'))
-  ).length;
+  const crossMatches = harmonized.cross_brand || 0;
 
   const countUp = (el, target) => {
     if (!el) return;
@@ -152,96 +184,17 @@ const updateMetrics = (rawData, harmonizedData, role) => {
   countUp(document.getElementById("metric-cross-matches"), crossMatches);
 };
 
-let allVendorData = { raw: null, harmonized: null };
-let filteredRawVendorData = null; // Store filtered raw data
-
-const handleSearch = (searchTerm) => {
-  if (!allVendorData.raw) return;
-  const role = getRole();
-  const term = searchTerm.toLowerCase().trim();
-
-  const filterData = (data) => {
-    if (!term) return data;
-    return data.filter(row =>
-      Object.values(row).some(val => {
-        if (typeof val === 'object') return false;
-        return String(val).toLowerCase().includes(term);
-      })
-    );
-  };
-
-  // Only filter raw data if we're on the raw pane
-  const activePane = document.querySelector('.fiori-pane.active');
-  if (activePane && activePane.id === 'raw-vendor-pane') {
-    const rawFiltered = {
-      tmh: filterData(allVendorData.raw.tmh || []),
-      raymond: filterData(allVendorData.raw.raymond || [])
-    };
-    filteredRawVendorData = rawFiltered;
-    renderRawVendors(rawFiltered, role);
-  }
-
-  // Only filter harmonized data if we're on the unified pane and it exists
-  if (activePane && activePane.id === 'unified-vendor-pane' && allVendorData.harmonized) {
-    const harmonizedTable = document.getElementById("harmonized-vendor-table");
-    if (harmonizedTable) {
-      const harmonizedFiltered = filterData(filterHarmonizedVendors(allVendorData.harmonized.data, role));
-      renderTable(harmonizedTable, harmonizedFiltered);
-    }
-  }
-};
-
-const handleRawVendorSearch = (searchTerm) => {
-  if (!allVendorData.raw) return;
-  const role = getRole();
-  const term = searchTerm.toLowerCase().trim();
-
-  const filterVendor = (vendor) => {
-    if (!term) return true;
-    const vendorName = (vendor.Vendor_Name || vendor.vendor_name || '').toLowerCase();
-    const address = (vendor.Address || vendor.address || '').toLowerCase();
-    const phone = (vendor.Phone || vendor.phone || '').toLowerCase();
-    return vendorName.includes(term) || address.includes(term) || phone.includes(term);
-  };
-
-  const rawFiltered = {
-    tmh: (allVendorData.raw.tmh || []).filter(filterVendor),
-    raymond: (allVendorData.raw.raymond || []).filter(filterVendor)
-  };
-  
-  filteredRawVendorData = rawFiltered;
-  renderRawVendors(rawFiltered, role);
-};
-
 const hydrate = async () => {
   try {
     const role = getRole();
-    const raw = await fetch("/api/vendors/raw").then(r => r.json());
-    allVendorData.raw = raw;
-
-    // Only render raw vendors if we're on the raw pane
-    const activePane = document.querySelector('.fiori-pane.active');
-    if (!activePane || activePane.id === 'raw-vendor-pane') {
-      renderRawVendors(raw, role);
-    }
+    await loadRawVendors();
 
     // Only load harmonized data for Maya
     if (role === 'maya') {
-      const harmonized = await fetch("/api/vendors/harmonized").then(r => r.json());
-      allVendorData.harmonized = harmonized;
-
-      // Only render harmonized table if we're on the unified pane
-      if (activePane && activePane.id === 'unified-vendor-pane') {
-        const harmonizedTable = document.getElementById("harmonized-vendor-table");
-        if (harmonizedTable) {
-          const filtered = filterHarmonizedVendors(harmonized.data, role);
-          renderTable(harmonizedTable, filtered);
-        }
-      }
-
-      updateMetrics(raw, harmonized, role);
+      await loadHarmonizedVendors();
+      updateMetrics(vendorPages.raw.counts, vendorPages.harmonized.counts, role);
     } else {
-      updateMetrics(raw, { data: [] }, role);
+      updateMetrics(vendorPages.raw.counts, null, role);
     }
   } catch (err) {
     console.error(err);
@@ -261,43 +214,49 @@ const switchToVendorTab = (targetId) => {
     targetPane.classList.add("active");
     targetTab.classList.add("active");
 
-    const role = getRole();
-
-    // Load data when specific tabs are activated
-    if (targetId === 'raw-vendor-pane') {
-      // Use filtered data if search is active, otherwise use all data
-      const rawInput = document.getElementById('raw-vendor-search');
-      if (rawInput && rawInput.value.trim()) {
-        handleRawVendorSearch(rawInput.value);
-      } else if (allVendorData.raw) {
-        filteredRawVendorData = null;
-        renderRawVendors(allVendorData.raw, role);
-      }
-    } else if (targetId === 'unified-vendor-pane' && role === 'maya') {
-      if (allVendorData.harmonized) {
-        const harmonizedTable = document.getElementById("harmonized-vendor-table");
-        if (harmonizedTable) {
-          const filtered = filterHarmonizedVendors(allVendorData.harmonized.data, role);
-          renderTable(harmonizedTable, filtered);
-        }
-      } else {
-        // Load harmonized data if not already loaded
-        fetch("/api/vendors/harmonized")
-          .then(r => r.json())
-          .then(harmonized => {
-            allVendorData.harmonized = harmonized;
-            const harmonizedTable = document.getElementById("harmonized-vendor-table");
-            if (harmonizedTable) {
-              const filtered = filterHarmonizedVendors(harmonized.data, role);
-              renderTable(harmonizedTable, filtered);
-            }
-          })
-          .catch(err => console.error(err));
-      }
+    // Load harmonized data if not already loaded
+    if (targetId === 'unified-vendor-pane' && getRole() === 'maya' && !vendorPages.harmonized.loaded) {
+      loadHarmonizedVendors().catch(err => console.error(err));
     }
   }
 };
 
+// Wire a search box to a table: debounced server-side search, clear button, and "Load more"
+const bindVendorSearch = (kind, inputId, clearId, pagerId, load) => {
+  const input = document.getElementById(inputId);
+  const clearBtn = document.getElementById(clearId);
+  let timer = null;
+
+  const runSearch = (value) => {
+    vendorPages[kind].q = value.trim();
+    load().catch(err => console.error(err));
+  };
+
+  if (input) {
+    input.addEventListener("input", (e) => {
+      if (clearBtn) clearBtn.classList.toggle('hidden', !e.target.value);
+      clearTimeout(timer);
+      timer = setTimeout(() => runSearch(e.target.value), SEARCH_DEBOUNCE_MS);
+    });
+  }
+
+  if (clearBtn) {
+    clearBtn.addEventListener("click", () => {
+      if (input) input.value = "";
+      clearTimeout(timer);
+      runSearch("");
+      clearBtn.classList.add('hidden');
+    });
+  }
+
+  const more = document.querySelector(`#${pagerId} [data-role="more"]`);
+  if (more) {
+    more.addEventListener("click", () => {
+      load(false).catch(err => console.error(err));
+    });
+  }
+};
+
 document.addEventListener("DOMContentLoaded", () => {
   hydrate();
 
@@ -315,45 +274,29 @@ document.addEventListener("DOMContentLoaded", () => {
   
   if (toggleVendorTMH) {
     toggleVendorTMH.addEventListener('click', () => {
-      const role = getRole();
-      if (role !== 'maya') return;
+      if (getRole() !== 'maya') return;
 
       // Update active state
       toggleVendorTMH.classList.add('active');
       if (toggleVendorRaymond) toggleVendorRaymond.classList.remove('active');
 
-      // Update view mode
+      // Update view mode and reload the first page (keeps the active search)
       mayaVendorViewMode = 'tmh';
-
-      // Re-render raw data (use filtered if search is active)
-      const rawInput = document.getElementById('raw-vendor-search');
-      if (rawInput && rawInput.value.trim() && filteredRawVendorData) {
-        renderRawVendors(filteredRawVendorData, role);
-      } else if (allVendorData.raw) {
-        renderRawVendors(allVendorData.raw, role);
-      }
+      loadRawVendors().catch(err => console.error(err));
     });
   }
   
   if (toggleVendorRaymond) {
     toggleVendorRaymond.addEventListener('click', () => {
-      const role = getRole();
-      if (role !== 'maya') return;
+      if (getRole() !== 'maya') return;
 
       // Update active state
       if (toggleVendorTMH) toggleVendorTMH.classList.remove('active');
       toggleVendorRaymond.classList.add('active');
 
-      // Update view mode
+      // Update view mode and reload the first page (keeps the active search)
       mayaVendorViewMode = 'raymond';
-
-      // Re-render raw data (use filtered if search is active)
-      const rawInput = document.getElementById('raw-vendor-search');
-      if (rawInput && rawInput.value.trim() && filteredRawVendorData) {
-        renderRawVendors(filteredRawVendorData, role);
-      } else if (allVendorData.raw) {
-        renderRawVendors(allVendorData.raw, role);
-      }
+      loadRawVendors().catch(err => console.error(err));
     });
   }
 
@@ -361,18 +304,7 @@ document.addEventListener("DOMContentLoaded", () => {
   const downloadRawBtn = document.getElementById("download-raw-vendors-csv");
   if (downloadRawBtn) {
     downloadRawBtn.addEventListener("click", () => {
-      const role = getRole();
-      let brand = null;
-      
-      // For Maya, use the toggle state
-      if (role === 'maya') {
-        brand = mayaVendorViewMode; // 'tmh' or 'raymond'
-      } else if (role === 'liam') {
-        brand = 'raymond';
-      } else if (role === 'ethan') {
-        brand = 'tmh';
-      }
-      
+      const brand = rawBrandForRole(getRole());
       const url = brand ? `/api/vendors/raw/csv?brand=${brand}` : "/api/vendors/raw/csv";
       window.location.href = url;
     });
@@ -386,40 +318,9 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
-  // Raw vendor search bar (within Raw Vendor Data section)
-  const rawVendorSearchInput = document.getElementById("raw-vendor-search");
-  const clearRawVendorSearchBtn = document.getElementById("clear-raw-vendor-search");
-
-  if (rawVendorSearchInput) {
-    rawVendorSearchInput.addEventListener("input", (e) => {
-      handleRawVendorSearch(e.target.value);
-      if (clearRawVendorSearchBtn) {
-        if (e.target.value) {
-          clearRawVendorSearchBtn.classList.remove('hidden');
-        } else {
-          clearRawVendorSearchBtn.classList.add('hidden');
-          // Reset to show all data when search is cleared
-          if (allVendorData.raw) {
-            filteredRawVendorData = null;
-            renderRawVendors(allVendorData.raw, getRole());
-          }
-        }
-      }
-    });
-  }
-
-  if (clearRawVendorSearchBtn) {
-    clearRawVendorSearchBtn.addEventListener("click", () => {
-      if (rawVendorSearchInput) {
-        rawVendorSearchInput.value = "";
-        filteredRawVendorData = null;
-        if (allVendorData.raw) {
-          renderRawVendors(allVendorData.raw, getRole());
-        }
-        clearRawVendorSearchBtn.classList.add('hidden');
-      }
-    });
-  }
+  // Search bars (server-side, paged)
+  bindVendorSearch('raw', 'raw-vendor-search', 'clear-raw-vendor-search', 'raw-vendor-pager', loadRawVendors);
+  bindVendorSearch('harmonized', 'unified-vendor-search', 'clear-unified-vendor-search', 'harmonized-vendor-pager', loadHarmonizedVendors);
 
   const roleSelector = document.getElementById('role-selector');
   if (roleSelector) {
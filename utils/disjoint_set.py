@@ -0,0 +1,39 @@
+"""
+Disjoint-set (union-find) over integer positions.
+"""
+from typing import Dict, List
+
+
+class DisjointSet:
+    """
+    Union-find over positions 0..size-1 with path halving.
+
+    The root of each set is always its lowest position, so "first record
+    wins" survivorship falls out of find() without extra bookkeeping.
+    """
+
+    def __init__(self, size: int):
+        self._parent = list(range(size))
+
+    def find(self, position: int) -> int:
+        parent = self._parent
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    def union(self, a: int, b: int) -> int:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if root_b < root_a:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        return root_a
+
+    def groups(self) -> Dict[int, List[int]]:
+        """Root -> member positions (ascending), for every set."""
+        groups: Dict[int, List[int]] = {}
+        for position in range(len(self._parent)):
+            groups.setdefault(self.find(position), []).append(position)
+        return groups
@@ -1,5 +1,151 @@
 import re
-from typing import Dict
+import string
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Flags read from vendor_rules.json "normalization_rules"; missing flags default to on
+DEFAULT_NORMALIZATION_RULES = {
+    "lowercase": True,
+    "remove_punctuation": True,
+    "collapse_spaces": True,
+}
+# Distinct strings remembered per normalizer function
+NORMALIZE_CACHE_SIZE = 200_000
+
+# USPS Publication 28 style abbreviations for street suffixes, directionals and
+# unit designators; every spelling maps to the standard abbreviation
+ADDRESS_ABBREVIATIONS = {
+    "street": "st", "str": "st",
+    "avenue": "ave", "av": "ave", "aven": "ave", "avn": "ave",
+    "road": "rd",
+    "boulevard": "blvd", "boul": "blvd",
+    "drive": "dr", "drv": "dr",
+    "lane": "ln",
+    "court": "ct",
+    "place": "pl",
+    "parkway": "pkwy", "pky": "pkwy",
+    "highway": "hwy",
+    "circle": "cir",
+    "terrace": "ter",
+    "trail": "trl",
+    "square": "sq",
+    "expressway": "expy",
+    "freeway": "fwy",
+    "plaza": "plz",
+    "center": "ctr", "centre": "ctr",
+    "crossing": "xing",
+    "alley": "aly",
+    "north": "n", "south": "s", "east": "e", "west": "w",
+    "northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw",
+    "suite": "ste", "apartment": "apt", "building": "bldg", "floor": "fl", "room": "rm",
+}
+
+
+class NormalizationEngine:
+    """
+    Text/phone/address normalization compiled once from normalization rule flags.
+
+    ASCII input goes through precomputed str.translate tables; other input
+    falls back to the equivalent compiled regex. Results are memoized in
+    bounded LRU caches, so repeated vendor names and addresses are normalized once.
+    """
+
+    def __init__(self, rules: Optional[Dict] = None):
+        flags = dict(DEFAULT_NORMALIZATION_RULES)
+        flags.update(rules or {})
+        self.lowercase = bool(flags["lowercase"])
+        self.remove_punctuation = bool(flags["remove_punctuation"])
+        self.collapse_spaces = bool(flags["collapse_spaces"])
+
+        keep = string.ascii_lowercase + string.digits if self.lowercase else string.ascii_letters + string.digits
+        # ASCII table: punctuation -> space (whitespace is left for the collapse step)
+        self._punctuation_table = {
+            code: " " for code in range(128)
+            if chr(code) not in keep and not chr(code).isspace()
+        }
+        self._punctuation_re = re.compile(r"[^a-z0-9\s]" if self.lowercase else r"[^A-Za-z0-9\s]")
+        self._phone_table = {code: None for code in range(128) if not chr(code).isdigit()}
+        self._non_digit_re = re.compile(r"\D")
+
+        self.normalize_text = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize_text)
+        self.normalize_phone = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize_phone)
+        self.normalize_address = self.normalize_text
+
+    def _normalize_text(self, value: str) -> str:
+        if not isinstance(value, str):
+            return ""
+        cleaned = value.strip()
+        if self.lowercase:
+            cleaned = cleaned.lower()
+        if self.remove_punctuation:
+            if cleaned.isascii():
+                cleaned = cleaned.translate(self._punctuation_table)
+            else:
+                cleaned = self._punctuation_re.sub(" ", cleaned)
+        if self.collapse_spaces:
+            # str.split() splits on the same whitespace as \s+
+            return " ".join(cleaned.split())
+        return cleaned.strip()
+
+    def _normalize_phone(self, phone: str) -> str:
+        if not isinstance(phone, str):
+            return ""
+        digits = phone.translate(self._phone_table) if phone.isascii() else self._non_digit_re.sub("", phone)
+        if len(digits) == 10:
+            return f"({digits[0:3]}) {digits[3:6]}-{digits[6:]}"
+        if len(digits) == 11 and digits.startswith("1"):
+            return f"+1 ({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
+        return digits
+
+    def normalize_texts(self, values: Iterable[str]) -> List[str]:
+        """Normalize a whole column; each distinct value is computed once."""
+        return _map_distinct(self.normalize_text, values)
+
+    def normalize_phones(self, values: Iterable[str]) -> List[str]:
+        """Normalize a whole phone column; each distinct value is computed once."""
+        return _map_distinct(self.normalize_phone, values)
+
+    def normalize_addresses(self, values: Iterable[str]) -> List[str]:
+        """Normalize a whole address column; each distinct value is computed once."""
+        return _map_distinct(self.normalize_address, values)
+
+    def cache_info(self) -> Dict[str, Dict]:
+        return {
+            "text": self.normalize_text.cache_info()._asdict(),
+            "phone": self.normalize_phone.cache_info()._asdict(),
+        }
+
+
+def _map_distinct(function, values: Iterable[str]) -> List[str]:
+    results = {}
+    normalized = []
+    for value in values:
+        if value not in results:
+            results[value] = function(value)
+        normalized.append(results[value])
+    return normalized
+
+
+def _rules_key(rules: Optional[Dict]) -> Tuple[bool, ...]:
+    flags = dict(DEFAULT_NORMALIZATION_RULES)
+    flags.update(rules or {})
+    return tuple(bool(flags[name]) for name in DEFAULT_NORMALIZATION_RULES)
+
+
+_engines: Dict[Tuple[bool, ...], NormalizationEngine] = {}
+
+
+def get_normalizer(rules: Optional[Dict] = None) -> NormalizationEngine:
+    """Shared engine for a set of normalization_rules flags (compiled once per flag combination)."""
+    key = _rules_key(rules)
+    engine = _engines.get(key)
+    if engine is None:
+        engine = _engines.setdefault(key, NormalizationEngine(dict(zip(DEFAULT_NORMALIZATION_RULES, key))))
+    return engine
+
+
+# Engine behind the module-level helpers (all flags on)
+_default_engine = get_normalizer()
 
 
 def normalize_text(value: str) -> str:
@@ -10,12 +156,7 @@ def normalize_text(value: str) -> str:
     - remove punctuation
     - collapse internal spaces
     """
-    if not isinstance(value, str):
-        return ""
-    lowered = value.lower().strip()
-    cleaned = re.sub(r"[^a-z0-9\s]", " ", lowered)
-    collapsed = re.sub(r"\s+", " ", cleaned)
-    return collapsed.strip()
+    return _default_engine.normalize_text(value)
 
 
 def normalize_account_name(name: str) -> str:
@@ -23,23 +164,32 @@ def normalize_account_name(name: str) -> str:
 
 
 def normalize_phone(phone: str) -> str:
-    if not isinstance(phone, str):
-        return ""
-    digits = re.sub(r"\D", "", phone)
-    if len(digits) == 10:
-        return f"({digits[0:3]}) {digits[3:6]}-{digits[6:]}"
-    if len(digits) == 11 and digits.startswith("1"):
-        return f"+1 ({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
-    return digits
+    return _default_engine.normalize_phone(phone)
 
 
 def normalize_address(address: str) -> str:
     return normalize_text(address)
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def canonicalize_address(address: str) -> str:
+    """
+    Canonical address key for scoring and exact-key merging: normalized,
+    split into tokens once, and each street suffix, directional or unit
+    word replaced by its standard abbreviation ("456 Industrial Avenue" and
+    "456 Industrial Ave" give the same key). Whole tokens only, so words
+    like "west" or "third" are never cut apart.
+    """
+    return " ".join(ADDRESS_ABBREVIATIONS.get(token, token) for token in _default_engine.normalize_text(address).split())
+
+
+def canonicalize_addresses(values: Iterable[str]) -> List[str]:
+    """Canonicalize a whole address column; each distinct value is computed once."""
+    return _map_distinct(canonicalize_address, values)
+
+
 def build_lookup(items: Dict[str, str]) -> Dict[str, str]:
     """
     Build a reverse lookup using normalized keys.
     """
     return {normalize_text(k): v for k, v in items.items()}
-
@@ -0,0 +1,267 @@
+"""
+Exact amount aggregation in int64 minor units.
+
+Amounts are stored as decimal strings. Summing them as floats drifts on
+cents, and Decimal arithmetic row by row is slow on large ledgers. These
+kernels parse a whole column of amount strings once into int64 minor units
+at one shared scale (the most fraction digits seen), sum them per group with
+NumPy, and hand totals back as exact Decimals.
+
+Strings the byte kernels cannot represent exactly (exponents, underscores,
+more than 18 significant digits at the shared scale, anything invalid, and
+a leading plus sign in columns up to 18 bytes wide) are
+resolved one by one with the caller's Decimal parser, so the totals always
+match a row-by-row Decimal sum.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Rows per parse chunk (bounds the width x rows byte matrices)
+PARSE_CHUNK = 1 << 14
+# Rows per matrix product in the narrow kernel, so the float codes stay in cache
+PRODUCT_ROWS = 1 << 12
+# Significant digits that always fit in int64
+MAX_DIGITS = 18
+
+_DIGIT, _DOT, _MINUS, _PLUS, _PAD = 48, 46, 45, 43, 0
+_POWERS = 10 ** np.arange(MAX_DIGITS + 1, dtype=np.int64)
+# np.strings is NumPy >= 2; np.char covers older installs
+_strip = getattr(np, "strings", np.char).strip
+
+# Byte codes for the narrow kernel. Digits keep their value; dots, pads,
+# minus signs and any other byte get codes at or above bit 20 with their
+# own bit fields. Masking a weighted row sum to 20 bits leaves its digits
+# (a dot or pad reads as a zero digit), the plain row sum counts each class
+# and the row sum weighted by position + 1 keys the row's shape. A plus sign
+# counts as any other byte, so those rows fall back.
+_FIELD = 20
+_DIGIT_MASK = (1 << _FIELD) - 1
+_DOT_CODE, _PAD_CODE, _MINUS_CODE, _OTHER_CODE = 1, 1 << 5, 1 << 13, 1 << 18
+_CODES = np.full(256, float(_OTHER_CODE << _FIELD))
+_CODES[_DIGIT:_DIGIT + 10] = np.arange(10)
+for _byte, _code in ((_DOT, _DOT_CODE), (_PAD, _PAD_CODE), (_MINUS, _MINUS_CODE)):
+    _CODES[_byte] = _code << _FIELD
+# Digits per weighted sum, so each sum's digits fit below bit 20
+_PART_DIGITS = 6
+# Shape keys of valid rows stay below this; it is also the key of every invalid row
+_INVALID = 2 * _MINUS_CODE
+
+
+@lru_cache(maxsize=None)
+def _shape_tables(width: int) -> Tuple[np.ndarray, ...]:
+    """
+    Weights for the narrow kernel's matrix product (one column per group of
+    up to _PART_DIGITS positions, then the count and position columns) and,
+    indexed by shape key: the expected class counts, the divisors that drop
+    the trailing pad zeros and split off the integer digits, the amount to
+    take out per integer to close the dot's gap, and each shape's fraction
+    digits, integer digits and sign.
+    """
+    position = np.arange(width)
+    place = width - 1 - position
+    parts = -(-width // _PART_DIGITS)
+    weights = np.zeros((width, parts + 2))
+    # Groups from the right, so only the first can be short
+    weights[position, parts - 1 - place // _PART_DIGITS] = 10.0 ** (place % _PART_DIGITS)
+    weights[:, parts] = 1
+    weights[:, parts + 1] = position + 1
+
+    expected = np.full(_INVALID + 1, -1, dtype=np.int64)
+    pad_divisors = np.ones(_INVALID + 1, dtype=np.int64)
+    integer_divisors = np.ones(_INVALID + 1, dtype=np.int64)
+    gaps = np.zeros(_INVALID + 1, dtype=np.int64)
+    fractions = np.zeros(_INVALID + 1, dtype=np.int64)
+    integers = np.zeros(_INVALID + 1, dtype=np.int64)
+    signs = np.ones(_INVALID + 1, dtype=np.int64)
+    for minus in (0, 1):
+        for pads in range(width - minus + 1):
+            length = width - pads
+            trailing = (width + length + 1) * pads // 2
+            for dot in [None] + list(range(minus, length)):
+                key = (0 if dot is None else dot + 1) + _PAD_CODE * trailing + _MINUS_CODE * minus
+                fraction = 0 if dot is None else length - 1 - dot
+                expected[key] = (dot is not None) * _DOT_CODE + _PAD_CODE * pads + _MINUS_CODE * minus
+                pad_divisors[key] = 10 ** pads
+                if dot is not None:
+                    integer_divisors[key] = 10 ** (pads + fraction + 1)
+                    gaps[key] = 9 * 10 ** fraction
+                fractions[key] = fraction
+                integers[key] = length - minus - (dot is not None) - fraction
+                signs[key] = -1 if minus else 1
+    return weights, expected, pad_divisors, integer_divisors, gaps, fractions, integers, signs
+
+
+def _parse_chunk(chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Digits as int64 and shape keys for a (rows, width) chunk of stripped,
+    NUL-padded strings at most MAX_DIGITS wide. Each byte maps to a code and
+    every row is read by one matrix product. The kernel accepts
+    -?digits[.digits]; other rows get the _INVALID key.
+    """
+    rows, width = chunk.shape
+    weights, expected, pad_divisors, integer_divisors, gaps = _shape_tables(width)[:5]
+    parts = weights.shape[1] - 2
+    sums = np.empty((rows, parts + 2))
+    for start in range(0, rows, PRODUCT_ROWS):
+        np.matmul(_CODES.take(chunk[start:start + PRODUCT_ROWS]), weights, out=sums[start:start + PRODUCT_ROWS])
+    sums = sums.astype(np.int64)
+
+    # Digits with a zero in place of the dot and one per trailing pad
+    value = sums[:, 0] & _DIGIT_MASK
+    for part in range(1, parts):
+        value *= _POWERS[_PART_DIGITS]
+        value += sums[:, part] & _DIGIT_MASK
+    keys = np.minimum(sums[:, parts + 1] >> _FIELD, _INVALID)
+    # The key only settles the shape if the class counts agree with it
+    keys[(sums[:, parts] >> _FIELD) != expected[keys]] = _INVALID
+
+    # Drop the pad zeros and close the dot's gap: int * 10**(f + 1) + frac becomes int * 10**f + frac
+    integer = value // integer_divisors[keys]
+    value //= pad_divisors[keys]
+    value -= integer * gaps[keys]
+    return value, keys
+
+
+def _parse_wide_chunk(chunk: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Digits as int64, fraction digit counts, significant digit counts and a
+    fallback mask for a (rows, width) chunk of stripped, NUL-padded strings
+    of any width, one character position at a time. The kernel accepts
+    [+-]digits[.digits]; anything else falls back.
+    """
+    # One contiguous row per character position, so each step below is a flat pass
+    columns = np.ascontiguousarray(chunk.T)
+    width, rows = columns.shape
+    digits = columns - np.uint8(_DIGIT)
+    is_digit = digits < 10
+    is_dot = columns == _DOT
+    is_pad = columns == _PAD
+    negative = columns[0] == _MINUS
+    signed = negative | (columns[0] == _PLUS)
+
+    allowed = is_digit | is_dot | is_pad
+    allowed[0] |= signed
+    # Narrow counters: widening bool reductions to int64 costs more than the rest of the checks
+    small = np.uint8 if width < 256 else np.int64
+    length = (width - is_pad.sum(axis=0, dtype=small)).astype(np.int64)
+    dots = is_dot.sum(axis=0, dtype=small).astype(np.int64)
+    count = length - dots - signed
+    # With a single dot, its position is the sum of the dot positions
+    dot_position = (is_dot * np.arange(width, dtype=small)[:, None]).sum(axis=0, dtype=small)
+    fraction = np.where(dots > 0, length - 1 - dot_position, 0)
+    fallback = (
+        ~allowed.all(axis=0)
+        | (dots > 1)
+        | (count > MAX_DIGITS)
+        # NUL inside the string rather than padding
+        | (is_pad[:-1] & ~is_pad[1:]).any(axis=0)
+    )
+
+    value = np.zeros(rows, dtype=np.int64)
+    shifted = np.empty(rows, dtype=np.int64)
+    for position in range(width):
+        np.multiply(value, 10, out=shifted)
+        np.add(shifted, digits[position], out=shifted)
+        np.copyto(value, shifted, where=is_digit[position])
+    np.negative(value, out=value, where=negative)
+    return value, fraction, count, fallback
+
+
+def _parse_wide(matrix: np.ndarray) -> Tuple[np.ndarray, int, np.ndarray]:
+    """parse_minor_units for columns wider than MAX_DIGITS bytes."""
+    count = len(matrix)
+    values = np.empty(count, dtype=np.int64)
+    fractions = np.empty(count, dtype=np.int64)
+    digits = np.empty(count, dtype=np.int64)
+    fallback = np.empty(count, dtype=bool)
+    for start in range(0, count, PARSE_CHUNK):
+        end = start + PARSE_CHUNK
+        values[start:end], fractions[start:end], digits[start:end], fallback[start:end] = _parse_wide_chunk(matrix[start:end])
+
+    # Shared scale: the most fraction digits among parsed rows; rows too long at that scale fall back
+    parsed = ~fallback
+    scale = int(fractions[parsed].max()) if parsed.any() else 0
+    fallback |= digits - fractions + scale > MAX_DIGITS
+    units = np.where(fallback, 0, values * _POWERS[np.clip(scale - fractions, 0, MAX_DIGITS)])
+    return units, scale, fallback
+
+
+def parse_minor_units(amounts: np.ndarray) -> Tuple[np.ndarray, int, np.ndarray]:
+    """
+    Parse a bytes ('S') array of stripped decimal strings into (units,
+    scale, fallback): units[i] / 10**scale is the exact amount of every row
+    not flagged in fallback. Flagged rows have units 0.
+    """
+    count = len(amounts)
+    width = max(amounts.dtype.itemsize, 1)
+    matrix = np.ascontiguousarray(amounts).view(np.uint8).reshape(count, width) if count else np.zeros((0, width), np.uint8)
+    if width > MAX_DIGITS:
+        return _parse_wide(matrix)
+    values = np.empty(count, dtype=np.int64)
+    keys = np.empty(count, dtype=np.int64)
+    for start in range(0, count, PARSE_CHUNK):
+        end = start + PARSE_CHUNK
+        values[start:end], keys[start:end] = _parse_chunk(matrix[start:end])
+
+    # Shared scale: the most fraction digits among the shapes present; shapes too long at that scale fall back
+    _, expected, _, _, _, fractions, integers, signs = _shape_tables(width)
+    present = (np.bincount(keys, minlength=_INVALID + 1) > 0) & (expected >= 0)
+    scale = int(fractions[present].max()) if present.any() else 0
+    kept = (expected >= 0) & (integers + scale <= MAX_DIGITS)
+    multipliers = np.where(kept, signs * _POWERS[np.clip(scale - fractions, 0, MAX_DIGITS)], 0)
+    return values * multipliers[keys], scale, ~kept[keys]
+
+
+def group_sums(codes: np.ndarray, units: np.ndarray, groups: int) -> List[int]:
+    """Exact per-group sums of int64 units, as Python ints."""
+    largest = int(np.abs(units).max()) if len(units) else 0
+    if largest * len(units) < 2 ** 63:
+        sums = np.zeros(groups, dtype=np.int64)
+        np.add.at(sums, codes, units)
+        return sums.tolist()
+    # 32-bit limbs so the running int64 sums cannot overflow (fewer than 2**31 rows)
+    low = np.zeros(groups, dtype=np.int64)
+    high = np.zeros(groups, dtype=np.int64)
+    np.add.at(low, codes, units & 0xFFFFFFFF)
+    np.add.at(high, codes, units >> 32)
+    return [(h << 32) + l for h, l in zip(high.tolist(), low.tolist())]
+
+
+def sum_amounts(codes: Sequence[int], amounts: Sequence[str], groups: int,
+                parse: Callable[[str], Decimal]) -> Tuple[List[Decimal], np.ndarray]:
+    """
+    Exact Decimal totals and row counts per group code (0..groups-1) for
+    parallel sequences of codes and amount strings. parse resolves the rows
+    the vectorized kernel cannot.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    try:
+        column = np.asarray(amounts, dtype=np.bytes_)
+    except UnicodeEncodeError:
+        # Non-ASCII characters become '?', which sends those rows to parse
+        column = np.array([amount.encode("ascii", "replace") for amount in amounts], dtype=np.bytes_)
+    column = _strip(column) if len(column) else np.zeros(0, dtype="S1")
+    units, scale, fallback = parse_minor_units(column)
+    totals = [Decimal(total).scaleb(-scale) for total in group_sums(codes, units, groups)]
+
+    extra: Dict[int, Decimal] = {}
+    for row in np.flatnonzero(fallback).tolist():
+        code = int(codes[row])
+        extra[code] = extra.get(code, Decimal(0)) + parse(amounts[row])
+    for code, amount in extra.items():
+        totals[code] += amount
+    return totals, np.bincount(codes, minlength=groups)
+
+
+def format_amount(amount: Decimal) -> str:
+    """
+    Decimal string in the shape str(float) gave before the exact sums: no
+    exponent, no negative zero, trailing fraction zeros dropped but at least
+    one fraction digit, e.g. Decimal('280000.00') -> '280000.0'.
+    """
+    text = format(abs(amount) if amount.is_zero() else amount, "f")
+    whole, _, fraction = text.partition(".")
+    return f"{whole}.{fraction.rstrip('0') or '0'}"
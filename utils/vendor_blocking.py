@@ -0,0 +1,119 @@
+"""
+Blocking index for vendor harmonization.
+
+Fuzzy scoring every incoming vendor against every unified record is O(n^2).
+The blocking index groups records under cheap exact keys (name token
+prefixes, normalized phone, city/state) so only records sharing at least one
+key are handed to the fuzzy scorer.
+"""
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Set
+
+from utils.harmonization_helpers import normalize_text
+
+DEFAULT_STRATEGIES = ("token_prefix", "phone", "city_state")
+DEFAULT_PREFIX_LENGTH = 3
+
+# Legal-form and filler tokens shared by unrelated vendors; blocking on them
+# would put most of the vendor master into a single block.
+STOP_TOKENS = {
+    "inc", "incorporated", "co", "company", "corp", "corporation",
+    "llc", "ltd", "limited", "the", "and", "of",
+}
+
+_NON_DIGIT = re.compile(r"\D")
+
+
+def token_prefix_keys(normalized_name: str, address: str, phone: str, prefix_length: int) -> Set[str]:
+    """One key per name token prefix, ignoring legal-form tokens."""
+    return {
+        f"tp:{token[:prefix_length]}"
+        for token in normalized_name.split()
+        if token not in STOP_TOKENS
+    }
+
+
+def phone_keys(normalized_name: str, address: str, phone: str, prefix_length: int) -> Set[str]:
+    """Last ten digits of the phone, so +1 and formatting drift share a block."""
+    digits = _NON_DIGIT.sub("", phone or "")
+    if len(digits) < 7:
+        return set()
+    return {f"ph:{digits[-10:]}"}
+
+
+def city_state_keys(normalized_name: str, address: str, phone: str, prefix_length: int) -> Set[str]:
+    """City/state taken from the comma-joined full address (street, city, state, country)."""
+    parts = [p.strip() for p in (address or "").split(",")]
+    if len(parts) >= 4:
+        city, state = parts[-3], parts[-2]
+    elif len(parts) == 3:
+        city, state = parts[-2], parts[-1]
+    else:
+        return set()
+    city, state = normalize_text(city), normalize_text(state)
+    if not city or not state:
+        return set()
+    return {f"cs:{city}|{state}"}
+
+
+BLOCKING_STRATEGIES: Dict[str, Callable[[str, str, str, int], Set[str]]] = {
+    "token_prefix": token_prefix_keys,
+    "phone": phone_keys,
+    "city_state": city_state_keys,
+}
+
+
+class BlockingIndex:
+    """
+    Inverted index from block key to records.
+
+    Candidates are returned in insertion order so callers that break score
+    ties by "first record wins" behave exactly as with a full scan.
+    """
+
+    def __init__(self, strategies: Iterable[str] = DEFAULT_STRATEGIES, prefix_length: int = DEFAULT_PREFIX_LENGTH):
+        unknown = [s for s in strategies if s not in BLOCKING_STRATEGIES]
+        if unknown:
+            raise ValueError(f"Unknown blocking strategies: {unknown}")
+        self.strategies = list(strategies)
+        self.prefix_length = prefix_length
+        self._blocks: Dict[str, List[int]] = defaultdict(list)
+        self._items: List = []
+        self.pairs_compared = 0
+        self.pairs_skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def keys_for(self, normalized_name: str, address: str, phone: str) -> Set[str]:
+        keys = set()
+        for strategy in self.strategies:
+            keys |= BLOCKING_STRATEGIES[strategy](normalized_name, address, phone, self.prefix_length)
+        return keys
+
+    def add(self, item, normalized_name: str, address: str, phone: str) -> None:
+        position = len(self._items)
+        self._items.append(item)
+        for key in self.keys_for(normalized_name, address, phone):
+            self._blocks[key].append(position)
+
+    def candidates(self, normalized_name: str, address: str, phone: str) -> List:
+        """Records sharing at least one block key, in insertion order. Updates the pair counters."""
+        positions = set()
+        for key in self.keys_for(normalized_name, address, phone):
+            positions.update(self._blocks.get(key, ()))
+        self.pairs_compared += len(positions)
+        self.pairs_skipped += len(self._items) - len(positions)
+        return [self._items[p] for p in sorted(positions)]
+
+    def stats(self) -> Dict:
+        total = self.pairs_compared + self.pairs_skipped
+        return {
+            "strategies": self.strategies,
+            "blocks": len(self._blocks),
+            "records_indexed": len(self._items),
+            "pairs_compared": self.pairs_compared,
+            "pairs_skipped": self.pairs_skipped,
+            "reduction_percent": round(self.pairs_skipped / total * 100, 1) if total else 0.0,
+        }
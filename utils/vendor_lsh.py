@@ -0,0 +1,150 @@
+"""
+MinHash LSH candidate index for approximate vendor matching.
+
+Blocking keys still produce large blocks on very big vendor masters. This
+index summarizes each record's name and address character shingles as a
+MinHash signature, cuts the signature into bands, and buckets records by
+band. Records sharing any band bucket are likely near-duplicates (the
+chance grows steeply with shingle Jaccard similarity), and only those are
+handed to the exact weighted scorer.
+
+It exposes the same interface as BlockingIndex, so VendorMatcher and the
+score table use either one unchanged.
+"""
+import zlib
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Sequence, Set, Tuple
+
+import numpy as np
+
+from utils.harmonization_helpers import canonicalize_address
+
+DEFAULT_BANDS = 32
+DEFAULT_ROWS = 4
+DEFAULT_SHINGLE_SIZE = 3
+DEFAULT_SEED = 1
+# Distinct (name, address) band keys remembered per index
+SIGNATURE_CACHE_SIZE = 200_000
+# Records per vectorized signature batch (bounds the shingles x hashes matrix)
+SIGNATURE_BATCH = 512
+
+
+def shingles(normalized_name: str, address: str, size: int = DEFAULT_SHINGLE_SIZE) -> Set[str]:
+    """Character shingles of the name and of the canonical address, tagged so the two never collide."""
+    result = set()
+    for tag, text in (("n", normalized_name or ""), ("a", canonicalize_address(address or ""))):
+        if not text:
+            continue
+        padded = f" {text} "
+        if len(padded) <= size:
+            result.add(f"{tag}:{padded}")
+            continue
+        result.update(f"{tag}:{padded[i:i + size]}" for i in range(len(padded) - size + 1))
+    return result
+
+
+class MinHashLSHIndex:
+    """
+    Banded MinHash index from band bucket to records.
+
+    Signatures use bands * rows multiply-shift hash functions over stable
+    CRC32 shingle hashes, so buckets are reproducible across runs and
+    processes. Candidates are returned in insertion order, like BlockingIndex.
+    """
+
+    def __init__(self, bands: int = DEFAULT_BANDS, rows: int = DEFAULT_ROWS, shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = DEFAULT_SEED):
+        if bands < 1 or rows < 1 or shingle_size < 1:
+            raise ValueError("LSH bands, rows and shingle_size must be positive")
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Odd multipliers for multiply-shift hashing of 32-bit inputs (uint64 arithmetic wraps)
+        self._multipliers = rng.integers(1, 2 ** 63, size=bands * rows, dtype=np.uint64) | np.uint64(1)
+        self._offsets = rng.integers(0, 2 ** 63, size=bands * rows, dtype=np.uint64)
+        self._band_cache: Dict[Tuple[str, str], FrozenSet[Tuple[int, bytes]]] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+        self._items: List = []
+        self.pairs_compared = 0
+        self.pairs_skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def signatures(self, records: Sequence[Tuple[str, str]]) -> List[np.ndarray]:
+        """
+        MinHash signatures (bands * rows uint32 values) for (normalized name, address)
+        pairs; empty for a record with no name and no address.
+        """
+        hashes: List[int] = []
+        counts: List[int] = []
+        for normalized_name, address in records:
+            values = shingles(normalized_name, address, self.shingle_size)
+            counts.append(len(values))
+            hashes.extend(zlib.crc32(value.encode("utf-8")) for value in values)
+        result = [np.zeros(0, dtype=np.uint32)] * len(records)
+        present = [i for i, count in enumerate(counts) if count]
+        if not present:
+            return result
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[present]
+        # Hash functions x shingles, so each record's minimum is over a contiguous run
+        permuted = (self._multipliers[:, None] * np.array(hashes, dtype=np.uint64) + self._offsets[:, None]) >> np.uint64(32)
+        minimums = np.ascontiguousarray(np.minimum.reduceat(permuted, starts, axis=1).T, dtype=np.uint32)
+        for i, signature in zip(present, minimums):
+            result[i] = signature
+        return result
+
+    def prepare(self, normalized_names: Sequence[str], addresses: Sequence[str]) -> None:
+        """Compute band keys for many records in vectorized batches; later lookups hit the cache."""
+        pending = [key for key in dict.fromkeys(zip(normalized_names, addresses)) if key not in self._band_cache]
+        if len(self._band_cache) + len(pending) > SIGNATURE_CACHE_SIZE:
+            self._band_cache.clear()
+        for start in range(0, len(pending), SIGNATURE_BATCH):
+            batch = pending[start:start + SIGNATURE_BATCH]
+            for key, signature in zip(batch, self.signatures(batch)):
+                self._band_cache[key] = self._keys_from_signature(signature)
+
+    def _keys_from_signature(self, signature: np.ndarray) -> FrozenSet[Tuple[int, bytes]]:
+        if not len(signature):
+            return frozenset()
+        # Each band's rows viewed as one opaque bytes value
+        bands = signature.reshape(self.bands, self.rows).view(np.dtype((np.void, 4 * self.rows))).ravel()
+        return frozenset(enumerate(bands.tolist()))
+
+    def _band_keys(self, normalized_name: str, address: str) -> FrozenSet[Tuple[int, bytes]]:
+        keys = self._band_cache.get((normalized_name, address))
+        if keys is None:
+            self.prepare([normalized_name], [address])
+            keys = self._band_cache[(normalized_name, address)]
+        return keys
+
+    def keys_for(self, normalized_name: str, address: str, phone: str) -> Set[Tuple[int, bytes]]:
+        return set(self._band_keys(normalized_name, address))
+
+    def add(self, item, normalized_name: str, address: str, phone: str) -> None:
+        position = len(self._items)
+        self._items.append(item)
+        for key in self._band_keys(normalized_name, address):
+            self._buckets[key].append(position)
+
+    def candidates(self, normalized_name: str, address: str, phone: str) -> List:
+        """Records sharing at least one band bucket, in insertion order. Updates the pair counters."""
+        positions = set()
+        for key in self._band_keys(normalized_name, address):
+            positions.update(self._buckets.get(key, ()))
+        self.pairs_compared += len(positions)
+        self.pairs_skipped += len(self._items) - len(positions)
+        return [self._items[p] for p in sorted(positions)]
+
+    def stats(self) -> Dict:
+        total = self.pairs_compared + self.pairs_skipped
+        return {
+            "strategies": ["minhash_lsh"],
+            "bands": self.bands,
+            "rows": self.rows,
+            "blocks": len(self._buckets),
+            "records_indexed": len(self._items),
+            "pairs_compared": self.pairs_compared,
+            "pairs_skipped": self.pairs_skipped,
+            "reduction_percent": round(self.pairs_skipped / total * 100, 1) if total else 0.0,
+        }
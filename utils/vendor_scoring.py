@@ -0,0 +1,117 @@
+"""
+Batch similarity scoring for vendor matching.
+
+Scores are computed with rapidfuzz's C kernels and returned as NumPy arrays.
+Each name/address score is processed and rounded exactly like
+thefuzz.fuzz.token_set_ratio, so weighted combined scores are identical to
+the serial `int(name * name_weight + address * address_weight)` formula.
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.utils import default_process
+
+# Upper bound on score-matrix cells per cdist call (two float64 matrices of this size)
+MATRIX_CELL_BUDGET = 4_000_000
+MAX_CHUNK_ROWS = 1024
+# Below this many pairs, spinning up rapidfuzz's thread pool costs more than it saves
+PARALLEL_MIN_PAIRS = 20_000
+
+_NON_ASCII = {i: None for i in range(128, 256)}
+
+
+def prepare(values: Sequence[str]) -> List[str]:
+    """Apply thefuzz's default processing (force_ascii + full_process) once per string."""
+    return [default_process(str(v).translate(_NON_ASCII)) for v in values]
+
+
+def chunk_rows(existing: int) -> int:
+    """Rows per chunk so a chunk x existing matrix stays within the cell budget."""
+    if existing <= 0:
+        return MAX_CHUNK_ROWS
+    return max(1, min(MAX_CHUNK_ROWS, MATRIX_CELL_BUDGET // existing))
+
+
+def _workers(pairs: int) -> int:
+    return -1 if pairs >= PARALLEL_MIN_PAIRS else 1
+
+
+def _combine(name_scores: np.ndarray, address_scores: np.ndarray, name_weight: float, address_weight: float) -> np.ndarray:
+    # thefuzz rounds each score to an int (half to even, like np.round) before weighting
+    combined = np.round(name_scores) * name_weight + np.round(address_scores) * address_weight
+    return combined.astype(np.int64)
+
+
+def score_matrix(
+    query_names: Sequence[str],
+    query_addresses: Sequence[str],
+    choice_names: Sequence[str],
+    choice_addresses: Sequence[str],
+    name_weight: float,
+    address_weight: float,
+) -> np.ndarray:
+    """Combined score for every query x choice pair, shape (len(queries), len(choices))."""
+    if not len(query_names) or not len(choice_names):
+        return np.zeros((len(query_names), len(choice_names)), dtype=np.int64)
+    workers = _workers(len(query_names) * len(choice_names))
+    names = process.cdist(query_names, choice_names, scorer=fuzz.token_set_ratio, dtype=np.float64, workers=workers)
+    addresses = process.cdist(query_addresses, choice_addresses, scorer=fuzz.token_set_ratio, dtype=np.float64, workers=workers)
+    return _combine(names, addresses, name_weight, address_weight)
+
+
+def token_set_scores(queries: Sequence[str], choices: Sequence[str]) -> np.ndarray:
+    """Rounded token_set_ratio for aligned (queries[k], choices[k]) pairs."""
+    if not len(queries):
+        return np.zeros(0)
+    scores = process.cpdist(queries, choices, scorer=fuzz.token_set_ratio, dtype=np.float64, workers=_workers(len(queries)))
+    return np.round(scores)
+
+
+def pair_scores(
+    query_names: Sequence[str],
+    query_addresses: Sequence[str],
+    choice_names: Sequence[str],
+    choice_addresses: Sequence[str],
+    name_weight: float,
+    address_weight: float,
+    cache=None,
+) -> np.ndarray:
+    """Combined score for aligned (query[k], choice[k]) pairs, shape (len(queries),)."""
+    if not len(query_names):
+        return np.zeros(0, dtype=np.int64)
+    names, addresses = pair_component_scores(query_names, query_addresses, choice_names, choice_addresses, cache)
+    return _combine(names, addresses, name_weight, address_weight)
+
+
+def pair_component_scores(
+    query_names: Sequence[str],
+    query_addresses: Sequence[str],
+    choice_names: Sequence[str],
+    choice_addresses: Sequence[str],
+    cache=None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rounded (name, address) scores for aligned pairs, i.e. the values _combine weights.
+    With a score cache (services.vendor_score_cache.ScoreCache), only uncached pairs are scored.
+    """
+    if cache is not None:
+        return cache.scores(query_names, choice_names), cache.scores(query_addresses, choice_addresses)
+    return token_set_scores(query_names, choice_names), token_set_scores(query_addresses, choice_addresses)
+
+
+def best_per_row(rows: np.ndarray, cols: np.ndarray, scores: np.ndarray, n_rows: int):
+    """
+    Best (col, score) per row from sparse pair scores.
+    Ties go to the lowest col, matching a first-wins scan. Rows without pairs get col -1, score 0.
+    """
+    best_cols = np.full(n_rows, -1, dtype=np.int64)
+    best_scores = np.zeros(n_rows, dtype=np.int64)
+    if not len(rows):
+        return best_cols, best_scores
+    order = np.lexsort((cols, -scores, rows))
+    first_rows, first_idx = np.unique(rows[order], return_index=True)
+    winners = order[first_idx]
+    best_cols[first_rows] = cols[winners]
+    best_scores[first_rows] = scores[winners]
+    return best_cols, best_scores
@@ -0,0 +1,104 @@
+"""
+In-memory search index over vendor rows for the paginated vendor APIs.
+
+Each row's normalized name and address tokens (plus phone digits) are put in
+an inverted index. A query term matches a row when it is a prefix of one of
+the row's tokens, and every term of a query must match. Brand and
+confidence filters are precomputed NumPy masks, so a page costs a few vector
+operations instead of a scan over every row.
+"""
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from models.vendor_model import BRANDS
+from utils.harmonization_helpers import normalize_text, normalize_address
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class VendorSearchIndex:
+    """
+    Read-only index over a list of row dicts. `rows` is kept by reference;
+    build a new index whenever the underlying list is replaced.
+    """
+
+    def __init__(self, rows: List[Dict], name_field: str, address_field: str, phone_field: str, brand_field: str, confidence_field: Optional[str] = None):
+        self.rows = rows
+        size = len(rows)
+        token_list: List[str] = []
+        token_rows: List[int] = []
+        self.brand_masks = {brand.lower(): np.zeros(size, dtype=bool) for brand in BRANDS}
+        self.confidences = np.zeros(size, dtype=np.int64) if confidence_field else None
+
+        for position, row in enumerate(rows):
+            tokens = set(normalize_text(str(row.get(name_field, ""))).split())
+            tokens.update(normalize_address(str(row.get(address_field, ""))).split())
+            digits = re.sub(r"\D", "", str(row.get(phone_field, "")))
+            if digits:
+                tokens.add(digits)
+            token_list.extend(tokens)
+            token_rows.extend([position] * len(tokens))
+            row_brands = str(row.get(brand_field, "")).split(", ")
+            for brand in BRANDS:
+                if brand in row_brands:
+                    self.brand_masks[brand.lower()][position] = True
+            if confidence_field:
+                self.confidences[position] = int(row.get(confidence_field) or 0)
+
+        # Postings in CSR form: rows for the i-th sorted token are positions[offsets[i]:offsets[i + 1]],
+        # so all tokens sharing a prefix (a contiguous run of sorted tokens) are one slice
+        unique, inverse = np.unique(np.array(token_list, dtype=str), return_inverse=True)
+        self.tokens: List[str] = unique.tolist()
+        self.positions = np.array(token_rows, dtype=np.int64)[np.argsort(inverse, kind="stable")]
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(inverse, minlength=len(unique)))))
+
+        cross = self.brand_masks["tmh"] & self.brand_masks["raymond"]
+        self._counts = {brand.lower(): int(self.brand_masks[brand.lower()].sum()) for brand in BRANDS}
+        self._counts.update({"total": size, "cross_brand": int(cross.sum())})
+
+    def counts(self) -> Dict[str, int]:
+        """Unfiltered totals: all rows, rows per brand, and rows present in both brands."""
+        return dict(self._counts)
+
+    def _term_mask(self, term: str) -> np.ndarray:
+        mask = np.zeros(len(self.rows), dtype=bool)
+        start = bisect_left(self.tokens, term)
+        # Tokens are [a-z0-9]; bumping the last character gives the end of the prefix run
+        stop = bisect_left(self.tokens, term[:-1] + chr(ord(term[-1]) + 1), start)
+        mask[self.positions[self.offsets[start]:self.offsets[stop]]] = True
+        return mask
+
+    def search(self, q: str = None, brand: str = None, min_confidence: int = None) -> np.ndarray:
+        """Ascending row positions matching every given filter."""
+        mask = np.ones(len(self.rows), dtype=bool)
+        if brand:
+            brand_mask = self.brand_masks.get(brand.lower())
+            if brand_mask is None:
+                raise ValueError(f"Unknown brand: {brand}")
+            mask &= brand_mask
+        if min_confidence is not None and self.confidences is not None:
+            mask &= self.confidences >= min_confidence
+        for term in normalize_text(q or "").split():
+            mask &= self._term_mask(term)
+        return np.flatnonzero(mask)
+
+    def page(self, q: str = None, brand: str = None, min_confidence: int = None, cursor: int = None, limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+        """
+        One page of matching rows. `cursor` is the row position returned as
+        next_cursor by the previous page; next_cursor is None on the last page.
+        """
+        matches = self.search(q, brand, min_confidence)
+        start = int(np.searchsorted(matches, cursor, side="right")) if cursor is not None else 0
+        selected = matches[start:start + limit]
+        has_more = start + limit < len(matches)
+        return {
+            "data": [self.rows[position] for position in selected.tolist()],
+            "total": int(len(matches)),
+            "next_cursor": str(int(selected[-1])) if has_more and len(selected) else None,
+            "limit": limit,
+            "counts": self.counts(),
+        }